@@ -1,9 +1,17 @@
 # import packages
-import simpy  # framework simulasi
+# simpy dan numpy diimport di dalam fungsi yang membutuhkannya, supaya import
+# modul ini (misalnya dari worker process) tetap ringan
 import random  # fungsi untuk menghasilkan bilangan acak
-import statistics  # fungsi statistika untuk melakukan perhitungan
 import itertools  # fungsi untuk membuat dan mengolah iterasi dan kombinasi data
-import numpy as np  # komputasi numerik
+import bisect  # pencarian biner untuk pemilihan berbobot
+import math  # fungsi matematika dasar
+import sys  # akses stdout untuk log event
+import array  # buffer kolom untuk trace biner
+import dataclasses  # objek konfigurasi dan hasil
+import functools  # cache dtype numpy
+import collections  # ring buffer sampel panjang antrian
+import heapq  # pemilihan kasir O(log k)
+import time  # pembagian waktu wall untuk profile
 
 # SEED FOR EVERY STREAMS
 # random seed untuk waktu kedatangan (stream 1)
@@ -24,20 +32,566 @@ SEED_ACT_HOT_FOOD = 700
 SEED_ACT_SANDWICH = 800
 # random seed untuk akumulasi waktu kasir hotfood (stream 9)
 SEED_ACT_DRINKS = 900
+# random seed untuk pemilihan kasir acak, kebijakan "random" (stream 10)
+SEED_CASHIER_CHOICE = 1000
 
 # Parameter Configuration
 NUM_HOT_FOOD_EMPLOYEE = 1  # jumlah pelayan hotfood
 NUM_SANDWICH_EMPLOYEE = 1  # jumlah pelayan sandwich
 NUM_CASHIER = 2  # jumlah kasir
+# Kebijakan pemilihan kasir (lihat CashierBank):
+# "jsq"        -> antrian kasir terpendek
+# "serpentine" -> satu antrian bersama untuk semua kasir
+# "random"     -> kasir dipilih acak
+CASHIER_POLICY = "jsq"
 
 # Parameter Duration
 SIMULATION_DURATION = 5400  # #waktu simulasi (detik)
 # waktu antar kedatangan ukuran grup menyebar eksponensial dengan rata-rata 30 detik
 INTERVAL_CUSTOMER_ARRIVAL = 30
+# batas (bawah, atas) waktu layanan uniform untuk satu pelayan, dibagi jumlah pelayan
+HOT_FOOD_SERVICE = (50.0, 120.0)
+SANDWICH_SERVICE = (60.0, 180.0)
+
+# Versi model, naikkan setiap kali perubahan model mengubah hasil simulasi
+# (dipakai sebagai bagian key cache hasil, lihat result_cache.py)
+MODEL_VERSION = "4"
+
+# Mode bilangan acak:
+# "fast"   -> satu generator numpy per stream, sampel diambil per batch
+# "legacy" -> random.Random(SEED_X + customer_id) per sampel (bit-exact dengan versi lama)
+RANDOM_MODE = "fast"
+# jumlah sampel yang dibangkitkan sekaligus per batch (mode fast)
+RANDOM_BATCH_SIZE = 4096
+# jumlah batch yang disimpan per stream, batch lama dibangkitkan ulang jika dibutuhkan
+RANDOM_MAX_BATCHES = 8
+
+# Mode log event per pelanggan:
+# "null"  -> tidak ada log (paling cepat)
+# "text"  -> pesan teks seperti versi lama, ditulis per blok ke stdout
+# "trace" -> record biner (time, customer_id, station, event_type) ke file
+# "journey" -> tabel kolom .npy per pelanggan dan per perubahan antrian ke direktori
+#              trace_path (journey_trace.py)
+LOG_MODE = "text"
+# jumlah event yang ditampung sebelum ditulis sekaligus
+LOG_BUFFER_SIZE = 8192
+
+# Kuantil yang diestimasi secara streaming untuk setiap delay,
+# tuple kosong mematikan estimasi kuantil (akumulator paling murah)
+STAT_QUANTILES = (0.5, 0.9, 0.95)
+
+
+# Konfigurasi satu run simulasi, default diambil dari konstanta di atas
+@dataclasses.dataclass(frozen=True)
+class SimulationConfig:
+    num_hot_food_employee: int = NUM_HOT_FOOD_EMPLOYEE
+    num_sandwich_employee: int = NUM_SANDWICH_EMPLOYEE
+    num_cashier: int = NUM_CASHIER
+    cashier_policy: str = CASHIER_POLICY
+    simulation_duration: float = SIMULATION_DURATION
+    interval_customer_arrival: float = INTERVAL_CUSTOMER_ARRIVAL
+    # profil laju kedatangan ((t_mulai, faktor laju), ...), kosong = laju konstan
+    # 1 / interval_customer_arrival (lihat arrivals.py)
+    arrival_profile: tuple = ()
+    hot_food_service: tuple = HOT_FOOD_SERVICE
+    sandwich_service: tuple = SANDWICH_SERVICE
+
+    seed_interval_time: int = SEED_INTERVAL_TIME
+    seed_group_size: int = SEED_GROUP_SIZE
+    seed_route_choice: int = SEED_ROUTE_CHOICE
+    seed_st_hot_food: int = SEED_ST_HOT_FOOD
+    seed_st_sandwich: int = SEED_ST_SANDWICH
+    seed_st_drinks: int = SEED_ST_DRINKS
+    seed_act_hot_food: int = SEED_ACT_HOT_FOOD
+    seed_act_sandwich: int = SEED_ACT_SANDWICH
+    seed_act_drinks: int = SEED_ACT_DRINKS
+    seed_cashier_choice: int = SEED_CASHIER_CHOICE
+    # seed_offset menggeser semua stream (untuk replikasi independen)
+    seed_offset: int = 0
+
+    random_mode: str = RANDOM_MODE
+    # nama stream yang memakai 1-U (pasangan antithetic, lihat variance_reduction.py)
+    antithetic: tuple = ()
+    # "simpy" -> model proses SimPy, "heapq" -> kernel event khusus (event_kernel.py)
+    backend: str = "simpy"
+    log_mode: str = LOG_MODE
+    trace_path: str = None
+    print_report: bool = True
+    stat_quantiles: tuple = STAT_QUANTILES
+    # jumlah sampel (t, panjang) terakhir yang disimpan per antrian, 0 = tidak disimpan
+    queue_history: int = 0
+    # instrumentasi run (instrumentation.py), hasilnya di Results.profile
+    profile: bool = False
+
+    def stream_seeds(self):
+        # seed dasar untuk setiap stream RandomStreams
+        return {"interval_time": self.seed_interval_time,
+                "group_size": self.seed_group_size,
+                "route_choice": self.seed_route_choice,
+                "st_hot_food": self.seed_st_hot_food,
+                "st_sandwich": self.seed_st_sandwich,
+                "st_drinks": self.seed_st_drinks,
+                "act_hot_food": self.seed_act_hot_food,
+                "act_sandwich": self.seed_act_sandwich,
+                "act_drinks": self.seed_act_drinks,
+                "cashier_choice": self.seed_cashier_choice}
+
+    def make_streams(self):
+        return RandomStreams(self.seed_offset, self.random_mode, seeds=self.stream_seeds(),
+                             antithetic=self.antithetic)
+
+    def replace(self, **changes):
+        return dataclasses.replace(self, **changes)
+
+
+# Kumpulan stream bilangan acak bernama, satu stream untuk setiap SEED_*
+class RandomStreams:
+    SEEDS = {"interval_time": SEED_INTERVAL_TIME,
+             "group_size": SEED_GROUP_SIZE,
+             "route_choice": SEED_ROUTE_CHOICE,
+             "st_hot_food": SEED_ST_HOT_FOOD,
+             "st_sandwich": SEED_ST_SANDWICH,
+             "st_drinks": SEED_ST_DRINKS,
+             "act_hot_food": SEED_ACT_HOT_FOOD,
+             "act_sandwich": SEED_ACT_SANDWICH,
+             "act_drinks": SEED_ACT_DRINKS,
+             "cashier_choice": SEED_CASHIER_CHOICE}
+
+    def __init__(self, seed_offset=0, mode=RANDOM_MODE, batch_size=RANDOM_BATCH_SIZE, seeds=None,
+                 antithetic=()):
+        if mode not in ("fast", "legacy"):
+            raise ValueError(f"Mode random tidak dikenal: {mode}")
+        if antithetic and mode == "legacy":
+            # eksponensial mode legacy tidak diambil dari u(), jadi tidak bisa dibalik
+            raise ValueError("Stream antithetic hanya didukung pada mode fast")
+        if seeds is not None:
+            self.SEEDS = seeds
+        self.seed_offset = seed_offset
+        self.mode = mode
+        self.batch_size = batch_size
+        # stream yang dibalik: sampel u diganti 1-u
+        self.antithetic = frozenset(antithetic)
+        # batch per stream: {nama stream: {indeks batch: list sampel U(0,1)}}
+        self.batches = {name: {} for name in self.SEEDS}
+
+    def __getstate__(self):
+        # batch hanya cache (sampel ke-k ditentukan oleh seed dan k), tidak ikut checkpoint
+        state = self.__dict__.copy()
+        state["batches"] = {name: {} for name in self.batches}
+        return state
+
+    def _batch(self, name, index):
+        # Satu generator per (stream, batch) dari SeedSequence, sehingga sampel
+        # ke-k dari sebuah stream selalu sama walaupun batch dibuang lalu dibuat ulang
+        import numpy as np
+        seed_sequence = np.random.SeedSequence(
+            [self.SEEDS[name], self.seed_offset, index])
+        generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        return generator.random(self.batch_size).tolist()
+
+    def u(self, name, key):
+        # Sampel U(0,1) ke-key dari stream name (key = customer_id atau urutan grup)
+        if self.mode == "legacy":
+            return random.Random(self.SEEDS[name] + self.seed_offset + key).random()
+
+        index, position = divmod(key, self.batch_size)
+        batches = self.batches[name]
+        batch = batches.get(index)
+        if batch is None:
+            batch = self._batch(name, index)
+            batches[index] = batch
+            if len(batches) > RANDOM_MAX_BATCHES:
+                del batches[min(batches)]
+        if name in self.antithetic:
+            return 1.0 - batch[position]
+        return batch[position]
+
+    def uniform(self, name, key, low, high):
+        # sama dengan random.Random.uniform
+        return low + (high - low) * self.u(name, key)
+
+    def choice(self, name, key, population, weights):
+        # sama dengan random.Random.choices(population, weights)[0]
+        cum_weights = list(itertools.accumulate(weights))
+        index = bisect.bisect(cum_weights, self.u(name, key) * cum_weights[-1],
+                              0, len(population) - 1)
+        return population[index]
+
+    def exponential(self, name, key, scale):
+        if self.mode == "legacy":
+            import numpy as np
+            return np.random.RandomState(
+                self.SEEDS[name] + self.seed_offset + key).exponential(scale=scale)
+        return -scale * math.log(1.0 - self.u(name, key))
+
+    # Versi vektor: keys berupa array, dipakai oleh engine numpy
+    def u_array(self, name, keys):
+        import numpy as np
+        keys = np.asarray(keys, dtype=np.int64)
+        if self.mode == "legacy":
+            return np.array([self.u(name, int(key)) for key in keys], dtype=float)
+
+        indexes, positions = np.divmod(keys, self.batch_size)
+        values = np.empty(len(keys), dtype=float)
+        for index in np.unique(indexes):
+            batch = self.batches[name].get(int(index))
+            if batch is None:
+                batch = self._batch(name, int(index))
+            mask = indexes == index
+            values[mask] = np.asarray(batch)[positions[mask]]
+        if name in self.antithetic:
+            return 1.0 - values
+        return values
+
+    def uniform_array(self, name, keys, low, high):
+        return low + (high - low) * self.u_array(name, keys)
+
+    def choice_array(self, name, keys, population, weights):
+        import numpy as np
+        cum_weights = np.array(list(itertools.accumulate(weights)))
+        indexes = np.searchsorted(
+            cum_weights, self.u_array(name, keys) * cum_weights[-1], side="right")
+        return np.asarray(population)[np.minimum(indexes, len(population) - 1)]
+
+    def exponential_array(self, name, keys, scale):
+        import numpy as np
+        if self.mode == "legacy":
+            return np.array([self.exponential(name, int(key), scale) for key in keys], dtype=float)
+        return -scale * np.log(1.0 - self.u_array(name, keys))
+
+
+# Kode stasiun dan tipe event untuk trace biner
+STATION_CODES = {"cafetaria": 0, "hot-food": 1,
+                 "sandwich": 2, "drink": 3, "cashier": 4}
+EVENT_ARRIVE = 0  # tiba di cafetaria, value = ukuran grup
+EVENT_QUEUE = 1  # mulai mengantri
+EVENT_SERVE = 2  # mulai dilayani, value = indeks kasir (hanya di kasir)
+EVENT_DELAY = 3  # delay antrian tercatat
+EVENT_LEAVE = 4  # meninggalkan stasiun
+
+
+@functools.lru_cache(maxsize=None)
+def trace_dtype():
+    import numpy as np
+    return np.dtype([("time", "<f8"), ("customer_id", "<i8"),
+                     ("station", "i1"), ("event_type", "i1")])
+
+
+# Sink yang membuang semua event
+class NullSink:
+    enabled = False
+
+    def event(self, time, customer_id, station, event_type, value=None):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# Sink teks dengan pesan bahasa Indonesia, ditulis per blok
+class TextSink:
+    enabled = True
+
+    # nama antrian pada pesan DELAY
+    DELAY_NAMES = {"hot-food": "hotfood",
+                   "sandwich": "sandwich", "cashier": "kasir"}
+
+    def __init__(self, stream=None, buffer_size=LOG_BUFFER_SIZE):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.lines = []
+
+    def format(self, time, customer_id, station, event_type, value=None):
+        if event_type == EVENT_ARRIVE:
+            return f'Pelanggan {customer_id} TIBA di Cafetaria pada waktu {time:.2f}'
+        if event_type == EVENT_QUEUE:
+            return f"Pelanggan {customer_id} Mulai MENGANTRI di Station {station} pada {time:.2f}."
+        if event_type == EVENT_SERVE:
+            if station == 'cashier':
+                return f'Pelanggan {customer_id} DILAYANI di {station} pada waktu {time:.2f}'
+            return f'Pelanggan {customer_id} DILAYANI di stasiun {station} pada waktu {time:.2f}'
+        if event_type == EVENT_DELAY:
+            return f'Pelanggan {customer_id} DELAY di antrian {self.DELAY_NAMES[station]} pada waktu {value:.2f}'
+        return f'Pelanggan {customer_id} MENINGGALKAN {station} pada waktu {time:.2f}'
+
+    def event(self, time, customer_id, station, event_type, value=None):
+        self.lines.append(self.format(
+            time, customer_id, station, event_type, value))
+        if len(self.lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(self.lines) + "\n")
+            self.lines = []
+
+    def close(self):
+        self.flush()
+
+
+# Sink biner kolom, setiap blok ditulis sebagai record TRACE_DTYPE
+class TraceSink:
+    enabled = True
+
+    def __init__(self, path, buffer_size=LOG_BUFFER_SIZE):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.file = open(path, "wb")
+        self._reset()
+
+    def _reset(self):
+        self.times = array.array("d")
+        self.customer_ids = array.array("q")
+        self.stations = array.array("b")
+        self.event_types = array.array("b")
+
+    def event(self, time, customer_id, station, event_type, value=None):
+        self.times.append(time)
+        self.customer_ids.append(customer_id)
+        self.stations.append(STATION_CODES[station])
+        self.event_types.append(event_type)
+        if len(self.times) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self.times:
+            return
+        import numpy as np
+        records = np.empty(len(self.times), dtype=trace_dtype())
+        records["time"] = self.times
+        records["customer_id"] = self.customer_ids
+        records["station"] = self.stations
+        records["event_type"] = self.event_types
+        records.tofile(self.file)
+        self._reset()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def read_trace(path):
+    # membaca file trace sebagai numpy structured array
+    import numpy as np
+    return np.fromfile(path, dtype=trace_dtype())
+
+
+def make_event_sink(mode=LOG_MODE, path=None):
+    if mode == "null":
+        return NullSink()
+    if mode == "text":
+        return TextSink()
+    if mode == "trace":
+        if path is None:
+            raise ValueError("Mode trace membutuhkan path file")
+        return TraceSink(path)
+    if mode == "journey":
+        if path is None:
+            raise ValueError("Mode journey membutuhkan path direktori")
+        import journey_trace
+        return journey_trace.JourneySink(path)
+    raise ValueError(f"Mode log tidak dikenal: {mode}")
+
+
+# Estimasi kuantil P-square (Jain & Chlamtac), memori konstan 5 marker
+class P2Quantile:
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        heights = self.heights
+        if len(heights) < 5:
+            bisect.insort(heights, x)
+            return
+
+        # cari sel tempat x berada dan perbarui marker ujung
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(heights, x) - 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        # marker ujung selalu di posisi 1 dan n, cukup perbarui marker tengah
+        desired = self.desired
+        increments = self.increments
+        desired[1] += increments[1]
+        desired[2] += increments[2]
+        desired[3] += increments[3]
+
+        # sesuaikan tinggi marker tengah dengan interpolasi parabolik
+        for i in (1, 2, 3):
+            d = desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (d <= -1 and positions[i - 1] - positions[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + d * (heights[i + d] - heights[i]) / \
+                        (positions[i + d] - positions[i])
+                heights[i] = height
+                positions[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        heights = self.heights
+        if not heights:
+            return 0.0
+        if len(heights) < 5:
+            # sampel masih sedikit, pakai kuantil langsung dari data terurut
+            return heights[min(len(heights) - 1, int(self.p * len(heights)))]
+        return heights[2]
+
+
+# Akumulator online untuk satu kelompok delay: jumlah, rata-rata/variansi Welford, maksimum, kuantil
+class RunningStat:
+    def __init__(self, quantiles=STAT_QUANTILES):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = None
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def add(self, x):
+        self.count += 1
+        self.total += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if self.max is None or x > self.max:
+            self.max = x
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def quantile(self, p):
+        return self.quantiles[p].value()
+
+
+# Statistik seluruh simulasi, diperbarui saat pelanggan selesai mengantri
+class StatisticsCollector:
+    def __init__(self, store=None, quantiles=STAT_QUANTILES):
+        self.store = store  # CustomerStore opsional untuk data per pelanggan
+        self.customers = 0  # jumlah pelanggan yang datang
+        self.stations = {name: RunningStat(quantiles)
+                         for name in ("hot-food", "sandwich", "cashier")}
+        self.routes = {route: RunningStat(quantiles) for route in (1, 2, 3)}
+        self.groups = {size: RunningStat(quantiles) for size in (1, 2, 3, 4)}
+
+    def record_arrival(self, customer):
+        self.customers += 1
+        if self.store is not None:
+            self.store.add(customer)
+
+    def record_departure(self, customer):
+        if self.store is not None:
+            self.store.release(customer)
+
+    def record_station(self, station_name, delay):
+        self.stations[station_name].add(delay)
+
+    def record_cashier(self, customer):
+        # dipanggil saat pelanggan mulai dilayani kasir (cashier_finish_queue)
+        self.record_station("cashier", customer.cashier_time)
+        if customer.route == 1:
+            total_delay = customer.hot_food_time + customer.cashier_time
+        elif customer.route == 2:
+            total_delay = customer.sandwich_time + customer.cashier_time
+        else:
+            total_delay = customer.cashier_time
+        self.record_total(customer, total_delay)
+
+    def record_total(self, customer, total_delay):
+        # total delay satu pelanggan di semua antrian
+        self.routes[customer.route].add(total_delay)
+        self.groups[customer.group_size].add(total_delay)
+
+    def quantiles(self):
+        # ringkasan kuantil per stasiun dan per rute
+        summary = {}
+        for name, stat in list(self.stations.items()) + \
+                [(f"route-{route}", stat) for route, stat in self.routes.items()]:
+            summary[name] = {p: stat.quantile(p) for p in stat.quantiles}
+        return summary
+
+
+# Panjang antrian (yang menunggu) rata-rata berbobot waktu dan maksimum,
+# diperbarui O(1) setiap ada pelanggan masuk atau keluar antrian
+class QueueMonitor:
+    def __init__(self, history=0, start_time=0):
+        self.start_time = start_time
+        self.last_time = start_time
+        self.length = 0
+        self.area = 0.0  # integral panjang antrian terhadap waktu
+        self.max = 0
+        # ring buffer (t, panjang) untuk plot, None jika tidak dipakai
+        self.samples = collections.deque(maxlen=history) if history else None
+
+    def update(self, now, length):
+        # panjang lama berlaku sejak perubahan terakhir sampai sekarang
+        self.area += self.length * (now - self.last_time)
+        self.last_time = now
+        self.length = length
+        if length > self.max:
+            self.max = length
+        if self.samples is not None:
+            self.samples.append((now, length))
+
+    def enter(self, now):
+        self.update(now, self.length + 1)
+
+    def leave(self, now):
+        self.update(now, self.length - 1)
+
+    def observe(self, now):
+        # perpanjang integral sampai now tanpa mengubah panjang (akhir simulasi)
+        self.update(now, self.length)
+
+    def time_average(self):
+        elapsed = self.last_time - self.start_time
+        return self.area / elapsed if elapsed > 0 else 0.0
+
+
+def make_queue_monitors(config):
+    # "cashiers" = total semua antrian kasir, "cashier-i" = antrian kasir ke-i
+    queues = {"hot-food": QueueMonitor(config.queue_history),
+              "sandwich": QueueMonitor(config.queue_history),
+              "cashiers": QueueMonitor(config.queue_history)}
+    for i in range(config.num_cashier):
+        queues[f"cashier-{i + 1}"] = QueueMonitor(config.queue_history)
+    return queues
 
 
 # Objek Pelanggan yang berinteraksi dengan semua layanan pada cafetaria
 class Pelanggan:
+    # __slots__ supaya setiap pelanggan tidak membawa __dict__ sendiri
+    __slots__ = ("customer_id", "route", "group_size",
+                 "hot_food_enter_time", "specialty_sandwich_enter_time", "cashier_enter_time",
+                 "hot_food_time", "sandwich_time",
+                 "hot_food_finish_queue", "specialty_sandwich_finish_queue", "cashier_finish_queue",
+                 "accumulated_cashier_time", "cashier_time")
+
     def __init__(self, customer_id, route, group_size):
         self.customer_id = customer_id
         self.route = route
@@ -59,115 +613,269 @@ class Pelanggan:
         self.cashier_time = 0  # delay pada antrian cashier
 
 
-# Urutan pengerjaan cafetaria : inisialisasi stasiun, setup simulasi, menjalankan simulasi, laporan simulasi
-def cafeteria_simulation(env):
-    hot_food = HotFoodStation(env, NUM_HOT_FOOD_EMPLOYEE)
-    sandwich = SpecialtySandwichStation(env, NUM_SANDWICH_EMPLOYEE)
-    drinks = DrinksStation(env)
-    cashier = CashierStation(env, NUM_CASHIER)
-
-    # Menyimpan seluruh customers yang datang, untuk menghitung statistik
-    customers = []
-
-    # Dictionary untuk menyimpan waktu panjang antrian
-    lengths_queue = {"hot-food": {},
-                     "sandwich": {},
-                     "cashiers": {}}
-
-    # Proses cafetaria sampai waktu simulasi berakhir
-    env.process(setup(env, lengths_queue, hot_food, sandwich, drinks,
-                cashier, customers, INTERVAL_CUSTOMER_ARRIVAL))
+# Satu baris per pelanggan, kolom sama dengan atribut Pelanggan
+@functools.lru_cache(maxsize=None)
+def customer_dtype():
+    import numpy as np
+    return np.dtype([("customer_id", "<i8"), ("route", "i1"), ("group_size", "i1"),
+                     ("hot_food_enter_time", "<f8"),
+                     ("specialty_sandwich_enter_time", "<f8"),
+                     ("cashier_enter_time", "<f8"),
+                     ("hot_food_time", "<f8"), ("sandwich_time", "<f8"),
+                     ("hot_food_finish_queue", "?"),
+                     ("specialty_sandwich_finish_queue", "?"),
+                     ("cashier_finish_queue", "?"),
+                     ("accumulated_cashier_time", "<f8"),
+                     ("cashier_time", "<f8")])
+
+
+# TRACE_DTYPE dan CUSTOMER_DTYPE dibuat saat pertama kali diakses (numpy diimport lazy)
+def __getattr__(name):
+    if name == "TRACE_DTYPE":
+        return trace_dtype()
+    if name == "CUSTOMER_DTYPE":
+        return customer_dtype()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Penyimpanan pelanggan sebagai structured array numpy (struct-of-arrays) dengan
+# indeks customer_id - 1. Pelanggan yang masih di sistem disimpan sebagai objek,
+# dan baru ditulis ke array saat meninggalkan cafetaria (atau saat finalize).
+class CustomerStore:
+    def __init__(self, capacity=1024):
+        import numpy as np
+        self.records = np.zeros(capacity, dtype=customer_dtype())
+        self.size = 0
+        self.active = {}
+
+    def _grow(self, size):
+        capacity = len(self.records)
+        while capacity < size:
+            capacity *= 2
+        if capacity != len(self.records):
+            import numpy as np
+            records = np.zeros(capacity, dtype=customer_dtype())
+            records[:self.size] = self.records[:self.size]
+            self.records = records
+
+    def add(self, customer):
+        self._grow(customer.customer_id)
+        self.size = max(self.size, customer.customer_id)
+        self.active[customer.customer_id] = customer
+
+    def _write(self, customer):
+        self.records[customer.customer_id - 1] = tuple(
+            getattr(customer, name) for name in customer_dtype().names)
+
+    def release(self, customer):
+        self._write(self.active.pop(customer.customer_id))
+
+    def finalize(self):
+        # tulis pelanggan yang masih di dalam sistem saat simulasi berakhir
+        for customer in self.active.values():
+            self._write(customer)
+        self.active = {}
+
+    def columns(self):
+        return self.records[:self.size]
+
+    def station_delays(self):
+        # vektor delay per stasiun, sama dengan filter pada report_1
+        records = self.columns()
+        return {"hot-food": records["hot_food_time"][(records["route"] == 1) & records["hot_food_finish_queue"]],
+                "sandwich": records["sandwich_time"][(records["route"] == 2) & records["specialty_sandwich_finish_queue"]],
+                "cashier": records["cashier_time"][records["cashier_finish_queue"]]}
+
+    def total_delays(self):
+        # total delay (hot food/sandwich + kasir) untuk pelanggan yang selesai antri kasir
+        records = self.columns()
+        finished = records[records["cashier_finish_queue"]]
+        return finished["route"], finished["group_size"], \
+            finished["hot_food_time"] + finished["sandwich_time"] + finished["cashier_time"]
+
+
+# Hasil satu run simulasi
+@dataclasses.dataclass
+class Results:
+    config: SimulationConfig
+    metrics: dict  # metrik report_1..report_5
+    stats: StatisticsCollector
+    queues: dict  # QueueMonitor per antrian (lihat make_queue_monitors)
+    registers: list  # statistik per kasir (lihat CashierBank.register_stats)
+    profile: dict = None  # ringkasan Profiler jika config.profile
 
-    env.run(until=SIMULATION_DURATION)
 
-    print("------------------------------------")
-    print(f'TOTAL CUSTOMERS: {len(customers)}')
-    print("------------------------------------")
+# Urutan pengerjaan cafetaria : inisialisasi stasiun, setup simulasi, menjalankan simulasi, laporan simulasi
+# log = event sink (lihat make_event_sink), default sesuai config.log_mode
+# store = CustomerStore opsional untuk menyimpan data setiap pelanggan
+# stats = StatisticsCollector (atau turunannya) opsional, menggantikan yang dibuat dari store
+# env boleh None untuk backend "heapq"
+def cafeteria_simulation(env, config=None, log=None, store=None, stats=None):
+    if config is None:
+        config = SimulationConfig()
+    log, stats, queues, streams, bank = prepare_run(config, log, store, stats)
+    profiler = None
+    if config.profile:
+        import instrumentation
+        profiler = instrumentation.Profiler(config)
+
+    simulation_start = time.perf_counter()
+    if config.backend == "heapq":
+        import event_kernel
+        event_kernel.heap_simulation(config, streams, log, stats, queues, bank, profiler)
+    elif config.backend == "simpy":
+        hot_food = HotFoodStation(env, config, streams, log, stats,
+                                  queues["hot-food"])
+        sandwich = SpecialtySandwichStation(env, config, streams, log, stats,
+                                            queues["sandwich"])
+        drinks = DrinksStation(env, streams, log)
+        cashier = CashierStation(env, config, log, stats, bank)
+        visit = cs
+        if profiler is not None:
+            visit = profiler.instrument_simpy(env, hot_food, sandwich, drinks, cashier)
+
+        # Proses cafetaria sampai waktu simulasi berakhir
+        process = setup(env, hot_food, sandwich, drinks, cashier, stats, config, streams, log,
+                        visit)
+        if profiler is not None:
+            process = profiler.instrument_setup(process)
+        env.process(process)
+
+        env.run(until=config.simulation_duration)
+    else:
+        raise ValueError(f"Backend tidak dikenal: {config.backend}")
+    return finish_run(config, log, store, stats, queues, bank, profiler, simulation_start)
+
+
+# Objek yang dipakai bersama semua backend: event sink, statistik, monitor antrian,
+# stream acak dan bank kasir
+def prepare_run(config, log=None, store=None, stats=None):
+    if log is None:
+        log = make_event_sink(config.log_mode, config.trace_path)
+    # Statistik dihitung online, pelanggan tidak disimpan setelah selesai
+    if stats is None:
+        stats = StatisticsCollector(store, config.stat_quantiles)
+
+    # Panjang antrian setiap stasiun, dipakai report_2 dan report_5
+    queues = make_queue_monitors(config)
+    # sink yang ikut mencatat perubahan panjang antrian (JourneySink)
+    watch_queues = getattr(log, "watch_queues", None)
+    if watch_queues is not None:
+        watch_queues(queues)
+
+    streams = config.make_streams()
+    bank = CashierBank(config.num_cashier, config.cashier_policy, streams, queues["cashiers"],
+                       [queues[f"cashier-{i + 1}"] for i in range(config.num_cashier)])
+    return log, stats, queues, streams, bank
+
+
+# Penutup run setelah waktu simulasi habis: tutup monitor dan sink, lalu laporan
+def finish_run(config, log, store, stats, queues, bank, profiler=None, simulation_start=None):
+    for monitor in queues.values():
+        monitor.observe(config.simulation_duration)
+    log.close()
+    if store is not None:
+        store.finalize()
+    simulation_end = time.perf_counter()
+
+    if config.print_report:
+        print("------------------------------------")
+        print(f'TOTAL CUSTOMERS: {stats.customers}')
+        print("------------------------------------")
 
     # Laporan simulasi
-    generate_report(customers, lengths_queue)
+    metrics = generate_report(stats, queues, config.print_report)
+    profile = None
+    if profiler is not None:
+        profiler.record_wall(simulation_end - simulation_start,
+                             time.perf_counter() - simulation_end)
+        profile = profiler.summary()
+    return Results(config, metrics, stats, queues,
+                   bank.register_stats(config.simulation_duration), profile)
 
 
 # Inisiasi pemilihan ukuran grup dan rutes
-def setup(env, lengths_queue, hot_food, sandwich, drink, cashier, customers, time_interval):
-    group_count = itertools.count()
-
-    group_size = random.Random(SEED_GROUP_SIZE + next(group_count)).choices(
-        [1, 2, 3, 4], weights=[0.5, 0.3, 0.1, 0.1])[0]  # pemilihan ukuran grup
+# visit = fungsi kunjungan stasiun (cs, atau versi terinstrumentasi dari Profiler)
+def setup(env, hot_food, sandwich, drink, cashier, stats, config, streams, log, visit=None):
+    if visit is None:
+        visit = cs
+    # kedatangan grup dibangkitkan di muka per blok numpy
+    import arrivals
+    group_arrivals = arrivals.ArrivalStream.from_config(config, streams)
+
+    group_size = group_arrivals.first_group_size()  # pemilihan ukuran grup
     customer_count = itertools.count()  # urutan bilangan bulat untuk customer
 
     # Buat pelanggan individu sesuai ukuran group
     for _ in range(group_size):
         customer_id = next(customer_count) + 1
-        route = random.Random(
-            SEED_ROUTE_CHOICE + customer_id).choices([1, 2, 3], weights=[0.8, 0.15, 0.05])[0]
+        route = streams.choice("route_choice", customer_id,
+                               [1, 2, 3], [0.8, 0.15, 0.05])
         # bikin setiap customer sesuai jumlah groupnya
         customer = Pelanggan(customer_id, route, group_size)
-        # masukkan customer kedalam list customers yang diatas
-        customers.append(customer)
-        print(
-            f'Pelanggan {customer.customer_id} TIBA di Cafetaria pada waktu {env.now:.2f}')
-        env.process(process_customer(env, lengths_queue, customer,
-                    hot_food, sandwich, drink, cashier))
-
-    # Pelanggan Datang selama waktu simulasi berjalan
-    while True:
-        group_size = random.Random(SEED_GROUP_SIZE + next(group_count)
-                                   ).choices([1, 2, 3, 4], weights=[0.5, 0.3, 0.1, 0.1])[0]
-
-        # Waktu antar kedatangan ukuran grup menyebar eksponensial dengan rata-rata 30 detik
-        time_interval = np.random.RandomState(
-            SEED_INTERVAL_TIME + next(group_count)).exponential(scale=30)
-        # waktu tunggu antar kedatangan pelanggan menyebar eksponensial 30 detik
+        # catat kedatangan customer pada statistik
+        stats.record_arrival(customer)
+        log.event(env.now, customer.customer_id, 'cafetaria', EVENT_ARRIVE, group_size)
+        env.process(process_customer(env, customer,
+                    hot_food, sandwich, drink, cashier, visit))
+
+    # Pelanggan Datang selama waktu simulasi berjalan. Tanpa arrival_profile waktu antar
+    # kedatangan grup menyebar eksponensial dengan rata-rata interval_customer_arrival
+    for time_interval, group_size in group_arrivals:
         yield env.timeout(time_interval)
 
         for _ in range(group_size):
             customer_id = next(customer_count) + 1
-            route = random.Random(
-                SEED_ROUTE_CHOICE + customer_id).choices([1, 2, 3], weights=[0.8, 0.15, 0.05])[0]
+            route = streams.choice("route_choice", customer_id,
+                                   [1, 2, 3], [0.8, 0.15, 0.05])
             customer = Pelanggan(customer_id, route, group_size)
-            customers.append(customer)
-            print(
-                f'Pelanggan {customer.customer_id} TIBA di Cafetaria pada waktu {env.now:.2f}')
-            env.process(process_customer(env, lengths_queue, customer,
-                        hot_food, sandwich, drink, cashier))
+            stats.record_arrival(customer)
+            log.event(env.now, customer.customer_id,
+                      'cafetaria', EVENT_ARRIVE, group_size)
+            env.process(process_customer(env, customer,
+                        hot_food, sandwich, drink, cashier, visit))
 
 
-def cs(env, lengths_queue, customer, station_name, station):
+def cs(env, customer, station_name, station):
     ## FOR DRINK ##
+    log = station.log
     if station_name == 'drink':
-        print(
-            f'Pelanggan {customer.customer_id} DILAYANI di stasiun {station_name} pada waktu {env.now:.2f}')
+        log.event(env.now, customer.customer_id, station_name, EVENT_SERVE)
 
         yield env.process(station.service(customer))
-        print(
-            f'Pelanggan {customer.customer_id} MENINGGALKAN {station_name} pada waktu {env.now:.2f}')
+        log.event(env.now, customer.customer_id, station_name, EVENT_LEAVE)
         return
 
-    print(
-        f"Pelanggan {customer.customer_id} Mulai MENGANTRI di Station {station_name} pada {env.now:.2f}.")
+    log.event(env.now, customer.customer_id, station_name, EVENT_QUEUE)
 
     ## FOR CASHIER ##
     if station_name == 'cashier':
-        index_shortest_queue = station.find_shortest_queue()
-        with station.queues[index_shortest_queue].request() as request:
+        bank = station.bank
+        if bank.policy == "serpentine":
+            # antrian bersama, kasir baru ditentukan saat mulai dilayani
+            which_cashier, resource = None, station.line
+        else:
+            which_cashier = bank.choose(customer.customer_id)
+            resource = station.queues[which_cashier]
+        with resource.request() as request:
             customer.cashier_enter_time = env.now
-            if len(station.queues[index_shortest_queue].queue) not in lengths_queue["cashiers"]:
-                lengths_queue["cashiers"][len(station.queues[index_shortest_queue].queue)
-                                          ] = customer.cashier_enter_time - station.queue_change_time
-            else:
-                lengths_queue["cashiers"][len(station.queues[index_shortest_queue].queue)
-                                          ] += customer.cashier_enter_time - station.queue_change_time
-
-            # Waktu customer masuk antrian
-            station.queue_change_time = env.now
+            # request yang belum dipenuhi berarti pelanggan menunggu di antrian
+            waiting = not request.triggered
+            if waiting:
+                bank.enter_queue(which_cashier, env.now)
             yield request
-            print(
-                f'Pelanggan {customer.customer_id} DILAYANI di {station_name} pada waktu {env.now:.2f}')
-
-            yield env.process(station.service(customer, lengths_queue, index_shortest_queue))
-            print(
-                f'Pelanggan {customer.customer_id} MENINGGALKAN {station_name} pada waktu {env.now:.2f}')
+            if waiting:
+                bank.leave_queue(which_cashier, env.now)
+            if which_cashier is None:
+                which_cashier = bank.acquire_register()
+            bank.start_service(which_cashier, env.now)
+            log.event(env.now, customer.customer_id,
+                      station_name, EVENT_SERVE, which_cashier)
+
+            yield env.process(station.service(customer))
+            bank.end_service(which_cashier, env.now)
+            log.event(env.now, customer.customer_id,
+                      station_name, EVENT_LEAVE)
             return
 
      ## FOR HOT FOOD & SANDWICH ##
@@ -176,453 +884,392 @@ def cs(env, lengths_queue, customer, station_name, station):
         # SET STATION ENTER QUEUE TIME
         if station_name == 'hot-food':
             customer.hot_food_enter_time = env.now
-            # print(f"MASUK ANTRIAN HOT-FOOD: {len(station.queue.queue)}")
-
-            if len(station.queue.queue) not in lengths_queue["hot-food"]:
-                lengths_queue["hot-food"][len(station.queue.queue)
-                                          ] = customer.hot_food_enter_time - station.queue_change_time
-            else:
-                lengths_queue["hot-food"][len(station.queue.queue)
-                                          ] += customer.hot_food_enter_time - station.queue_change_time
-
         elif station_name == 'sandwich':
             customer.specialty_sandwich_enter_time = env.now
-            # print(f"MASUK ANTRIAN SANDWICH: {len(station.queue.queue)}")
-
-            if len(station.queue.queue) not in lengths_queue["sandwich"]:
-                lengths_queue["sandwich"][len(station.queue.queue)
-                                          ] = customer.specialty_sandwich_enter_time - station.queue_change_time
-            else:
-                lengths_queue["sandwich"][len(station.queue.queue)
-                                          ] += customer.specialty_sandwich_enter_time - station.queue_change_time
 
-        # Waktu customer masuk antrian
-        station.queue_change_time = env.now
+        # request yang belum dipenuhi berarti pelanggan menunggu di antrian
+        waiting = not request.triggered
+        if waiting:
+            station.monitor.enter(env.now)
 
         yield request
+        if waiting:
+            station.monitor.leave(env.now)
         # req aja kaya membuka gitu
-        print(
-            f'Pelanggan {customer.customer_id} DILAYANI di stasiun {station_name} pada waktu {env.now:.2f}')
+        log.event(env.now, customer.customer_id, station_name, EVENT_SERVE)
 
-        yield env.process(station.service(customer, lengths_queue))
+        yield env.process(station.service(customer))
 
-        print(
-            f'Pelanggan {customer.customer_id} MENINGGALKAN {station_name} pada waktu {env.now:.2f}')
+        log.event(env.now, customer.customer_id, station_name, EVENT_LEAVE)
 
 
-def process_customer(env, lengths_queue, customer, hot_food, sandwich, drink, cashier):
+def process_customer(env, customer, hot_food, sandwich, drink, cashier, visit=cs):
     if customer.route == 1:
-        yield env.process(cs(env, lengths_queue, customer, 'hot-food', hot_food))
+        yield env.process(visit(env, customer, 'hot-food', hot_food))
         # print(f"MENINGGALKAN STATION HOT-FOOD: {len(hot_food.queue.queue)}")
-        yield env.process(cs(env, lengths_queue, customer, 'drink', drink))
-        yield env.process(cs(env, lengths_queue, customer, 'cashier', cashier))
+        yield env.process(visit(env, customer, 'drink', drink))
+        yield env.process(visit(env, customer, 'cashier', cashier))
         # print(f"MENINGGALKAN CASHIER: {len(cashier.queue.queue)}")
     elif customer.route == 2:
-        yield env.process(cs(env, lengths_queue, customer, 'sandwich', sandwich))
+        yield env.process(visit(env, customer, 'sandwich', sandwich))
         # print(f"MENINGGALKAN STATION SANDWICH: {len(sandwich.queue.queue)}")
-        yield env.process(cs(env, lengths_queue, customer, 'drink', drink))
-        yield env.process(cs(env, lengths_queue, customer, 'cashier', cashier))
+        yield env.process(visit(env, customer, 'drink', drink))
+        yield env.process(visit(env, customer, 'cashier', cashier))
         # print(f"MENINGGALKAN CASHIER: {len(cashier.queue.queue)}")
     elif customer.route == 3:
-        yield env.process(cs(env, lengths_queue, customer, 'drink', drink))
-        yield env.process(cs(env, lengths_queue, customer, 'cashier', cashier))
+        yield env.process(visit(env, customer, 'drink', drink))
+        yield env.process(visit(env, customer, 'cashier', cashier))
         # print(f"MENINGGALKAN CASHIER: {len(cashier.queue.queue)}")
 
+    cashier.stats.record_departure(customer)
+
 
 class HotFoodStation:
-    def __init__(self, env, NUM_HOT_FOOD_EMPLOYEE):
-        self.NUM_HOT_FOOD_EMPLOYEE = NUM_HOT_FOOD_EMPLOYEE
+    def __init__(self, env, config, streams, log, stats, monitor):
+        self.NUM_HOT_FOOD_EMPLOYEE = config.num_hot_food_employee
+        self.service_low, self.service_high = config.hot_food_service
         self.env = env
+        self.streams = streams
+        self.log = log
+        self.stats = stats
+        import simpy
         self.queue = simpy.Resource(env, capacity=1)
-        self.queue_change_time = 0
+        self.monitor = monitor  # QueueMonitor untuk self.queue
 
-    def service(self, customer, lengths_queue):
+    def service(self, customer):
         # Menghitung Lama Menunggu Antrian
         # delay = waktu dilakukan service - waktu pelanggan masuk antrian hotfood
         delay = self.env.now - customer.hot_food_enter_time
         customer.hot_food_time = delay
         customer.hot_food_finish_queue = True  # jika true, pelanggan dilayani
-        print(
-            f'Pelanggan {customer.customer_id} DELAY di antrian hotfood pada waktu {delay:.2f}')
-
-        # service time menyebar uniform (50,120)
-        service_time_start = 50.0/self.NUM_HOT_FOOD_EMPLOYEE
-        service_time_end = 120.0/self.NUM_HOT_FOOD_EMPLOYEE
-        service_time = random.Random(
-            SEED_ST_HOT_FOOD + customer.customer_id).uniform(service_time_start, service_time_end)
+        self.stats.record_station("hot-food", delay)
+        self.log.event(self.env.now, customer.customer_id,
+                       'hot-food', EVENT_DELAY, delay)
 
-        if len(self.queue.queue) not in lengths_queue["hot-food"]:
-            lengths_queue["hot-food"][int(len(self.queue.queue))
-                                      ] = self.env.now - self.queue_change_time
-        else:
-            # print(f"NOW = {self.env.now}")
-            # print(f"T = {self.queue_change_time}")
-
-            lengths_queue["hot-food"][len(self.queue.queue)
-                                      ] += self.env.now - self.queue_change_time
-
-        # Waktu customer keluar antrian
-        self.queue_change_time = self.env.now
+        # service time menyebar uniform (50,120) (config.hot_food_service)
+        service_time_start = self.service_low/self.NUM_HOT_FOOD_EMPLOYEE
+        service_time_end = self.service_high/self.NUM_HOT_FOOD_EMPLOYEE
+        service_time = self.streams.uniform(
+            "st_hot_food", customer.customer_id, service_time_start, service_time_end)
 
         # untuk memajukan waktu sebanyak waktu pelayanan
         yield self.env.timeout(service_time)
 
-        accumulated_cashier_time = random.Random(
-            SEED_ACT_HOT_FOOD + customer.customer_id).uniform(20.0, 40.0)
+        accumulated_cashier_time = self.streams.uniform(
+            "act_hot_food", customer.customer_id, 20.0, 40.0)
         customer.accumulated_cashier_time += accumulated_cashier_time
 
 
 class SpecialtySandwichStation:
-    def __init__(self, env, NUM_SANDWICH_EMPLOYEE):
-        self.NUM_SANDWICH_EMPLOYEE = NUM_SANDWICH_EMPLOYEE
+    def __init__(self, env, config, streams, log, stats, monitor):
+        self.NUM_SANDWICH_EMPLOYEE = config.num_sandwich_employee
+        self.service_low, self.service_high = config.sandwich_service
         self.env = env
+        self.streams = streams
+        self.log = log
+        self.stats = stats
+        import simpy
         self.queue = simpy.Resource(env, capacity=1)
-        self.queue_change_time = 0
+        self.monitor = monitor  # QueueMonitor untuk self.queue
 
-    def service(self, customer, lengths_queue):
+    def service(self, customer):
         # Menghitung Lama Menunggu Antrian
         # delay = waktu dilakukan service - waktu pelanggan masuk antrian sandwich
         delay = self.env.now - customer.specialty_sandwich_enter_time
         customer.sandwich_time = delay
         customer.specialty_sandwich_finish_queue = True  # jika true, pelanggan dilayani
-        print(
-            f'Pelanggan {customer.customer_id} DELAY di antrian sandwich pada waktu {delay:.2f}')
-
-        # service time menyebar uniform (60,180)
-        service_time_start = 60.0/self.NUM_SANDWICH_EMPLOYEE
-        service_time_end = 180.0/self.NUM_SANDWICH_EMPLOYEE
-        service_time = random.Random(
-            SEED_ST_SANDWICH + customer.customer_id).uniform(service_time_start, service_time_end)
+        self.stats.record_station("sandwich", delay)
+        self.log.event(self.env.now, customer.customer_id,
+                       'sandwich', EVENT_DELAY, delay)
 
-        if len(self.queue.queue) not in lengths_queue["sandwich"]:
-            lengths_queue["sandwich"][int(len(self.queue.queue))
-                                      ] = self.env.now - self.queue_change_time
-        else:
-            # print(f"NOW = {self.env.now}")
-            # print(f"T = {self.queue_change_time}")
-
-            lengths_queue["sandwich"][len(self.queue.queue)
-                                      ] += self.env.now - self.queue_change_time
-
-        # Waktu customer keluar antrian
-        self.queue_change_time = self.env.now
+        # service time menyebar uniform (60,180) (config.sandwich_service)
+        service_time_start = self.service_low/self.NUM_SANDWICH_EMPLOYEE
+        service_time_end = self.service_high/self.NUM_SANDWICH_EMPLOYEE
+        service_time = self.streams.uniform(
+            "st_sandwich", customer.customer_id, service_time_start, service_time_end)
 
         yield self.env.timeout(service_time)
 
-        accumulated_cashier_time = random.Random(
-            SEED_ACT_SANDWICH + customer.customer_id).uniform(5.0, 15.0)
+        accumulated_cashier_time = self.streams.uniform(
+            "act_sandwich", customer.customer_id, 5.0, 15.0)
         customer.accumulated_cashier_time += accumulated_cashier_time
 
 
 class DrinksStation:
-    def __init__(self, env):
+    def __init__(self, env, streams, log):
         self.env = env
+        self.streams = streams
+        self.log = log
 
     def service(self, customer):
         # service time menyebar uniform (5,10)
-        drink_service_time = random.Random(
-            SEED_ST_DRINKS + customer.customer_id).uniform(5.0, 20.0)
+        drink_service_time = self.streams.uniform(
+            "st_drinks", customer.customer_id, 5.0, 20.0)
         yield self.env.timeout(drink_service_time)
 
-        accumulated_cashier_time = random.Random(
-            SEED_ACT_DRINKS + customer.customer_id).uniform(5.0, 10.0)
+        accumulated_cashier_time = self.streams.uniform(
+            "act_drinks", customer.customer_id, 5.0, 10.0)
         customer.accumulated_cashier_time += accumulated_cashier_time
 
 
+# Bank kasir, dipakai kedua backend: pemilihan kasir sesuai kebijakan, panjang antrian
+# per kasir dan statistik per kasir (utilisasi, jumlah dilayani)
+class CashierBank:
+    POLICIES = ("jsq", "serpentine", "random")
+
+    def __init__(self, num_cashier, policy=CASHIER_POLICY, streams=None, monitor=None,
+                 register_monitors=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Kebijakan kasir tidak dikenal: {policy}")
+        self.num_cashier = num_cashier
+        self.policy = policy
+        self.streams = streams
+        self.monitor = monitor if monitor is not None else QueueMonitor()  # total semua antrian
+        self.register_monitors = register_monitors if register_monitors is not None else \
+            [QueueMonitor() for _ in range(num_cashier)]
+        # jsq: heap (panjang antrian, indeks) dengan lazy deletion, entri basi dibuang saat
+        # berada di puncak. Seri dipecah ke indeks terkecil seperti min() linear yang lama.
+        self.lengths = [0] * num_cashier
+        self.heap = [(0, i) for i in range(num_cashier)]
+        # serpentine: heap indeks kasir yang sedang kosong
+        self.free = list(range(num_cashier))
+        self.busy_since = [None] * num_cashier
+        self.busy_time = [0.0] * num_cashier
+        self.served = [0] * num_cashier
+
+    def choose(self, customer_id):
+        if self.policy == "random":
+            index = int(self.streams.u("cashier_choice", customer_id) * self.num_cashier)
+            return min(index, self.num_cashier - 1)
+        heap = self.heap
+        lengths = self.lengths
+        while heap[0][0] != lengths[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    def _set_length(self, index, length):
+        self.lengths[index] = length
+        heapq.heappush(self.heap, (length, index))
+        if len(self.heap) > 4 * self.num_cashier + 16:
+            # bangun ulang supaya entri basi tidak menumpuk
+            self.heap = [(length, i) for i, length in enumerate(self.lengths)]
+            heapq.heapify(self.heap)
+
+    # index None = antrian bersama (serpentine)
+    def enter_queue(self, index, now):
+        self.monitor.enter(now)
+        if index is not None:
+            self.register_monitors[index].enter(now)
+            self._set_length(index, self.lengths[index] + 1)
+
+    def leave_queue(self, index, now):
+        self.monitor.leave(now)
+        if index is not None:
+            self.register_monitors[index].leave(now)
+            self._set_length(index, self.lengths[index] - 1)
+
+    def acquire_register(self):
+        # serpentine: kasir kosong dengan indeks terkecil
+        return heapq.heappop(self.free)
+
+    def start_service(self, index, now):
+        self.busy_since[index] = now
+        self.served[index] += 1
+
+    def end_service(self, index, now):
+        self.busy_time[index] += now - self.busy_since[index]
+        self.busy_since[index] = None
+        if self.policy == "serpentine":
+            heapq.heappush(self.free, index)
+
+    def register_stats(self, now):
+        registers = []
+        for i in range(self.num_cashier):
+            busy = self.busy_time[i]
+            if self.busy_since[i] is not None:
+                busy += now - self.busy_since[i]
+            monitor = self.register_monitors[i]
+            registers.append({"register": i + 1, "served": self.served[i],
+                              "utilization": busy / now if now > 0 else 0.0,
+                              "avg_queue": monitor.time_average(), "max_queue": monitor.max})
+        return registers
+
+
 class CashierStation:
-    def __init__(self, env, NUM_CASHIER):
+    def __init__(self, env, config, log, stats, bank):
         self.env = env
-        self.queues = [simpy.Resource(env, capacity=1)
-                       for _ in range(NUM_CASHIER)]
-        self.queue_change_time = 0
+        self.log = log
+        self.stats = stats
+        self.bank = bank
+        import simpy
+        if bank.policy == "serpentine":
+            # satu antrian bersama yang melayani semua kasir
+            self.line = simpy.Resource(env, capacity=config.num_cashier)
+        else:
+            self.queues = [simpy.Resource(env, capacity=1)
+                           for _ in range(config.num_cashier)]
 
-    def service(self, customer, lengths_queue, which_cashier):
+    def service(self, customer):
         # Menghitung Lama Menunggu Antrian
         # delay = waktu dilakukan service - waktu pelanggan masuk antrian kasir
         delay = self.env.now - customer.cashier_enter_time
         customer.cashier_time = delay
         customer.cashier_finish_queue = True  # jika true, pelanggan dilayani
-        print(
-            f'Pelanggan {customer.customer_id} DELAY di antrian kasir pada waktu {delay:.2f}')
+        self.stats.record_cashier(customer)
+        self.log.event(self.env.now, customer.customer_id,
+                       'cashier', EVENT_DELAY, delay)
 
         cashier_service_time = customer.accumulated_cashier_time
 
-        if len(self.queues[which_cashier].queue) not in lengths_queue["cashiers"]:
-            lengths_queue["cashiers"][int(len(self.queue[which_cashier].queue))
-                                      ] = self.env.now - self.queue_change_time
-        else:
-            # print(f"NOW = {self.env.now}")
-            # print(f"T = {self.queue_change_time}")
-
-            lengths_queue["cashiers"][len(self.queues[which_cashier].queue)
-                                      ] += self.env.now - self.queue_change_time
-
-        # Waktu customer keluar antrian
-        self.queue_change_time = self.env.now
-
         yield self.env.timeout(cashier_service_time)
 
-    def find_shortest_queue(self):
-        shortest_queue_index = min(
-            range(len(self.queues)), key=lambda i: len(self.queues[i].queue))
-        return shortest_queue_index
-
 
 # Laporan statistik
-def report_1(customers):
-    # Menghitung pelanggan yang sudah dilayani di masing-masing stasiun
-    hot_food_delays = [customer.hot_food_time for customer in customers if customer.route ==
-                       1 and customer.hot_food_finish_queue]
-    sandwich_delays = [customer.sandwich_time for customer in customers if customer.route ==
-                       2 and customer.specialty_sandwich_finish_queue]
-    cashier_delays = [
-        customer.cashier_time for customer in customers if customer.cashier_finish_queue]
-
-    # Max delay untuk stasiun hot food
-    hot_food_max_delay = max(hot_food_delays)
-
-    # Max delay untuk stasiun sandwich
-    sandwich_max_delay = max(sandwich_delays)
-
-    # Max delay untuk stasiun kasir
-    cashier_max_delay = max(cashier_delays)
-
-    # Hitung total waktu delay per station
-    total_delay_time_hot_food = sum(hot_food_delays)
-    total_delay_time_sandwich = sum(sandwich_delays)
-    total_delay_time_cashiers = sum(cashier_delays)
-
-    # Hitung total pelanggan yang mengalami delay per station
-    total_delayed_customers_hot_food = len(hot_food_delays)
-    total_delayed_customers_sandwich = len(sandwich_delays)
-    total_delayed_customers_cashiers = len(cashier_delays)
-
-    # Hitung rata-rata delay per orang per station
-    avg_delay_per_person_hot_food = total_delay_time_hot_food / \
-        total_delayed_customers_hot_food
-
-    avg_delay_per_person_sandwich = total_delay_time_sandwich / \
-        total_delayed_customers_sandwich
-
-    avg_delay_per_person_cashiers = total_delay_time_cashiers / \
-        total_delayed_customers_cashiers
-
+def report_1(metrics):
     # Menampilkan hasil laporan
     print("1. Rata-rata dan maksimum delay antrian untuk Hot-Food, Specialty Sandwiches, dan Kasir (Terlepas dari kasir mana)")
-    print(f"\nMetrik Hot Food:")
-    print(f"  Rata-rata Delay: {avg_delay_per_person_hot_food:.2f} Detik")
-    print(f"  Maksimum Delay : {hot_food_max_delay:.2f} Detik")
-
-    print(f"\nMetrik Specialty Sandwich:")
-    print(f"  Rata-rata Delay: {avg_delay_per_person_sandwich:.2f} Detik")
-    print(f"  Maksimum Delay : {sandwich_max_delay:.2f} Detik")
-
-    print(f"\nMetrik Kasir:")
-    print(f"  Rata-rata Delay: {avg_delay_per_person_cashiers:.2f} Detik")
-    print(f"  Maksimum Delay : {cashier_max_delay:.2f} Detik")
-
-
-def report_2(lengths_queue):
-    print(lengths_queue)
-    # Calculate Time Average in Queue for Hot-Food Station
-    pembilang_hot_food = 0
-    penyebut_hot_food = 0
-    for key in lengths_queue["hot-food"]:
-        pembilang_hot_food += (key * lengths_queue["hot-food"][key])
-        penyebut_hot_food += lengths_queue["hot-food"][key]
-
-    # Calculate Time Average in Queue for Specialty Sandwich Station
-    pembilang_sandwich = 0
-    penyebut_sandwich = 0
-    for key in lengths_queue["sandwich"]:
-        pembilang_sandwich += (key * lengths_queue["sandwich"][key])
-        penyebut_sandwich += lengths_queue["sandwich"][key]
-
-    # Calculate Time Average in Queue for Cashiers
-    pembilang_cashiers = 0
-    penyebut_cashiers = 0
-    for key in lengths_queue["cashiers"]:
-        pembilang_cashiers += (key * lengths_queue["cashiers"][key])
-        penyebut_cashiers += lengths_queue["cashiers"][key]
-
-    # Metrik for All Station
-    time_avg_queue_hot_food = pembilang_hot_food/penyebut_hot_food
-    max_queue_customer_hot_food = list(lengths_queue["hot-food"].keys())[-1]
-
-    time_avg_queue_sandwich = pembilang_sandwich/penyebut_sandwich
-    max_queue_customer_sandwich = list(lengths_queue["sandwich"].keys())[-1]
-
-    time_avg_queue_cashiers = pembilang_cashiers/penyebut_cashiers
-    max_queue_customer_cashiers = list(lengths_queue["cashiers"].keys())[-1]
-
-    # Menampilkan hasil laporan
-    print("\n\n2. Rata-rata waktu dan jumlah maksimum dalam antrian untuk Hot Food dan Specialty Sandwiches (terpisah), serta rata-rata waktu dan jumlah maksimum total dalam semua antrian kasir")
-    print(f"\nMetrik Hot Food:")
-    print(
-        f"  Rata-rata Waktu di Antrian: {time_avg_queue_hot_food:.2f} Detik")
-    print(
-        f"  Maksimum Antrian:  {max_queue_customer_hot_food} Customer")
-
-    print(f"\nMetrik Specialty Sandwich:")
-    print(
-        f"  Rata-rata Waktu di Antrian: {time_avg_queue_sandwich:.2f} Detik")
-    print(
-        f"  Maksimum Antrian:  {max_queue_customer_sandwich} Customer")
-
-    print(f"\nMetrik Cashiers:")
-    print(
-        f"  Rata-rata Waktu di Antrian: {time_avg_queue_cashiers:.2f} Detik")
-    print(
-        f"  Maksimum Antrian:  {max_queue_customer_cashiers} Customer")
-
-
-def report_3(customers):
-    # Menghitung pelanggan yang sudah dilayani di masing-masing stasiun
-    route_1_delays = [customer.hot_food_time+customer.cashier_time for customer in customers if customer.route ==
-                      1 and customer.hot_food_finish_queue and customer.cashier_finish_queue]
-    route_2_delays = [customer.sandwich_time+customer.cashier_time for customer in customers if customer.route ==
-                      2 and customer.specialty_sandwich_finish_queue and customer.cashier_finish_queue]
-    route_3_delays = [
-        customer.cashier_time for customer in customers if customer.route == 3 and customer.cashier_finish_queue]
-
-    # Max delay untuk rute 1
-    route_1_max_delay = max(route_1_delays)
+    for title, prefix in (("Hot Food", "hot_food"), ("Specialty Sandwich", "sandwich"),
+                          ("Kasir", "cashier")):
+        print(f"\nMetrik {title}:")
+        print(f"  Rata-rata Delay: {metrics[f'{prefix}_avg_delay']:.2f} Detik")
+        print(f"  Maksimum Delay : {metrics[f'{prefix}_max_delay']:.2f} Detik")
 
-    # Max delay untuk rute 2
-    route_2_max_delay = max(route_2_delays)
 
-    # Max delay untuk rute 3
-    route_3_max_delay = max(route_3_delays)
-
-    # Hitung total waktu delay per rute
-    total_delay_time_route_1 = sum(route_1_delays)
-    total_delay_time_route_2 = sum(route_2_delays)
-    total_delay_time_route_3 = sum(route_3_delays)
-
-    # Hitung total pelanggan yang mengalami delay per rute
-    total_delayed_customers_route_1 = len(route_1_delays)
-    total_delayed_customers_route_2 = len(route_2_delays)
-    total_delayed_customers_route_3 = len(route_3_delays)
-
-    # Hitung rata-rata delay per orang per rute
-    avg_delay_per_person_route_1 = total_delay_time_route_1 / \
-        total_delayed_customers_route_1
-
-    avg_delay_per_person_route_2 = total_delay_time_route_2 / \
-        total_delayed_customers_route_2
+def report_2(metrics):
+    print("\n\n2. Rata-rata waktu dan jumlah maksimum dalam antrian untuk Hot Food dan Specialty Sandwiches (terpisah), serta rata-rata waktu dan jumlah maksimum total dalam semua antrian kasir")
+    # antrian kasir = total semua antrian kasir
+    for title, prefix in (("Hot Food", "hot_food"), ("Specialty Sandwich", "sandwich"),
+                          ("Cashiers", "cashiers")):
+        print(f"\nMetrik {title}:")
+        print(
+            f"  Rata-rata Waktu di Antrian: {metrics[f'{prefix}_avg_queue']:.2f} Detik")
+        print(
+            f"  Maksimum Antrian:  {metrics[f'{prefix}_max_queue']} Customer")
 
-    avg_delay_per_person_route_3 = total_delay_time_route_3 / \
-        total_delayed_customers_route_3
 
-    # Menampilkan hasil laporan
+def report_3(metrics):
     print("\n\n3. Rata-rata dan maksimum total delay dalam semua antrian untuk masing-masing tipe pelanggan (terpisah)")
-    print(f"\nMetrik Rute 1:")
-    print(
-        f"  Rata-rata Delay: {avg_delay_per_person_route_1:.2f} Detik")
-    print(f"  Maksimum Delay dalam Antrian: {route_1_max_delay:.2f} Detik")
-
-    print(f"\nMetrik Rute 2:")
-    print(
-        f"  Rata-rata Delay: {avg_delay_per_person_route_2:.2f} Detik")
-    print(f"  Maksimum Delay dalam Antrian: {route_2_max_delay:.2f} Detik")
-
-    print(f"\nMetrik Rute 3:")
-    print(
-        f"  Rata-rata Delay: {avg_delay_per_person_route_3:.2f} Detik")
-    print(f"  Maksimum Delay dalam Antrian: {route_3_max_delay:.2f} Detik")
-
-
-def report_4(customers):
-    # Mengelompokkan pelanggan berdasarkan ukuran grup
-    customers_group = {1: [], 2: [], 3: [], 4: []}
+    for route in (1, 2, 3):
+        print(f"\nMetrik Rute {route}:")
+        print(
+            f"  Rata-rata Delay: {metrics[f'route_{route}_avg_delay']:.2f} Detik")
+        print(f"  Maksimum Delay dalam Antrian: {metrics[f'route_{route}_max_delay']:.2f} Detik")
 
-    def calculate_time(customer):
-        # Menghitung total waktu delay berdasarkan rute pelanggan
-        if customer.route == 1:
-            return customer.hot_food_time + customer.cashier_time
-        elif customer.route == 2:
-            return customer.sandwich_time + customer.cashier_time
-        elif customer.route == 3:
-            return customer.cashier_time
-
-    # Memisahkan pelanggan berdasarkan ukuran grup dan menghitung waktu delaynya
-    for customer in customers:
-        if customer.cashier_finish_queue:
-            customers_group[customer.group_size].append(
-                calculate_time(customer))
-
-    # Mencari rata-rata per grup
-    group_avgs = {group_size: statistics.mean(
-        delays) for group_size, delays in customers_group.items()}
-
-    # Rata-rata total terponderasi
-    overall_avg = (
-        0.5 * group_avgs.get(1, 0) +
-        0.3 * group_avgs.get(2, 0) +
-        0.1 * group_avgs.get(3, 0) +
-        0.1 * group_avgs.get(4, 0)
-    )
 
-    # Menampilkan hasil laporan
+def report_4(metrics):
     print("\n\n4. Rata-rata total delay untuk semua pelanggan, ditemukan dengan memberikan bobot rata-rata total delay individu mereka dengan probabilitas masing-masing kemunculan")
-    print(f"\nRata-rata Keseluruhan: {overall_avg:.2f} Detik")
-
-
-def report_5(customers, lengths_queue):
-    # Calculate Time Average in Queue for Hot-Food Station
-    pembilang_hot_food = 0
-    penyebut_hot_food = 0
-    for key in lengths_queue["hot-food"]:
-        pembilang_hot_food += (key * lengths_queue["hot-food"][key])
-        penyebut_hot_food += lengths_queue["hot-food"][key]
-
-    # Calculate Time Average in Queue for Specialty Sandwich Station
-    pembilang_sandwich = 0
-    penyebut_sandwich = 0
-    for key in lengths_queue["sandwich"]:
-        pembilang_sandwich += (key * lengths_queue["sandwich"][key])
-        penyebut_sandwich += lengths_queue["sandwich"][key]
-
-    # Calculate Time Average in Queue for Cashiers
-    pembilang_cashiers = 0
-    penyebut_cashiers = 0
-    for key in lengths_queue["cashiers"]:
-        pembilang_cashiers += (key * lengths_queue["cashiers"][key])
-        penyebut_cashiers += lengths_queue["cashiers"][key]
-
-    # Metrik All Station
-    time_avg_delay_hot_food = pembilang_hot_food/penyebut_hot_food
-    time_avg_delay_sandwich = pembilang_sandwich/penyebut_sandwich
-    time_avg_delay_cashiers = pembilang_cashiers/penyebut_cashiers
-
-    # Calculate Time Average Queue in The Entire System
-    time_avg_all_station = statistics.mean(
-        [time_avg_delay_hot_food, time_avg_delay_sandwich, time_avg_delay_cashiers])
+    print(f"\nRata-rata Keseluruhan: {metrics['overall_avg_delay']:.2f} Detik")
 
-    # Menampilkan hasil laporan
+
+def report_5(metrics):
     print("\n\n5. Rata-rata total delay dan jumlah maksimum pelanggan di seluruh sistem (for reporting to the fire marshall)")
     print(
-        f"\nRata-rata Waktu Antrian di Seluruh Sistem: {time_avg_all_station:.2f} Detik")
+        f"\nRata-rata Waktu Antrian di Seluruh Sistem: {metrics['system_avg_queue']:.2f} Detik")
     print(
-        f"Jumlah Maksimum Pelanggan di Seluruh Sistem: {len(customers)} Pelanggan")
+        f"Jumlah Maksimum Pelanggan di Seluruh Sistem: {metrics['total_customers']} Pelanggan")
 
 
-def generate_report(customers, lengths_queue):
+def print_report(metrics):
     print("\n------------------- REPORT -------------------\n")
-
-    report_1(customers)
-    report_2(lengths_queue)
-    report_3(customers)
-    report_4(customers)
-    report_5(customers, lengths_queue)
-
+    report_1(metrics)
+    report_2(metrics)
+    report_3(metrics)
+    report_4(metrics)
+    report_5(metrics)
     print("\n----------------------------------------------")
 
 
-def run_simulation():
-    env = simpy.Environment()
-    cafeteria_simulation(env)
+# Metrik kelima laporan dihitung sekaligus oleh reporting.py (tanpa print),
+# verbose=True menampilkan laporannya
+def generate_report(stats, queues, verbose=True):
+    import reporting
+    metrics = reporting.compute_metrics(reporting.run_accumulator(stats, queues)).row(0)
+    if verbose:
+        print_report(metrics)
+    return metrics
+
+
+# API utama: jalankan satu run dengan config, kembalikan Results
+def run(config=None, log=None, store=None, stats=None):
+    env = None
+    if config is None or config.backend == "simpy":
+        import simpy
+        env = simpy.Environment()
+    return cafeteria_simulation(env, config, log, store, stats)
+
+
+def run_simulation(config=None):
+    return run(config)
+
+
+# "0:0.5,1800:3" -> ((0.0, 0.5), (1800.0, 3.0)) untuk SimulationConfig.arrival_profile
+def parse_arrival_profile(text):
+    profile = []
+    for piece in text.split(","):
+        start, factor = piece.split(":")
+        profile.append((float(start), float(factor)))
+    return tuple(profile)
+
+
+def parse_args(argv=None):
+    import argparse
+    defaults = SimulationConfig()
+    parser = argparse.ArgumentParser(description="Simulasi cafetaria")
+    parser.add_argument("--hot-food", type=int, default=defaults.num_hot_food_employee,
+                        help="jumlah pelayan hotfood")
+    parser.add_argument("--sandwich", type=int, default=defaults.num_sandwich_employee,
+                        help="jumlah pelayan sandwich")
+    parser.add_argument("--cashier", type=int, default=defaults.num_cashier,
+                        help="jumlah kasir")
+    parser.add_argument("--duration", type=float, default=defaults.simulation_duration,
+                        help="waktu simulasi (detik)")
+    parser.add_argument("--interval", type=float, default=defaults.interval_customer_arrival,
+                        help="rata-rata waktu antar kedatangan grup (detik)")
+    parser.add_argument("--arrival-profile", type=parse_arrival_profile, default=(),
+                        metavar="T:F,...",
+                        help="profil laju kedatangan, faktor F mulai detik T "
+                             "(contoh 0:0.5,1800:3,3600:1)")
+    parser.add_argument("--seed-offset", type=int, default=defaults.seed_offset)
+    parser.add_argument("--cashier-policy", choices=CashierBank.POLICIES,
+                        default=defaults.cashier_policy)
+    parser.add_argument("--random-mode", choices=["fast", "legacy"],
+                        default=defaults.random_mode)
+    parser.add_argument("--backend", choices=["simpy", "heapq"],
+                        default=defaults.backend)
+    parser.add_argument("--log-mode", choices=["null", "text", "trace", "journey"],
+                        default=defaults.log_mode)
+    parser.add_argument("--trace-path", default=None)
+    parser.add_argument("--profile", default=None, metavar="PATH",
+                        help="simpan ringkasan instrumentasi run ke file JSON")
+    parser.add_argument("--quiet", action="store_true",
+                        help="jangan tampilkan laporan")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = SimulationConfig(num_hot_food_employee=args.hot_food,
+                              num_sandwich_employee=args.sandwich,
+                              num_cashier=args.cashier,
+                              cashier_policy=args.cashier_policy,
+                              simulation_duration=args.duration,
+                              interval_customer_arrival=args.interval,
+                              arrival_profile=args.arrival_profile,
+                              seed_offset=args.seed_offset,
+                              random_mode=args.random_mode,
+                              backend=args.backend,
+                              log_mode=args.log_mode,
+                              trace_path=args.trace_path,
+                              print_report=not args.quiet,
+                              profile=args.profile is not None)
+    results = run(config)
+    if args.profile is not None:
+        import json
+        with open(args.profile, "w") as file:
+            json.dump(results.profile, file, indent=2)
+    return results
 
 
 # START PROGRAM
-run_simulation()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Proses kedatangan grup sebagai stream yang dibangkitkan di muka per blok numpy dan
+# dikonsumsi event loop (setup SimPy, kernel heapq) atau langsung per blok (fast_engine).
+# Laju kedatangan boleh berubah terhadap waktu lewat config.arrival_profile: profil
+# piecewise-konstan ((t_mulai, faktor), ...), laju grup = faktor / interval_customer_arrival
+# dari t_mulai sampai titik berikutnya (titik terakhir berlaku sampai simulasi selesai).
+# Contoh jam makan siang: ((0, 0.5), (1800, 3.0), (3600, 1.0)).
+# Waktu kedatangan dibangkitkan dengan inversi intensitas kumulatif Lambda(t): epoch
+# proses Poisson laju 1 (jumlah kumulatif Exp(1)) dipetakan lewat Lambda^-1. Berbeda
+# dengan thinning tidak ada kandidat yang ditolak, jadi biaya per grup sama untuk
+# puncak setajam apa pun dan satu blok cukup satu searchsorted.
+# Key stream sama dengan setup() lama: grup 0 datang di t=0 (ukuran key 0), grup g >= 1
+# memakai key 2g-1 untuk ukuran dan key 2g untuk interval (atau Exp(1) untuk epoch).
+import numpy as np
+
+# jumlah grup yang dibangkitkan sekaligus
+ARRIVAL_BLOCK = 1024
+GROUP_SIZES = [1, 2, 3, 4]
+GROUP_SIZE_WEIGHTS = [0.5, 0.3, 0.1, 0.1]
+
+
+# Profil laju piecewise-konstan dan inversi Lambda(t)
+class RateProfile:
+    def __init__(self, profile, interval_mean):
+        starts = np.array([float(start) for start, _ in profile])
+        factors = np.array([float(factor) for _, factor in profile])
+        if not len(starts) or starts[0] != 0.0 or (np.diff(starts) <= 0).any():
+            raise ValueError("arrival_profile harus dimulai di t=0 dan waktunya naik")
+        if (factors < 0).any() or factors[-1] <= 0:
+            raise ValueError("faktor arrival_profile harus >= 0 dan faktor terakhir > 0")
+        self.starts = starts
+        self.rates = factors / interval_mean
+        # Lambda di setiap titik awal segmen
+        self.cumulative = np.concatenate(([0.0], np.cumsum(np.diff(starts) * self.rates[:-1])))
+
+    def cumulative_rate(self, t):
+        # Lambda(t) = jumlah harapan grup yang datang di [0, t]
+        index = np.searchsorted(self.starts, t, side="right") - 1
+        return self.cumulative[index] + (t - self.starts[index]) * self.rates[index]
+
+    def rate(self, t):
+        return self.rates[np.searchsorted(self.starts, t, side="right") - 1]
+
+    def invert(self, epochs):
+        # Lambda^-1, segmen berlaju 0 dilewati karena side="right" memilih titik terakhir
+        # dengan Lambda <= epoch (segmen sesudahnya punya Lambda yang sama)
+        index = np.searchsorted(self.cumulative, epochs, side="right") - 1
+        return self.starts[index] + (epochs - self.cumulative[index]) / self.rates[index]
+
+
+def expected_groups(config):
+    # jumlah harapan grup setelah grup pertama selama simulasi
+    if not config.arrival_profile:
+        return config.simulation_duration / config.interval_customer_arrival
+    profile = RateProfile(config.arrival_profile, config.interval_customer_arrival)
+    return float(profile.cumulative_rate(config.simulation_duration))
+
+
+# Iterator (interval, ukuran grup) untuk grup 1, 2, ... yang datang sebelum duration.
+# Interval dijumlahkan berurutan seperti env.timeout di event loop, jadi waktu dari
+# draw_block sama persis dengan jam event loop. State hanya angka dan list blok yang
+# sedang dipakai, sehingga bisa di-pickle bersama kernel heapq (checkpoint).
+class ArrivalStream:
+    def __init__(self, streams, duration, interval_mean, profile=(), block_size=ARRIVAL_BLOCK):
+        self.streams = streams
+        self.duration = duration
+        self.interval_mean = interval_mean
+        self.profile = RateProfile(profile, interval_mean) if profile else None
+        self.block_size = block_size
+        self.next_group = 1
+        self.now = 0.0  # waktu grup terakhir yang sudah dibangkitkan
+        self.epoch = 0.0  # Lambda grup terakhir (hanya dengan profil)
+        self.last_arrival = 0.0  # Lambda^-1 grup terakhir, sebelum dijumlahkan ulang
+        self.finished = False
+        self.intervals = []
+        self.sizes = []
+        self.position = 0
+
+    @classmethod
+    def from_config(cls, config, streams):
+        return cls(streams, config.simulation_duration, config.interval_customer_arrival,
+                   config.arrival_profile)
+
+    def first_group_size(self):
+        return self.streams.choice("group_size", 0, GROUP_SIZES, GROUP_SIZE_WEIGHTS)
+
+    def draw_block(self):
+        # (waktu, interval, ukuran) blok grup berikutnya, array kosong jika sudah habis
+        if self.finished:
+            return np.zeros(0), np.zeros(0), np.zeros(0, dtype=int)
+        streams = self.streams
+        groups = np.arange(self.next_group, self.next_group + self.block_size)
+        if self.profile is None:
+            intervals = streams.exponential_array("interval_time", 2 * groups, self.interval_mean)
+        else:
+            epochs = np.cumsum(np.concatenate((
+                [self.epoch], streams.exponential_array("interval_time", 2 * groups, 1.0))))
+            arrivals = self.profile.invert(epochs[1:])
+            intervals = np.diff(np.concatenate(([self.last_arrival], arrivals)))
+            self.epoch = epochs[-1]
+            self.last_arrival = arrivals[-1]
+        times = np.cumsum(np.concatenate(([self.now], intervals)))[1:]
+        sizes = streams.choice_array("group_size", 2 * groups - 1, GROUP_SIZES, GROUP_SIZE_WEIGHTS)
+        inside = int(np.searchsorted(times, self.duration))
+        if inside < len(times):
+            self.finished = True
+        self.now = times[-1]
+        self.next_group += self.block_size
+        return times[:inside], intervals[:inside], sizes[:inside]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.position == len(self.intervals):
+            _, intervals, sizes = self.draw_block()
+            if not len(intervals):
+                raise StopIteration
+            self.intervals = intervals.tolist()
+            self.sizes = sizes.tolist()
+            self.position = 0
+        position = self.position
+        self.position += 1
+        return self.intervals[position], self.sizes[position]
@@ -0,0 +1,82 @@
+# Benchmark bank kasir untuk k = 2..64 kasir:
+# 1. biaya pemilihan kasir: min() linear (find_shortest_queue lama) vs heap CashierBank
+# 2. run penuh per kebijakan (jsq, serpentine, random) dengan beban yang ikut diskalakan
+# Jalankan dari root repo: python benchmarks/bench_cashier_bank.py
+import os
+import sys
+import math
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CafetariaSimulation as cafe  # noqa: E402
+
+NUM_CASHIERS = (2, 4, 8, 16, 32, 64)
+NUM_OPERATIONS = 100_000
+
+
+def linear_selection(num_cashier, operations):
+    # logika find_shortest_queue lama pada list panjang antrian
+    lengths = [0] * num_cashier
+    for leave in operations:
+        which = min(range(num_cashier), key=lambda i: lengths[i])
+        lengths[which] += 1
+        if leave is not None and lengths[leave % num_cashier] > 0:
+            lengths[leave % num_cashier] -= 1
+
+
+def heap_selection(num_cashier, operations):
+    bank = cafe.CashierBank(num_cashier)
+    for now, leave in enumerate(operations):
+        bank.enter_queue(bank.choose(now), now)
+        if leave is not None and bank.lengths[leave % num_cashier] > 0:
+            bank.leave_queue(leave % num_cashier, now)
+
+
+def make_operations():
+    # setiap operasi: satu pelanggan masuk, lalu kadang satu pelanggan keluar dari kasir acak
+    rng = random.Random(0)
+    return [rng.randrange(1 << 30) if rng.random() < 0.9 else None
+            for _ in range(NUM_OPERATIONS)]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def scaled_config(num_cashier, policy):
+    # beban per kasir tetap: staffing 5/2/3 (stabil) diskalakan dengan k/3
+    scale = num_cashier / 3
+    return cafe.SimulationConfig(num_cashier=num_cashier,
+                                 num_hot_food_employee=math.ceil(5 * scale),
+                                 num_sandwich_employee=math.ceil(2 * scale),
+                                 interval_customer_arrival=cafe.INTERVAL_CUSTOMER_ARRIVAL / scale,
+                                 cashier_policy=policy, backend="heapq",
+                                 log_mode="null", print_report=False, stat_quantiles=())
+
+
+if __name__ == "__main__":
+    operations = make_operations()
+    print(f"Pemilihan kasir ({NUM_OPERATIONS} operasi, us/operasi)")
+    print(f"  {'k':>3}  {'linear':>8}  {'heap':>8}")
+    for num_cashier in NUM_CASHIERS:
+        linear = timed(linear_selection, num_cashier, operations) / NUM_OPERATIONS * 1e6
+        heap = timed(heap_selection, num_cashier, operations) / NUM_OPERATIONS * 1e6
+        print(f"  {num_cashier:>3}  {linear:8.2f}  {heap:8.2f}")
+
+    # run pertama hanya untuk import lazy (simpy, numpy)
+    cafe.run(scaled_config(NUM_CASHIERS[0], "jsq"))
+    print("\nRun 1 hari dengan beban diskalakan (pelanggan/detik, utilisasi kasir rata-rata)")
+    for num_cashier in NUM_CASHIERS:
+        row = []
+        for policy in cafe.CashierBank.POLICIES:
+            start = time.perf_counter()
+            results = cafe.run(scaled_config(num_cashier, policy))
+            elapsed = time.perf_counter() - start
+            utilization = sum(register["utilization"] for register in results.registers) / num_cashier
+            row.append(f"{policy} {results.stats.customers / elapsed:8.0f} ({utilization:.2f}, "
+                       f"delay {results.metrics['cashier_avg_delay']:6.1f} s)")
+        print(f"  k={num_cashier:>2}  " + "   ".join(row))
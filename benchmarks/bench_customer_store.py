@@ -0,0 +1,102 @@
+# Benchmark memori per pelanggan dan waktu laporan: Pelanggan lama (__dict__),
+# Pelanggan dengan __slots__, dan CustomerStore (structured array numpy).
+# Jalankan dari root repo: python benchmarks/bench_customer_store.py
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CafetariaSimulation as cafe  # noqa: E402
+
+NUM_CUSTOMERS = 200_000
+
+
+# Salinan Pelanggan sebelum __slots__, sebagai pembanding
+class DictPelanggan:
+    def __init__(self, customer_id, route, group_size):
+        self.customer_id = customer_id
+        self.route = route
+        self.group_size = group_size
+        self.hot_food_enter_time = 0
+        self.specialty_sandwich_enter_time = 0
+        self.cashier_enter_time = 0
+        self.hot_food_time = 0
+        self.sandwich_time = 0
+        self.hot_food_finish_queue = False
+        self.specialty_sandwich_finish_queue = False
+        self.cashier_finish_queue = False
+        self.accumulated_cashier_time = 0
+        self.cashier_time = 0
+
+
+def make_customers(cls, n):
+    rng = random.Random(0)
+    customers = []
+    for customer_id in range(1, n + 1):
+        customer = cls(customer_id, rng.choice([1, 1, 1, 2, 3]), rng.randint(1, 4))
+        customer.hot_food_time = rng.uniform(0, 100)
+        customer.sandwich_time = rng.uniform(0, 100)
+        customer.cashier_time = rng.uniform(0, 10)
+        customer.hot_food_finish_queue = customer.route == 1
+        customer.specialty_sandwich_finish_queue = customer.route == 2
+        customer.cashier_finish_queue = True
+        customers.append(customer)
+    return customers
+
+
+def bytes_per_customer(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return size / NUM_CUSTOMERS, result
+
+
+def report_from_objects(customers):
+    # logika report_1 versi lama: scan list pelanggan
+    delays = {
+        "hot-food": [c.hot_food_time for c in customers if c.route == 1 and c.hot_food_finish_queue],
+        "sandwich": [c.sandwich_time for c in customers if c.route == 2 and c.specialty_sandwich_finish_queue],
+        "cashier": [c.cashier_time for c in customers if c.cashier_finish_queue]}
+    return {name: (sum(values) / len(values), max(values)) for name, values in delays.items()}
+
+
+def report_from_store(store):
+    return {name: (values.mean(), values.max()) for name, values in store.station_delays().items()}
+
+
+def build_store(customers):
+    store = cafe.CustomerStore()
+    for customer in customers:
+        store.add(customer)
+    store.finalize()
+    return store
+
+
+def timed(function, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    dict_bytes, dict_customers = bytes_per_customer(
+        lambda: make_customers(DictPelanggan, NUM_CUSTOMERS))
+    slot_bytes, slot_customers = bytes_per_customer(
+        lambda: make_customers(cafe.Pelanggan, NUM_CUSTOMERS))
+    store = build_store(slot_customers)
+
+    print(f"Jumlah pelanggan          : {NUM_CUSTOMERS}")
+    print(f"Pelanggan (__dict__)      : {dict_bytes:8.1f} byte/pelanggan")
+    print(f"Pelanggan (__slots__)     : {slot_bytes:8.1f} byte/pelanggan")
+    print(f"CustomerStore (numpy)     : {cafe.CUSTOMER_DTYPE.itemsize:8.1f} byte/pelanggan")
+    print(f"Laporan dari objek        : {timed(report_from_objects, dict_customers) * 1000:8.2f} ms")
+    print(f"Laporan dari CustomerStore: {timed(report_from_store, store) * 1000:8.2f} ms")
@@ -0,0 +1,199 @@
+# Benchmark throughput simulasi: pelanggan/detik, event kernel/detik, peak RSS dan waktu
+# laporan, untuk durasi 1 hari sampai 1 tahun dan beban yang makin berat.
+# Setiap kasus dijalankan di proses baru supaya peak RSS tidak tercampur.
+# Jalankan dari root repo:
+#   python benchmarks/bench_simulation.py --output hasil.json
+#   python benchmarks/bench_simulation.py --baseline benchmarks/baseline.json
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import argparse
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CafetariaSimulation as cafe  # noqa: E402
+import event_kernel  # noqa: E402
+import replication  # noqa: E402
+
+DAY = cafe.SIMULATION_DURATION
+# (nama, jumlah hari, rata-rata waktu antar kedatangan grup)
+DURATION_CASES = [(f"duration_{days}d", days, cafe.INTERVAL_CUSTOMER_ARRIVAL)
+                  for days in (1, 7, 30, 365)]
+LOAD_CASES = [(f"interval_{interval}s", 30, interval) for interval in (30, 25, 20, 15)]
+QUICK_CASES = [("duration_1d", 1, cafe.INTERVAL_CUSTOMER_ARRIVAL),
+               ("duration_7d", 7, cafe.INTERVAL_CUSTOMER_ARRIVAL),
+               ("interval_20s", 7, 20)]
+# metrik yang lebih besar = lebih baik
+HIGHER_IS_BETTER = ("customers_per_s", "kernel_events_per_s", "sink_events_per_s")
+LOWER_IS_BETTER = ("peak_rss_mb", "report_ms")
+
+
+# Sink yang hanya menghitung panggilan event sink per pelanggan (datang, antri, dilayani,
+# delay, pergi). Ini bukan jumlah event kernel simpy/heapq (lihat count_kernel_events),
+# jadi disimpan terpisah sebagai sink_events.
+class CountingSink:
+    enabled = True
+
+    def __init__(self):
+        self.count = 0
+
+    def event(self, time, customer_id, station, event_type, value=None):
+        self.count += 1
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def count_kernel_events(config):
+    # Jumlah event yang diproses kernel (HeapKernel.events_processed, atau env.step simpy
+    # yang dihitung). Run terpisah dari run yang diukur waktunya, supaya penghitung
+    # tidak memperlambat run itu; seed sama, jadi jumlah event-nya sama.
+    if config.backend == "heapq":
+        log, stats, queues, streams, bank = cafe.prepare_run(config, CountingSink())
+        return event_kernel.heap_simulation(config, streams, log, stats, queues,
+                                            bank).events_processed
+    import simpy
+
+    class CountingEnvironment(simpy.Environment):
+        events_processed = 0
+
+        def step(self):
+            super().step()
+            self.events_processed += 1
+
+    env = CountingEnvironment()
+    cafe.cafeteria_simulation(env, config, log=CountingSink())
+    return env.events_processed
+
+
+def run_case(config):
+    # Dijalankan di proses anak: satu simulasi, lalu laporan diukur terpisah.
+    # Run pendek dulu supaya import lazy (simpy, numpy) tidak ikut terukur
+    cafe.run(config.replace(simulation_duration=DAY), log=CountingSink())
+    kernel_events = count_kernel_events(config)
+    sink = CountingSink()
+    start = time.perf_counter()
+    results = cafe.run(config, log=sink)
+    elapsed = time.perf_counter() - start
+
+    report_time = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        cafe.generate_report(results.stats, results.queues, verbose=False)
+        report_time = min(report_time, time.perf_counter() - start)
+
+    # ru_maxrss dalam KiB di Linux, byte di macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss /= 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {"customers": results.stats.customers,
+            "kernel_events": kernel_events,
+            "sink_events": sink.count,
+            "wall_s": elapsed,
+            "customers_per_s": results.stats.customers / elapsed,
+            "kernel_events_per_s": kernel_events / elapsed,
+            "sink_events_per_s": sink.count / elapsed,
+            "peak_rss_mb": peak_rss,
+            "report_ms": report_time * 1000}
+
+
+def run_in_fresh_process(config):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_case, config).result()
+
+
+def git_commit():
+    # commit tree yang diukur; akhiran -dirty jika ada perubahan yang belum di-commit
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(cases, base_config):
+    results = {"meta": {"commit": git_commit(),
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "backend": base_config.backend,
+                        "random_mode": base_config.random_mode,
+                        "staffing": [base_config.num_hot_food_employee,
+                                     base_config.num_sandwich_employee,
+                                     base_config.num_cashier]},
+               "cases": {}}
+    for name, days, interval in cases:
+        config = base_config.replace(simulation_duration=days * DAY,
+                                     interval_customer_arrival=interval)
+        case = run_in_fresh_process(config)
+        case.update(days=days, interval=interval)
+        results["cases"][name] = case
+        print(f"  {name:<16} {case['customers']:>9} pelanggan  "
+              f"{case['customers_per_s']:>10.0f} pelanggan/s  "
+              f"{case['kernel_events_per_s']:>10.0f} event/s  "
+              f"{case['sink_events_per_s']:>10.0f} event sink/s  "
+              f"RSS {case['peak_rss_mb']:7.1f} MB  laporan {case['report_ms']:7.2f} ms", flush=True)
+    return results
+
+
+def compare(current, baseline, tolerance=0.10):
+    # Regresi: throughput turun atau RSS/waktu laporan naik lebih dari tolerance
+    regressions = []
+    print(f"\nPerbandingan dengan baseline {baseline['meta'].get('commit')} (toleransi {tolerance:.0%}):")
+    for name, case in current["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            if metric not in base:
+                continue  # baseline lama dengan nama metrik berbeda
+            ratio = case[metric] / base[metric] if base[metric] else 1.0
+            worse = ratio < 1 - tolerance if metric in HIGHER_IS_BETTER else ratio > 1 + tolerance
+            if worse:
+                regressions.append((name, metric, ratio))
+            print(f"  {name:<16} {metric:<19} {base[metric]:12.2f} -> {case[metric]:12.2f}"
+                  f"  x{ratio:5.2f}{'  REGRESI' if worse else ''}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark throughput simulasi cafetaria")
+    parser.add_argument("--quick", action="store_true",
+                        help="kasus kecil saja (untuk cek cepat)")
+    parser.add_argument("--backend", choices=["simpy", "heapq"], default="simpy")
+    parser.add_argument("--random-mode", choices=["fast", "legacy"], default=cafe.RANDOM_MODE)
+    replication.add_config_arguments(parser, duration=False)
+    parser.add_argument("--output", default=None, help="simpan hasil ke file JSON")
+    parser.add_argument("--baseline", default=None, help="file JSON hasil sebelumnya")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    base_config = replication.config_from_arguments(args, random_mode=args.random_mode,
+                                                    backend=args.backend, print_report=False)
+    cases = QUICK_CASES if args.quick else DURATION_CASES + LOAD_CASES
+    results = run_suite(cases, base_config)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# Checkpoint dan resume untuk run panjang. Run dijalankan di kernel heapq (proses
+# generator SimPy tidak bisa disimpan) dalam segmen sepanjang interval waktu simulasi.
+# Setelah setiap segmen, seluruh state model di-pickle ke satu file: jam simulasi,
+# heap event (kedatangan grup berikutnya, layanan yang sedang berjalan), pelanggan di
+# setiap antrian, counter stream acak, StatisticsCollector dan QueueMonitor.
+# Ukuran state sebanding dengan jumlah pelanggan di dalam sistem, bukan panjang run,
+# dan cache batch RandomStreams tidak ikut disimpan (dibuat ulang dari seed).
+# CustomerStore opsional (yang tumbuh dengan panjang run) tidak ikut di-pickle: baris
+# pelanggan yang sudah final ditambahkan ke file <path>.store (append-only), checkpoint
+# hanya menyimpan ekor store mulai dari pelanggan aktif dengan id terkecil.
+# Run yang dilanjutkan dari checkpoint menghasilkan statistik yang identik.
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+import CafetariaSimulation as cafe
+import event_kernel
+import replication
+import result_cache
+
+# jarak antar checkpoint dalam detik simulasi
+CHECKPOINT_INTERVAL = 4 * 3600
+CHECKPOINT_VERSION = 2
+STORE_SUFFIX = ".store"
+# sink yang membungkus QueueMonitor atau menulis file tidak bisa dilanjutkan
+UNSUPPORTED_LOG_MODES = ("trace", "journey")
+
+
+def save_checkpoint(path, state):
+    # tulis ke file sementara lalu os.replace, checkpoint lama tetap utuh jika proses mati
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def store_watermark(store):
+    # jumlah baris awal store yang sudah final (tidak ada pelanggan aktif di bawahnya)
+    return min(store.active) - 1 if store.active else store.size
+
+
+def append_store_rows(path, store, written):
+    # tambahkan baris final [written, watermark) ke file store, kembalikan watermark.
+    # Sisa tulisan yang tidak sempat masuk checkpoint (proses mati) dipotong dulu.
+    watermark = store_watermark(store)
+    with open(path + STORE_SUFFIX, "ab") as file:
+        file.truncate(written * store.records.dtype.itemsize)
+        file.write(store.records[written:watermark].tobytes())
+    return watermark
+
+
+def store_snapshot(store, watermark):
+    return {"base": watermark, "size": store.size, "active": store.active,
+            "tail": store.records[watermark:store.size].copy()}
+
+
+def restore_store(path, snapshot, store):
+    # isi store (CustomerStore baru atau milik pemanggil) dari file store + ekor checkpoint
+    base, size = snapshot["base"], snapshot["size"]
+    store._grow(size)
+    store.records[:base] = np.fromfile(path + STORE_SUFFIX, dtype=store.records.dtype,
+                                       count=base)
+    store.records[base:size] = snapshot["tail"]
+    store.size = size
+    store.active = snapshot["active"]
+    return store
+
+
+def remove_store_file(path):
+    if os.path.exists(path + STORE_SUFFIX):
+        os.unlink(path + STORE_SUFFIX)
+
+
+def load_checkpoint(path):
+    with open(path, "rb") as file:
+        state = pickle.load(file)
+    if state.get("version") != CHECKPOINT_VERSION or state.get("model") != cafe.MODEL_VERSION:
+        raise ValueError(f"Checkpoint {path} dibuat oleh versi model yang berbeda")
+    return state
+
+
+def run_checkpointed(path, config=None, interval=CHECKPOINT_INTERVAL, log=None, store=None,
+                     stats=None, resume=True, stop_at=None):
+    # Jalankan config sampai selesai dengan checkpoint setiap interval detik simulasi.
+    # Jika resume dan file path ada, lanjutkan dari sana (config boleh None). Saat resume
+    # stats berasal dari checkpoint (tidak boleh diberikan); store boleh diberikan hanya
+    # jika run asal memakai store, dan diisi ulang dari file store + checkpoint.
+    # stop_at = berhenti setelah checkpoint pada waktu simulasi ini dan kembalikan None
+    # (mensimulasikan worker yang mati). File checkpoint dihapus setelah run selesai.
+    if resume and os.path.exists(path):
+        state = load_checkpoint(path)
+        if config is not None and \
+                result_cache.cache_key(config) != result_cache.cache_key(state["config"]):
+            raise ValueError("Config berbeda dengan config checkpoint")
+        if stats is not None:
+            raise ValueError("stats tidak bisa diberikan saat resume, dipakai dari checkpoint")
+        if store is not None and state["store"] is None:
+            raise ValueError("Checkpoint dibuat tanpa CustomerStore")
+        config = state["config"]
+        kernel = state["kernel"]
+        queues = state["queues"]
+        stats = kernel.stats
+        if state["store"] is not None:
+            store = restore_store(path, state["store"],
+                                  store if store is not None else cafe.CustomerStore())
+            stats.store = store
+        written = state["store"]["base"] if state["store"] is not None else 0
+        kernel.log = log if log is not None else cafe.make_event_sink(config.log_mode,
+                                                                      config.trace_path)
+    else:
+        if config is None:
+            config = cafe.SimulationConfig()
+        if config.profile:
+            raise ValueError("Checkpoint tidak mendukung profile")
+        if config.log_mode in UNSUPPORTED_LOG_MODES:
+            raise ValueError(f"Checkpoint tidak mendukung log_mode {config.log_mode}")
+        config = config.replace(backend="heapq")
+        log, stats, queues, streams, bank = cafe.prepare_run(config, log, store, stats)
+        store = stats.store
+        remove_store_file(path)
+        written = 0
+        kernel = event_kernel.HeapKernel(config, streams, log, stats, queues, bank)
+        kernel.start()
+
+    duration = config.simulation_duration
+    while kernel.now < duration:
+        # batas segmen di kelipatan interval, sama untuk run baru dan run yang dilanjutkan
+        until = min((kernel.now // interval + 1) * interval, duration)
+        kernel.run(until)
+        if until < duration:
+            kernel.log.flush()
+            snapshot = None
+            if store is not None:
+                written = append_store_rows(path, store, written)
+                snapshot = store_snapshot(store, written)
+                stats.store = None  # store tidak ikut di-pickle bersama kernel
+            try:
+                save_checkpoint(path, {"version": CHECKPOINT_VERSION, "model": cafe.MODEL_VERSION,
+                                       "config": config, "kernel": kernel, "queues": queues,
+                                       "store": snapshot})
+            finally:
+                stats.store = store
+            if stop_at is not None and until >= stop_at:
+                kernel.log.close()
+                return None
+
+    results = cafe.finish_run(config, kernel.log, store, stats, queues, kernel.bank)
+    if os.path.exists(path):
+        os.unlink(path)
+    remove_store_file(path)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Run panjang dengan checkpoint berkala (backend heapq)")
+    parser.add_argument("checkpoint", help="path file checkpoint")
+    parser.add_argument("--days", type=float, default=365,
+                        help="panjang run dalam hari simulasi (1 hari = SIMULATION_DURATION)")
+    parser.add_argument("--interval", type=float, default=CHECKPOINT_INTERVAL / 3600,
+                        help="jarak checkpoint (jam simulasi)")
+    replication.add_config_arguments(parser, duration=False)
+    parser.add_argument("--seed-offset", type=int, default=0)
+    parser.add_argument("--fresh", action="store_true",
+                        help="abaikan checkpoint yang ada dan mulai dari awal")
+    args = parser.parse_args()
+
+    config = replication.config_from_arguments(
+        args, simulation_duration=args.days * cafe.SIMULATION_DURATION,
+        seed_offset=args.seed_offset, backend="heapq", log_mode="null")
+    run_checkpointed(args.checkpoint, config, args.interval * 3600, resume=not args.fresh)
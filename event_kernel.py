@@ -0,0 +1,268 @@
+# Kernel event diskrit khusus untuk jaringan cafetaria: satu heap event bertipe,
+# deque FIFO per stasiun dan tanpa generator per kunjungan. Aturan pencatatan
+# (QueueMonitor, StatisticsCollector, log) sama dengan backend SimPy, sehingga
+# statistiknya identik untuk input acak yang sama.
+import heapq
+import itertools
+import collections
+
+import CafetariaSimulation as cafe
+import arrivals
+
+
+# Server FIFO kapasitas 1 (pengganti simpy.Resource(capacity=1)),
+# monitors = QueueMonitor yang ikut berubah saat antrian berubah
+class FifoServer:
+    def __init__(self, *monitors):
+        self.busy = False
+        self.waiting = collections.deque()
+        self.monitors = monitors
+
+    def enqueue(self, item, now):
+        self.waiting.append(item)
+        for monitor in self.monitors:
+            monitor.enter(now)
+
+    def dequeue(self, now):
+        for monitor in self.monitors:
+            monitor.leave(now)
+        return self.waiting.popleft()
+
+
+class HeapKernel:
+    def __init__(self, config, streams, log, stats, queues, bank):
+        self.config = config
+        self.streams = streams
+        self.log = log
+        self.stats = stats
+        self.bank = bank
+
+        self.now = 0
+        self.heap = []
+        self.sequence = itertools.count()
+        self.events_processed = 0
+
+        self.hot_food = FifoServer(queues["hot-food"])
+        self.sandwich = FifoServer(queues["sandwich"])
+        # antrian kasir dicatat oleh CashierBank, bukan oleh FifoServer
+        self.cashiers = [FifoServer() for _ in range(config.num_cashier)]
+        # antrian bersama kebijakan serpentine
+        self.cashier_line = collections.deque()
+
+        self.hot_food_low = config.hot_food_service[0] / config.num_hot_food_employee
+        self.hot_food_high = config.hot_food_service[1] / config.num_hot_food_employee
+        self.sandwich_low = config.sandwich_service[0] / config.num_sandwich_employee
+        self.sandwich_high = config.sandwich_service[1] / config.num_sandwich_employee
+
+        # stream kedatangan grup (dibuat di start) dan jumlah pelanggan yang sudah dibuat
+        self.arrivals = None
+        self.customer_count = 0
+
+    def __getstate__(self):
+        # untuk checkpoint: event sink tidak ikut disimpan, itertools.count diganti
+        # nilai berikutnya (urutan relatif event pada heap tetap sama)
+        state = self.__dict__.copy()
+        state["log"] = None
+        state["sequence"] = next(self.sequence)
+        return state
+
+    def __setstate__(self, state):
+        state["sequence"] = itertools.count(state["sequence"])
+        self.__dict__.update(state)
+
+    def schedule(self, delay, handler, customer=None):
+        heapq.heappush(self.heap, (self.now + delay,
+                       next(self.sequence), handler, customer))
+
+    def run(self, until):
+        heap = self.heap
+        pop = heapq.heappop
+        processed = 0
+        while heap and heap[0][0] < until:
+            self.now, _, handler, customer = pop(heap)
+            handler(customer)
+            processed += 1
+        self.events_processed += processed
+        self.now = until
+
+    # Kedatangan grup
+    def start(self):
+        self.arrivals = arrivals.ArrivalStream.from_config(self.config, self.streams)
+        self.arrive_group(self.arrivals.first_group_size())
+        self.schedule_next_group()
+
+    def schedule_next_group(self):
+        # stream habis = grup berikutnya datang setelah simulasi selesai
+        group = next(self.arrivals, None)
+        if group is not None:
+            time_interval, group_size = group
+            self.schedule(time_interval, self.on_group_arrival, group_size)
+
+    def on_group_arrival(self, group_size):
+        self.arrive_group(group_size)
+        self.schedule_next_group()
+
+    def arrive_group(self, group_size):
+        customers = []
+        for _ in range(group_size):
+            self.customer_count += 1
+            customer_id = self.customer_count
+            route = self.streams.choice("route_choice", customer_id,
+                                        [1, 2, 3], [0.8, 0.15, 0.05])
+            customer = cafe.Pelanggan(customer_id, route, group_size)
+            self.stats.record_arrival(customer)
+            self.log.event(self.now, customer_id, 'cafetaria', cafe.EVENT_ARRIVE, group_size)
+            customers.append(customer)
+        # semua anggota grup masuk antrian dulu, baru yang langsung dilayani mulai
+        for customer in customers:
+            if customer.route == 1:
+                self.enter_food(customer, 'hot-food', self.hot_food,
+                                self.start_hot_food)
+            elif customer.route == 2:
+                self.enter_food(customer, 'sandwich', self.sandwich,
+                                self.start_sandwich)
+            else:
+                self.enter_drink(customer)
+
+    # Hot food dan sandwich
+    def enter_food(self, customer, station_name, server, start_handler):
+        self.log.event(self.now, customer.customer_id,
+                       station_name, cafe.EVENT_QUEUE)
+        if station_name == 'hot-food':
+            customer.hot_food_enter_time = self.now
+        else:
+            customer.specialty_sandwich_enter_time = self.now
+        if server.busy:
+            server.enqueue(customer, self.now)
+        else:
+            server.busy = True
+            self.schedule(0, start_handler, customer)
+
+    def start_hot_food(self, customer):
+        now = self.now
+        self.log.event(now, customer.customer_id, 'hot-food', cafe.EVENT_SERVE)
+        delay = now - customer.hot_food_enter_time
+        customer.hot_food_time = delay
+        customer.hot_food_finish_queue = True
+        self.stats.record_station("hot-food", delay)
+        self.log.event(now, customer.customer_id,
+                       'hot-food', cafe.EVENT_DELAY, delay)
+        service_time = self.streams.uniform(
+            "st_hot_food", customer.customer_id, self.hot_food_low, self.hot_food_high)
+        self.schedule(service_time, self.finish_hot_food, customer)
+
+    def finish_hot_food(self, customer):
+        customer.accumulated_cashier_time += self.streams.uniform(
+            "act_hot_food", customer.customer_id, 20.0, 40.0)
+        self.log.event(self.now, customer.customer_id,
+                       'hot-food', cafe.EVENT_LEAVE)
+        self.release(self.hot_food, self.start_hot_food)
+        self.enter_drink(customer)
+
+    def start_sandwich(self, customer):
+        now = self.now
+        self.log.event(now, customer.customer_id, 'sandwich', cafe.EVENT_SERVE)
+        delay = now - customer.specialty_sandwich_enter_time
+        customer.sandwich_time = delay
+        customer.specialty_sandwich_finish_queue = True
+        self.stats.record_station("sandwich", delay)
+        self.log.event(now, customer.customer_id,
+                       'sandwich', cafe.EVENT_DELAY, delay)
+        service_time = self.streams.uniform(
+            "st_sandwich", customer.customer_id, self.sandwich_low, self.sandwich_high)
+        self.schedule(service_time, self.finish_sandwich, customer)
+
+    def finish_sandwich(self, customer):
+        customer.accumulated_cashier_time += self.streams.uniform(
+            "act_sandwich", customer.customer_id, 5.0, 15.0)
+        self.log.event(self.now, customer.customer_id,
+                       'sandwich', cafe.EVENT_LEAVE)
+        self.release(self.sandwich, self.start_sandwich)
+        self.enter_drink(customer)
+
+    def release(self, server, start_handler):
+        if server.waiting:
+            self.schedule(0, start_handler, server.dequeue(self.now))
+        else:
+            server.busy = False
+
+    # Drinks: delay murni
+    def enter_drink(self, customer):
+        self.log.event(self.now, customer.customer_id, 'drink', cafe.EVENT_SERVE)
+        drink_service_time = self.streams.uniform(
+            "st_drinks", customer.customer_id, 5.0, 20.0)
+        self.schedule(drink_service_time, self.finish_drink, customer)
+
+    def finish_drink(self, customer):
+        customer.accumulated_cashier_time += self.streams.uniform(
+            "act_drinks", customer.customer_id, 5.0, 10.0)
+        self.log.event(self.now, customer.customer_id, 'drink', cafe.EVENT_LEAVE)
+        self.enter_cashier(customer)
+
+    # Kasir: pemilihan kasir oleh CashierBank, sama dengan backend SimPy
+    def enter_cashier(self, customer):
+        now = self.now
+        self.log.event(now, customer.customer_id, 'cashier', cafe.EVENT_QUEUE)
+        customer.cashier_enter_time = now
+        bank = self.bank
+        if bank.policy == "serpentine":
+            if bank.free:
+                self.schedule(0, self.start_cashier, (customer, bank.acquire_register()))
+            else:
+                self.cashier_line.append(customer)
+                bank.enter_queue(None, now)
+            return
+
+        which = bank.choose(customer.customer_id)
+        server = self.cashiers[which]
+        if server.busy:
+            server.enqueue((customer, which), now)
+            bank.enter_queue(which, now)
+        else:
+            server.busy = True
+            self.schedule(0, self.start_cashier, (customer, which))
+
+    def start_cashier(self, visit):
+        customer, which = visit
+        now = self.now
+        self.log.event(now, customer.customer_id, 'cashier', cafe.EVENT_SERVE, which)
+        delay = now - customer.cashier_enter_time
+        customer.cashier_time = delay
+        customer.cashier_finish_queue = True
+        self.bank.start_service(which, now)
+        self.stats.record_cashier(customer)
+        self.log.event(now, customer.customer_id,
+                       'cashier', cafe.EVENT_DELAY, delay)
+        self.schedule(customer.accumulated_cashier_time,
+                      self.finish_cashier, visit)
+
+    def finish_cashier(self, visit):
+        customer, which = visit
+        now = self.now
+        bank = self.bank
+        bank.end_service(which, now)
+        self.log.event(now, customer.customer_id, 'cashier', cafe.EVENT_LEAVE)
+        if bank.policy == "serpentine":
+            # pelanggan terdepan antrian bersama ke kasir kosong berindeks terkecil
+            if self.cashier_line:
+                bank.leave_queue(None, now)
+                self.schedule(0, self.start_cashier,
+                              (self.cashier_line.popleft(), bank.acquire_register()))
+        else:
+            server = self.cashiers[which]
+            if server.waiting:
+                bank.leave_queue(which, now)
+                self.schedule(0, self.start_cashier, server.dequeue(now))
+            else:
+                server.busy = False
+        self.stats.record_departure(customer)
+
+
+def heap_simulation(config, streams, log, stats, queues, bank, profiler=None):
+    # Menjalankan model sampai config.simulation_duration dengan kernel heap
+    kernel = HeapKernel(config, streams, log, stats, queues, bank)
+    if profiler is not None:
+        profiler.instrument_kernel(kernel)
+    kernel.start()
+    kernel.run(config.simulation_duration)
+    return kernel
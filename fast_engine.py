@@ -0,0 +1,263 @@
+# Engine cepat tanpa event loop: rekursi Lindley numpy untuk stasiun hot-food
+# dan sandwich, drinks sebagai delay murni, dan kasir join-shortest-queue.
+# Menghasilkan metrik yang sama dengan generate_report untuk input acak yang sama.
+import math
+import heapq
+import dataclasses
+
+import numpy as np
+
+import CafetariaSimulation as cafe
+import arrivals
+import reporting
+
+
+def draw_arrivals(streams, duration, interval_mean=cafe.INTERVAL_CUSTOMER_ARRIVAL, profile=()):
+    # Kedatangan grup dari stream yang sama dengan setup() (arrivals.ArrivalStream),
+    # diambil per blok: grup 0 di t=0, lalu grup yang datang sebelum duration
+    group_arrivals = arrivals.ArrivalStream(streams, duration, interval_mean, profile)
+    group_times = [np.zeros(1)]
+    group_sizes = [np.array([group_arrivals.first_group_size()])]
+    while not group_arrivals.finished:
+        times, _, sizes = group_arrivals.draw_block()
+        group_times.append(times)
+        group_sizes.append(sizes)
+
+    group_times = np.concatenate(group_times)
+    group_sizes = np.concatenate(group_sizes)
+    arrival = np.repeat(group_times, group_sizes)
+    group_size = np.repeat(group_sizes, group_sizes)
+    customer_id = np.arange(1, len(arrival) + 1)
+    route = streams.choice_array(
+        "route_choice", customer_id, [1, 2, 3], [0.8, 0.15, 0.05])
+    return customer_id, arrival, group_size, route
+
+
+def lindley(arrival, service):
+    # Antrian FIFO satu server: D_i = max(a_i, D_{i-1}) + s_i
+    # = S_i + max_{j<=i}(a_j - S_{j-1}), dengan S jumlah kumulatif service
+    cumulative = np.cumsum(service)
+    departure = cumulative + \
+        np.maximum.accumulate(arrival - (cumulative - service))
+    # mulai = max(a_i, D_{i-1}), supaya mulai tepat sama dengan kedatangan saat server kosong
+    start = np.maximum(arrival, np.concatenate(([0.0], departure[:-1])))
+    return start, start + service
+
+
+def queue_length_stats(arrival, start, duration):
+    # Sama dengan QueueMonitor: pelanggan ada di antrian sejak datang sampai mulai
+    # dilayani (atau sampai simulasi selesai), yang langsung dilayani tidak dihitung
+    waiting = (start > arrival) & (arrival < duration)
+    enter = arrival[waiting]
+    leave = np.minimum(start[waiting], duration)
+    if len(enter) == 0:
+        return 0.0, 0
+    average = float((leave - enter).sum() / duration)
+    # panjang maksimum: +1 saat masuk, -1 saat keluar, keluar didahulukan jika waktunya sama
+    times = np.concatenate([enter, leave])
+    steps = np.concatenate([np.ones(len(enter), dtype=np.int64),
+                            -np.ones(len(leave), dtype=np.int64)])
+    order = np.lexsort((steps, times))
+    return average, int(np.cumsum(steps[order]).max())
+
+
+def cashier_bank(arrival, service, num_cashier, policy="jsq", choice=None):
+    # Waktu mulai dilayani di kasir sesuai kebijakan CashierBank.
+    # choice = indeks kasir per pelanggan untuk kebijakan "random"
+    if policy == "serpentine":
+        return serpentine_line(arrival, service, num_cashier)
+    if policy == "random":
+        start = np.empty(len(arrival))
+        for k in range(num_cashier):
+            mine = np.flatnonzero(choice == k)
+            mine = mine[np.argsort(arrival[mine], kind="stable")]
+            start[mine] = lindley(arrival[mine], service[mine])[0]
+        return start, choice
+    return join_shortest_queue(arrival, service, num_cashier)
+
+
+def serpentine_line(arrival, service, num_cashier):
+    # Satu antrian FIFO untuk semua kasir: mulai = max(datang, kasir paling cepat kosong)
+    order = np.argsort(arrival, kind="stable")
+    start = np.empty(len(arrival))
+    which = np.empty(len(arrival), dtype=np.int64)
+    free_at = [(0.0, k) for k in range(num_cashier)]
+    for i in order.tolist():
+        free, k = heapq.heappop(free_at)
+        begin = max(arrival[i], free)
+        heapq.heappush(free_at, (begin + service[i], k))
+        start[i] = begin
+        which[i] = k
+    return start, which
+
+
+def join_shortest_queue(arrival, service, num_cashier):
+    # Join-shortest-queue dengan heap lazy CashierBank.choose: panjang antrian hanya
+    # menghitung yang menunggu, seri dipecah ke kasir dengan indeks terkecil. Pelanggan
+    # yang menunggu ada di satu heap (waktu mulai, kasir) dan keluar dari antrian saat
+    # waktunya terlewati, jadi biaya per pelanggan O(log k) (amortized), bukan O(k).
+    order = np.argsort(arrival, kind="stable")
+    start = np.empty(len(arrival))
+    which = np.empty(len(arrival), dtype=np.int64)
+    # heap (panjang, kasir) dengan lazy deletion seperti CashierBank, tanpa QueueMonitor
+    lengths = [0] * num_cashier
+    shortest = [(0, k) for k in range(num_cashier)]
+    free_at = [0.0] * num_cashier
+    waiting = []
+    for i in order.tolist():
+        now = arrival[i]
+        while waiting and waiting[0][0] <= now:
+            k = heapq.heappop(waiting)[1]
+            lengths[k] -= 1
+            heapq.heappush(shortest, (lengths[k], k))
+        while shortest[0][0] != lengths[shortest[0][1]]:
+            heapq.heappop(shortest)
+        k = shortest[0][1]
+        begin = max(now, free_at[k])
+        free_at[k] = begin + service[i]
+        if begin > now:
+            lengths[k] += 1
+            heapq.heappush(shortest, (lengths[k], k))
+            heapq.heappush(waiting, (begin, k))
+        if len(shortest) > 4 * num_cashier + 16:
+            # bangun ulang supaya entri basi tidak menumpuk
+            shortest = [(length, k) for k, length in enumerate(lengths)]
+            heapq.heapify(shortest)
+        start[i] = begin
+        which[i] = k
+    return start, which
+
+
+# Lintasan sampel satu run sebagai kolom per pelanggan (urut customer_id),
+# dipakai fast_simulation dan estimator turunan di sensitivity.py
+@dataclasses.dataclass
+class SamplePath:
+    config: cafe.SimulationConfig
+    streams: cafe.RandomStreams
+    customer_id: np.ndarray
+    arrival: np.ndarray
+    group_size: np.ndarray
+    route: np.ndarray
+    food_service: np.ndarray  # waktu layanan hot-food/sandwich, 0 untuk rute 3
+    food_start: np.ndarray  # = arrival untuk rute 3
+    food_delay: np.ndarray
+    food_started: np.ndarray
+    cashier_arrival: np.ndarray
+    at_cashier: np.ndarray  # indeks pelanggan yang tiba di kasir sebelum simulasi selesai
+    cashier_start: np.ndarray  # untuk pelanggan at_cashier
+    cashier: np.ndarray  # indeks kasir untuk pelanggan at_cashier
+    cashier_delay: np.ndarray
+    cashier_finished: np.ndarray
+    queue_stats: dict
+
+
+def fast_simulation(config=None):
+    return build_metrics(sample_path(config))
+
+
+def sample_path(config=None):
+    if config is None:
+        config = cafe.SimulationConfig()
+    num_hot_food = config.num_hot_food_employee
+    num_sandwich = config.num_sandwich_employee
+    num_cashier = config.num_cashier
+    duration = config.simulation_duration
+
+    streams = config.make_streams()
+    customer_id, arrival, group_size, route = draw_arrivals(
+        streams, duration, config.interval_customer_arrival, config.arrival_profile)
+    n = len(customer_id)
+
+    drinks = streams.uniform_array("st_drinks", customer_id, 5.0, 20.0)
+    accumulated = streams.uniform_array("act_drinks", customer_id, 5.0, 10.0)
+
+    # Hot food dan sandwich: antrian FIFO satu server
+    food_service = np.zeros(n)
+    food_start = arrival.copy()
+    food_delay = np.zeros(n)
+    food_started = np.zeros(n, dtype=bool)
+    drink_enter = arrival.copy()  # rute 3 langsung ke drinks
+    queue_stats = {}
+    for station, route_id, seed_st, seed_act, (low, high), act_low, act_high, employees in (
+            ("hot-food", 1, "st_hot_food", "act_hot_food", config.hot_food_service,
+             20.0, 40.0, num_hot_food),
+            ("sandwich", 2, "st_sandwich", "act_sandwich", config.sandwich_service,
+             5.0, 15.0, num_sandwich)):
+        mask = route == route_id
+        ids = customer_id[mask]
+        service = streams.uniform_array(
+            seed_st, ids, low / employees, high / employees)
+        start, departure = lindley(arrival[mask], service)
+        food_service[mask] = service
+        food_start[mask] = start
+        food_delay[mask] = start - arrival[mask]
+        food_started[mask] = start < duration
+        drink_enter[mask] = departure
+        accumulated[mask] += streams.uniform_array(
+            seed_act, ids, act_low, act_high)
+        queue_stats[station] = queue_length_stats(
+            arrival[mask], start, duration)
+
+    # Kasir: hanya pelanggan yang tiba di kasir sebelum simulasi selesai
+    cashier_arrival = drink_enter + drinks
+    at_cashier = np.flatnonzero(cashier_arrival < duration)
+    choice = None
+    if config.cashier_policy == "random":
+        choice = np.minimum((streams.u_array("cashier_choice", customer_id[at_cashier]) *
+                             num_cashier).astype(np.int64), num_cashier - 1)
+    cashier_start, cashier = cashier_bank(cashier_arrival[at_cashier], accumulated[at_cashier],
+                                          num_cashier, config.cashier_policy, choice)
+    cashier_delay = np.zeros(n)
+    cashier_delay[at_cashier] = cashier_start - cashier_arrival[at_cashier]
+    cashier_finished = np.zeros(n, dtype=bool)
+    cashier_finished[at_cashier] = cashier_start < duration
+
+    # total semua antrian kasir
+    queue_stats["cashiers"] = queue_length_stats(
+        cashier_arrival[at_cashier], cashier_start, duration)
+
+    return SamplePath(config, streams, customer_id, arrival, group_size, route,
+                      food_service, food_start, food_delay, food_started,
+                      cashier_arrival, at_cashier, cashier_start, cashier,
+                      cashier_delay, cashier_finished, queue_stats)
+
+
+def build_metrics(path):
+    # Metrik dengan nama yang sama dengan generate_report, lewat lapisan laporan yang sama
+    # (satu replikasi). Total delay rute 3 hanya kasir karena food_delay = 0.
+    queue_stats = {prefix: path.queue_stats[station] for prefix, station in reporting.QUEUES}
+    accumulators = reporting.customer_accumulators(
+        np.zeros(len(path.route), dtype=np.int64), path.route, path.group_size,
+        path.food_delay, path.food_started, path.cashier_delay, path.cashier_finished,
+        queue_stats)
+    return reporting.compute_metrics(accumulators).row(0)
+
+
+def validate_against_simpy(config=None, rel_tol=1e-6):
+    # Bandingkan dengan engine SimPy pada input acak yang sama
+    if config is None:
+        config = cafe.SimulationConfig()
+    expected = cafe.run(config.replace(
+        log_mode="null", print_report=False)).metrics
+    actual = fast_simulation(config)
+    return {name: (expected[name], actual[name]) for name in expected
+            if not math.isclose(expected[name], actual[name], rel_tol=rel_tol, abs_tol=1e-9)}
+
+
+def screen_staffing(scenarios, config=None):
+    # scenarios: list of (hot_food, sandwich, cashier), semua memakai input acak yang sama
+    if config is None:
+        config = cafe.SimulationConfig()
+    return [dict(num_hot_food=hot_food, num_sandwich=sandwich, num_cashier=cashier,
+                 **fast_simulation(config.replace(num_hot_food_employee=hot_food,
+                                                  num_sandwich_employee=sandwich,
+                                                  num_cashier=cashier)))
+            for hot_food, sandwich, cashier in scenarios]
+
+
+if __name__ == "__main__":
+    for offset in range(5):
+        mismatches = validate_against_simpy(
+            cafe.SimulationConfig(seed_offset=offset))
+        print(f"seed_offset {offset}: " +
+              ("OK" if not mismatches else f"BERBEDA {mismatches}"))
@@ -0,0 +1,166 @@
+# Instrumentasi per run (config.profile=True): jumlah event per stasiun, waktu wall
+# di setiap service() dan cs() (atau handler kernel heapq), sampel ukuran heap event
+# dan antrian SimPy sepanjang waktu simulasi, serta pembagian waktu wall antara
+# simulasi dan generate_report.
+# Event per stasiun di simpy = event yang melanjutkan proses kunjungan (cs) atau proses
+# setup, sama dengan panggilan handler kernel heapq: hot-food/sandwich/kasir 2 per
+# pelanggan (mulai, selesai), drink 1, cafetaria 1 per grup. service() hanya diukur
+# waktunya. Semua pembungkus dipasang saat run dimulai, jadi
+# run tanpa profile tidak menjalankan kode tambahan apa pun di loop utama.
+# Ringkasan berupa dict yang bisa langsung di-json.dump (Results.profile).
+import time
+import collections
+
+import CafetariaSimulation as cafe
+
+# jumlah sampel ukuran heap/antrian per run
+PROFILE_SAMPLES = 1000
+# stasiun untuk setiap handler kernel heapq
+HANDLER_STATIONS = {"on_group_arrival": "cafetaria",
+                    "start_hot_food": "hot-food", "finish_hot_food": "hot-food",
+                    "start_sandwich": "sandwich", "finish_sandwich": "sandwich",
+                    "finish_drink": "drink",
+                    "start_cashier": "cashier", "finish_cashier": "cashier"}
+
+
+class Profiler:
+    def __init__(self, config, num_samples=PROFILE_SAMPLES):
+        self.backend = config.backend
+        self.sample_interval = config.simulation_duration / num_samples
+        self.next_sample = 0.0
+        self.events = 0
+        self.station_events = collections.Counter()
+        # key -> [jumlah panggilan, jumlah langkah, detik]
+        self.timings = collections.defaultdict(lambda: [0, 0, 0.0])
+        self.samples = collections.defaultdict(list)
+        self.wall = {}
+
+    # Waktu wall yang dihabiskan di dalam generator (tidak termasuk saat menunggu event).
+    # count=True: setiap kali generator dilanjutkan oleh event dihitung sebagai satu
+    # event stasiun (langkah pertama hanya memulai proses, tidak dihitung)
+    def timed(self, key, station_name, generator, count=True):
+        clock = time.perf_counter
+        timing = self.timings[key]
+        timing[0] += 1
+        value, error = None, None
+        while True:
+            start = clock()
+            try:
+                event = generator.send(value) if error is None else generator.throw(error)
+            except StopIteration as stop:
+                timing[1] += 1
+                timing[2] += clock() - start
+                return stop.value
+            timing[1] += 1
+            timing[2] += clock() - start
+            try:
+                value, error = (yield event), None
+                if count:
+                    self.station_events[station_name] += 1
+            except GeneratorExit:
+                generator.close()
+                raise
+            except BaseException as exc:
+                value, error = None, exc
+
+    def sample(self, now, heap_size, queue_sizes):
+        samples = self.samples
+        samples["time"].append(now)
+        if heap_size is not None:
+            samples["event_heap"].append(heap_size)
+        for name, size in queue_sizes:
+            samples[name].append(size)
+        self.next_sample = now + self.sample_interval
+
+    # Backend simpy: bungkus service() setiap stasiun dan env.step, kembalikan
+    # pengganti cs untuk setup/process_customer
+    def instrument_simpy(self, env, hot_food, sandwich, drinks, cashier):
+        stations = (("hot-food", hot_food), ("sandwich", sandwich),
+                    ("drink", drinks), ("cashier", cashier))
+        for name, station in stations:
+            service = station.service
+            station.service = (lambda customer, name=name, service=service:
+                               self.timed(f"service:{name}", name, service(customer), False))
+
+        if cashier.bank.policy == "serpentine":
+            cashier_queues = [cashier.line]
+        else:
+            cashier_queues = cashier.queues
+
+        def queue_sizes():
+            return (("hot-food", len(hot_food.queue.queue)),
+                    ("sandwich", len(sandwich.queue.queue)),
+                    ("cashier", sum(len(queue.queue) for queue in cashier_queues)))
+
+        # ukuran heap event: simpy tidak punya API publik, jadi baca Environment._queue
+        # (list heap di simpy 3/4) jika ada; tanpa itu sampel event_heap tidak diambil
+        def heap_size():
+            queue = getattr(env, "_queue", None)
+            return len(queue) if isinstance(queue, list) else None
+
+        step = env.step
+
+        def profiled_step():
+            if env.now >= self.next_sample:
+                self.sample(env.now, heap_size(), queue_sizes())
+            self.events += 1
+            step()
+
+        env.step = profiled_step
+
+        def visit(env, customer, station_name, station):
+            return self.timed(f"cs:{station_name}", station_name,
+                              cafe.cs(env, customer, station_name, station))
+
+        return visit
+
+    def instrument_setup(self, process):
+        # proses setup simpy: satu event cafetaria per grup yang datang
+        return self.timed("setup", "cafetaria", process)
+
+    # Backend heapq: bungkus setiap handler event kernel
+    def instrument_kernel(self, kernel):
+        clock = time.perf_counter
+
+        def queue_sizes():
+            cashier = len(kernel.cashier_line) + sum(len(server.waiting)
+                                                     for server in kernel.cashiers)
+            return (("hot-food", len(kernel.hot_food.waiting)),
+                    ("sandwich", len(kernel.sandwich.waiting)),
+                    ("cashier", cashier))
+
+        def wrap(name, station_name, handler):
+            timing = self.timings[f"handler:{name}"]
+
+            def profiled(item):
+                if kernel.now >= self.next_sample:
+                    self.sample(kernel.now, len(kernel.heap), queue_sizes())
+                start = clock()
+                handler(item)
+                timing[2] += clock() - start
+                timing[0] += 1
+                timing[1] += 1
+                self.station_events[station_name] += 1
+                self.events += 1
+            return profiled
+
+        for name, station_name in HANDLER_STATIONS.items():
+            setattr(kernel, name, wrap(name, station_name, getattr(kernel, name)))
+
+    def record_wall(self, simulation, report):
+        self.wall = {"simulation_s": simulation, "report_s": report,
+                     "total_s": simulation + report}
+
+    def summary(self):
+        timings = {key: {"calls": calls, "steps": steps, "seconds": seconds,
+                         "us_per_call": seconds / calls * 1e6 if calls else 0.0}
+                   for key, (calls, steps, seconds) in sorted(self.timings.items())}
+        sizes = {name: {"mean": sum(values) / len(values), "max": max(values)}
+                 for name, values in self.samples.items() if name != "time" and values}
+        return {"backend": self.backend,
+                "wall": self.wall,
+                "events": {"total": self.events,
+                           "per_station": dict(sorted(self.station_events.items()))},
+                "timings": timings,
+                "sizes": sizes,
+                "samples": dict(self.samples)}
@@ -0,0 +1,296 @@
+# Ekspor perjalanan pelanggan ke format kolom untuk analisis setelah run
+# (log_mode="journey", trace_path = direktori). Setiap kolom adalah satu file .npy
+# yang ditambah per blok selama run; header .npy ditulis ulang saat close dengan
+# panjang akhir (numpy menyediakan ruang untuk itu, lihat GROWTH_AXIS_MAX_DIGITS).
+# Dua tabel:
+#   customers    : satu baris per pelanggan, ditulis saat pelanggan meninggalkan kasir
+#                  (pelanggan yang masih di sistem ditulis saat close, waktu yang belum
+#                  terjadi = NaN)
+#   queue_events : satu baris per perubahan panjang antrian (waktu, antrian, panjang)
+# JourneyTrace membaca kedua tabel dengan memory map, jadi trace run satu tahun
+# bisa diiris dan diagregasi per blok tanpa dimuat seluruhnya ke RAM.
+import os
+import json
+import array
+import math
+
+import numpy as np
+
+import CafetariaSimulation as cafe
+
+JOURNEY_BLOCK_SIZE = 65536
+MANIFEST = "manifest.json"
+
+# (nama kolom, dtype, typecode array.array)
+CUSTOMER_COLUMNS = [("customer_id", "<i8", "q"), ("route", "i1", "b"),
+                    ("group_size", "i1", "b"), ("cashier", "<i2", "h"),
+                    ("arrive", "<f8", "d"),
+                    ("hot_food_enter", "<f8", "d"), ("hot_food_start", "<f8", "d"),
+                    ("hot_food_leave", "<f8", "d"),
+                    ("sandwich_enter", "<f8", "d"), ("sandwich_start", "<f8", "d"),
+                    ("sandwich_leave", "<f8", "d"),
+                    ("drink_start", "<f8", "d"), ("drink_leave", "<f8", "d"),
+                    ("cashier_enter", "<f8", "d"), ("cashier_start", "<f8", "d"),
+                    ("cashier_leave", "<f8", "d"),
+                    ("hot_food_delay", "<f8", "d"), ("sandwich_delay", "<f8", "d"),
+                    ("cashier_delay", "<f8", "d")]
+QUEUE_COLUMNS = [("time", "<f8", "d"), ("queue", "<i2", "h"), ("length", "<i4", "i")]
+
+# kolom waktu yang diisi oleh (stasiun, tipe event)
+EVENT_COLUMNS = {("cafetaria", cafe.EVENT_ARRIVE): "arrive",
+                 ("hot-food", cafe.EVENT_QUEUE): "hot_food_enter",
+                 ("hot-food", cafe.EVENT_SERVE): "hot_food_start",
+                 ("hot-food", cafe.EVENT_DELAY): "hot_food_delay",
+                 ("hot-food", cafe.EVENT_LEAVE): "hot_food_leave",
+                 ("sandwich", cafe.EVENT_QUEUE): "sandwich_enter",
+                 ("sandwich", cafe.EVENT_SERVE): "sandwich_start",
+                 ("sandwich", cafe.EVENT_DELAY): "sandwich_delay",
+                 ("sandwich", cafe.EVENT_LEAVE): "sandwich_leave",
+                 ("drink", cafe.EVENT_SERVE): "drink_start",
+                 ("drink", cafe.EVENT_LEAVE): "drink_leave",
+                 ("cashier", cafe.EVENT_QUEUE): "cashier_enter",
+                 ("cashier", cafe.EVENT_SERVE): "cashier_start",
+                 ("cashier", cafe.EVENT_DELAY): "cashier_delay",
+                 ("cashier", cafe.EVENT_LEAVE): "cashier_leave"}
+# nilai event (value) yang disimpan, bukan waktunya
+VALUE_COLUMNS = ("hot_food_delay", "sandwich_delay", "cashier_delay")
+
+
+def column_path(directory, table, column):
+    return os.path.join(directory, f"{table}.{column}.npy")
+
+
+# Satu file .npy 1 dimensi yang ditulis bertahap
+class NpyColumnWriter:
+    def __init__(self, path, dtype):
+        self.dtype = np.dtype(dtype)
+        self.file = open(path, "wb")
+        self.rows = 0
+        self._write_header()
+
+    def _write_header(self):
+        header = {"descr": np.lib.format.dtype_to_descr(self.dtype),
+                  "fortran_order": False, "shape": (self.rows,)}
+        np.lib.format.write_array_header_1_0(self.file, header)
+
+    def append(self, values):
+        block = np.asarray(values, dtype=self.dtype)
+        block.tofile(self.file)
+        self.rows += len(block)
+
+    def close(self):
+        # panjang header tetap (ada padding untuk digit shape), jadi aman ditimpa
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+
+
+# Tabel kolom: buffer array.array per kolom, ditulis setiap block_size baris
+class ColumnTableWriter:
+    def __init__(self, directory, table, columns, block_size):
+        self.block_size = block_size
+        self.columns = columns
+        self.writers = [NpyColumnWriter(column_path(directory, table, name), dtype)
+                        for name, dtype, _ in columns]
+        self._reset()
+
+    def _reset(self):
+        self.buffers = [array.array(typecode) for _, _, typecode in self.columns]
+
+    def append(self, row):
+        for buffer, value in zip(self.buffers, row):
+            buffer.append(value)
+        if len(self.buffers[0]) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffers[0]:
+            return
+        for writer, buffer in zip(self.writers, self.buffers):
+            writer.append(buffer)
+        self._reset()
+
+    def close(self):
+        self.flush()
+        for writer in self.writers:
+            writer.close()
+        return self.writers[0].rows
+
+
+# Event sink yang menyusun baris perjalanan per pelanggan dari event log.
+# Nilai event ARRIVE = ukuran grup, nilai SERVE di kasir = indeks kasir (0..k-1).
+class JourneySink:
+    enabled = True
+
+    def __init__(self, directory, block_size=JOURNEY_BLOCK_SIZE):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.customers = ColumnTableWriter(directory, "customers", CUSTOMER_COLUMNS, block_size)
+        self.queue_events = ColumnTableWriter(directory, "queue_events", QUEUE_COLUMNS, block_size)
+        self.column_index = {name: i for i, (name, _, _) in enumerate(CUSTOMER_COLUMNS)}
+        self.event_index = {key: self.column_index[name] for key, name in EVENT_COLUMNS.items()}
+        self.value_index = {self.column_index[name] for name in VALUE_COLUMNS}
+        self.active = {}
+        self.queue_names = []
+
+    def watch_queues(self, queues):
+        # catat setiap perubahan panjang QueueMonitor sebagai baris queue_events
+        self.queue_names = list(queues)
+        for code, monitor in enumerate(queues.values()):
+            update = monitor.update
+
+            def watched(now, length, code=code, monitor=monitor, update=update):
+                if length != monitor.length:
+                    self.queue_events.append((now, code, length))
+                update(now, length)
+            monitor.update = watched
+
+    def event(self, time, customer_id, station, event_type, value=None):
+        if event_type == cafe.EVENT_ARRIVE:
+            row = [math.nan] * len(CUSTOMER_COLUMNS)
+            row[0:4] = [customer_id, 3, value or 0, -1]
+            self.active[customer_id] = row
+        row = self.active[customer_id]
+        index = self.event_index[station, event_type]
+        row[index] = value if index in self.value_index else time
+        if event_type == cafe.EVENT_QUEUE and station == "hot-food":
+            row[1] = 1
+        elif event_type == cafe.EVENT_QUEUE and station == "sandwich":
+            row[1] = 2
+        elif station == "cashier":
+            if event_type == cafe.EVENT_SERVE and value is not None:
+                row[3] = value
+            elif event_type == cafe.EVENT_LEAVE:
+                self.customers.append(self.active.pop(customer_id))
+
+    def flush(self):
+        self.customers.flush()
+        self.queue_events.flush()
+
+    def close(self):
+        # pelanggan yang belum selesai, urut customer_id
+        for customer_id in sorted(self.active):
+            self.customers.append(self.active[customer_id])
+        self.active = {}
+        manifest = {"version": 1, "queues": self.queue_names,
+                    "tables": {"customers": {"rows": self.customers.close(),
+                                             "columns": [name for name, _, _ in CUSTOMER_COLUMNS]},
+                               "queue_events": {"rows": self.queue_events.close(),
+                                                "columns": [name for name, _, _ in QUEUE_COLUMNS]}}}
+        with open(os.path.join(self.directory, MANIFEST), "w") as file:
+            json.dump(manifest, file, indent=2)
+
+
+# Satu tabel hasil ekspor, setiap kolom di-memory-map saat pertama diakses
+class JourneyTable:
+    def __init__(self, directory, name, columns, rows):
+        self.directory = directory
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        self._maps = {}
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, column):
+        if column not in self._maps:
+            if column not in self.columns:
+                raise KeyError(column)
+            self._maps[column] = np.load(column_path(self.directory, self.name, column),
+                                         mmap_mode="r")
+        return self._maps[column]
+
+    def slice(self, start, stop, columns=None):
+        # salinan baris [start, stop) untuk kolom yang diminta
+        return {name: np.array(self[name][start:stop]) for name in columns or self.columns}
+
+    def blocks(self, columns=None, block_size=JOURNEY_BLOCK_SIZE):
+        # iterasi per blok, hanya halaman blok tersebut yang dibaca dari disk
+        for start in range(0, self.rows, block_size):
+            yield self.slice(start, min(start + block_size, self.rows), columns)
+
+    def group_stats(self, column, by, where=None, block_size=JOURNEY_BLOCK_SIZE):
+        # count, mean dan max kolom per nilai kolom `by` (bilangan bulat >= 0), NaN diabaikan.
+        # where = fungsi blok -> mask boolean opsional
+        count = np.zeros(0, dtype=np.int64)
+        total = np.zeros(0)
+        largest = np.zeros(0)
+        columns = [column, by] + ([] if where is None else list(self.columns))
+        for block in self.blocks(list(dict.fromkeys(columns)), block_size):
+            values, keys = block[column], block[by].astype(np.int64)
+            mask = ~np.isnan(values) if values.dtype.kind == "f" else np.ones(len(values), bool)
+            if where is not None:
+                mask &= where(block)
+            values, keys = values[mask], keys[mask]
+            if not len(keys):
+                continue
+            size = max(len(count), int(keys.max()) + 1)
+            count = np.pad(count, (0, size - len(count)))
+            total = np.pad(total, (0, size - len(total)))
+            largest = np.pad(largest, (0, size - len(largest)), constant_values=-np.inf)
+            count += np.bincount(keys, minlength=size)
+            total += np.bincount(keys, weights=values, minlength=size)
+            np.maximum.at(largest, keys, values)
+        return {int(key): {"count": int(count[key]), "mean": float(total[key] / count[key]),
+                           "max": float(largest[key])}
+                for key in np.flatnonzero(count)}
+
+
+# Pembaca direktori hasil JourneySink
+class JourneyTrace:
+    def __init__(self, directory):
+        with open(os.path.join(directory, MANIFEST)) as file:
+            self.manifest = json.load(file)
+        self.directory = directory
+        self.queue_names = self.manifest["queues"]
+        self.tables = {name: JourneyTable(directory, name, table["columns"], table["rows"])
+                       for name, table in self.manifest["tables"].items()}
+
+    @property
+    def customers(self):
+        return self.tables["customers"]
+
+    @property
+    def queue_events(self):
+        return self.tables["queue_events"]
+
+    def queue_series(self, queue, block_size=JOURNEY_BLOCK_SIZE):
+        # (waktu, panjang) setiap perubahan satu antrian sebagai array di memori (opt-in,
+        # ukurannya sebanding panjang trace; agregat memakai queue_time_average per blok)
+        code = self.queue_names.index(queue)
+        times, lengths = [], []
+        for block in self.queue_events.blocks(block_size=block_size):
+            mask = block["queue"] == code
+            times.append(block["time"][mask])
+            lengths.append(block["length"][mask])
+        if not times:
+            return np.zeros(0), np.zeros(0, dtype=np.int32)
+        return np.concatenate(times), np.concatenate(lengths)
+
+    def queue_time_average(self, queue, until, block_size=JOURNEY_BLOCK_SIZE):
+        # Rata-rata panjang antrian berbobot waktu dari 0 sampai until (sama dengan
+        # QueueMonitor). Luas dihitung per blok; (waktu, panjang) terakhir satu blok
+        # dibawa ke blok berikutnya untuk segmen yang melewati batas blok.
+        if until <= 0:
+            return 0.0
+        code = self.queue_names.index(queue)
+        area = 0.0
+        last = None
+        for block in self.queue_events.blocks(columns=["queue", "time", "length"],
+                                              block_size=block_size):
+            mask = block["queue"] == code
+            times, lengths = block["time"][mask], block["length"][mask]
+            if not len(times):
+                continue
+            if last is not None:
+                area += last[1] * (times[0] - last[0])
+            area += float((lengths[:-1] * np.diff(times)).sum())
+            last = (times[-1], lengths[-1])
+        if last is not None:
+            area += last[1] * (until - last[0])
+        return float(area / until)
+
+
+def read_journeys(directory):
+    return JourneyTrace(directory)
@@ -0,0 +1,312 @@
+# Simulasi banyak cafetaria (site) sekaligus. Katalog site (JSON/CSV atau generator)
+# dibagi menjadi shard, setiap shard dijalankan satu worker process: beberapa run
+# (satu simpy.Environment per site) berurutan di proses yang sama, jadi import modul,
+# simpy dan numpy hanya dibayar sekali per worker. Hasil per site dikirim kembali per
+# shard begitu selesai dan langsung digabung ke laporan perusahaan. Jumlah shard yang
+# sedang berjalan dibatasi dan laporan hanya menyimpan akumulator, jadi memori tetap
+# kecil berapa pun jumlah site di katalog.
+import csv
+import json
+import heapq
+import random
+import itertools
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import CafetariaSimulation as cafe
+import replication
+
+SHARD_SIZE = 8
+# jumlah site dengan delay terburuk yang ditampilkan di laporan
+WORST_SITES = 5
+STATIONS = ("hot-food", "sandwich", "cashier")
+CONFIG_FIELDS = {field.name: field.type for field in dataclasses.fields(cafe.SimulationConfig)}
+# field yang diatur oleh run_shard, tidak boleh dari katalog
+MANAGED_FIELDS = ("log_mode", "print_report")
+# konversi nilai katalog (CSV selalu string) ke tipe field SimulationConfig
+CONVERTERS = {int: int, float: float, str: str,
+              bool: lambda value: value in (True, 1, "1", "true", "True")}
+
+
+def number_tuple(value):
+    # "50,120" (CSV) atau [50, 120] (JSON)
+    if isinstance(value, str):
+        return tuple(float(piece) for piece in value.split(","))
+    return tuple(float(piece) for piece in value)
+
+
+def name_tuple(value):
+    # "st_hot_food,st_sandwich" (CSV) atau list nama (JSON)
+    if isinstance(value, str):
+        return tuple(piece.strip() for piece in value.split(",") if piece.strip())
+    return tuple(value)
+
+
+def profile_tuple(value):
+    # "0:0.5,1800:3" (CSV, format --arrival-profile) atau [[0, 0.5], [1800, 3]] (JSON)
+    if isinstance(value, str):
+        return cafe.parse_arrival_profile(value)
+    return tuple((float(start), float(factor)) for start, factor in value)
+
+
+# field tuple dikonversi per field karena isinya berbeda
+TUPLE_CONVERTERS = {"arrival_profile": profile_tuple,
+                    "hot_food_service": number_tuple,
+                    "sandwich_service": number_tuple,
+                    "stat_quantiles": number_tuple,
+                    "antithetic": name_tuple}
+
+
+def convert_field(name, value):
+    if name in TUPLE_CONVERTERS:
+        return TUPLE_CONVERTERS[name](value)
+    return CONVERTERS[CONFIG_FIELDS[name]](value)
+
+
+def site_config(index, site, config=None):
+    # SimulationConfig satu site: field katalog menimpa config dasar; tanpa seed_offset
+    # eksplisit setiap site mendapat stream sendiri (seperti replikasi ke-index)
+    if config is None:
+        config = cafe.SimulationConfig()
+    managed = sorted(name for name in site if name in MANAGED_FIELDS)
+    if managed:
+        raise ValueError(f"kolom katalog tidak boleh mengatur {', '.join(managed)}")
+    changes = {name: convert_field(name, value) for name, value in site.items()
+               if name in CONFIG_FIELDS and value not in (None, "")}
+    if "seed_offset" not in changes:
+        replication.check_replications(config.replace(**changes), 1, index)
+        changes["seed_offset"] = replication.replication_seed_offset(index)
+    return config.replace(log_mode="null", print_report=False, **changes)
+
+
+def load_catalogue(path):
+    # Site dengan name + field SimulationConfig. CSV dan JSON Lines (.jsonl, satu objek per
+    # baris) dibaca per baris; .json (list of dict) dibaca sekaligus ke memori.
+    if path.endswith(".jsonl"):
+        with open(path) as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    if path.endswith(".json"):
+        with open(path) as file:
+            yield from json.load(file)
+        return
+    with open(path, newline="") as file:
+        yield from csv.DictReader(file)
+
+
+def synthetic_catalogue(num_sites, seed=0):
+    # katalog contoh: staffing dan laju kedatangan acak di sekitar staffing stabil 5/2/3
+    rng = random.Random(seed)
+    for index in range(num_sites):
+        scale = rng.uniform(0.5, 1.5)
+        yield {"name": f"site-{index + 1}",
+               "num_hot_food_employee": max(1, round(5 * scale + rng.choice((-1, 0, 0, 1)))),
+               "num_sandwich_employee": max(1, round(2 * scale)),
+               "num_cashier": max(1, round(3 * scale + rng.choice((-1, 0, 1)))),
+               "interval_customer_arrival": 30 / scale}
+
+
+def warm_worker():
+    # import simpy dan numpy sekali saat worker dibuat
+    import simpy  # noqa: F401
+    import numpy  # noqa: F401
+
+
+def site_row(name, config, results):
+    stats = results.stats
+    row = {"site": name,
+           "num_hot_food_employee": config.num_hot_food_employee,
+           "num_sandwich_employee": config.num_sandwich_employee,
+           "num_cashier": config.num_cashier,
+           "interval_customer_arrival": config.interval_customer_arrival,
+           "customers": stats.customers}
+    for station in STATIONS:
+        key = station.replace("-", "_")
+        row[f"{key}_served"] = stats.stations[station].count
+        row[f"{key}_delay_total"] = stats.stations[station].total
+        row[f"{key}_max_delay"] = stats.stations[station].max or 0.0
+    row["finished"] = sum(route.count for route in stats.routes.values())
+    row["overall_delay_total"] = sum(route.total for route in stats.routes.values())
+    row["overall_avg_delay"] = row["overall_delay_total"] / row["finished"] if row["finished"] else 0.0
+    return row
+
+
+def run_shard(shard):
+    # shard: [(index, site dict, config dasar)], dijalankan berurutan di worker ini
+    rows = []
+    for index, site, config in shard:
+        name = site.get("name") or f"site-{index + 1}"
+        try:
+            site_conf = site_config(index, site, config)
+            rows.append(site_row(name, site_conf, cafe.run(site_conf)))
+        except Exception as error:  # satu site gagal tidak menghentikan shard
+            rows.append({"site": name, "error": repr(error)})
+    return rows
+
+
+def iter_site_results(catalogue, config=None, max_workers=None, shard_size=SHARD_SIZE):
+    # Generator baris hasil per site, urutan sesuai shard yang selesai lebih dulu.
+    # Paling banyak 2 x max_workers shard yang dikirim tapi belum selesai.
+    max_workers = replication.worker_count(max_workers)
+    sites = ((index, site, config) for index, site in enumerate(catalogue))
+    shards = iter(lambda: list(itertools.islice(sites, shard_size)), [])
+
+    if max_workers == 1:
+        for shard in shards:
+            yield from run_shard(shard)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=warm_worker) as executor:
+        pending = set()
+        for shard in shards:
+            pending.add(executor.submit(run_shard, shard))
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+# Akumulator laporan perusahaan, ukuran tetap (tidak menyimpan baris per site)
+class CompanyReport:
+    def __init__(self, worst=WORST_SITES):
+        self.sites = 0
+        self.failed = 0
+        self.errors = []  # (site, error) untuk paling banyak `worst` site gagal pertama
+        self.customers = 0
+        self.staff = [0, 0, 0]
+        self.served = {station: 0 for station in STATIONS}
+        self.delay_total = {station: 0.0 for station in STATIONS}
+        self.max_delay = {station: 0.0 for station in STATIONS}
+        self.finished = 0
+        self.overall_delay_total = 0.0
+        self.worst = worst
+        self.worst_sites = []  # min-heap (overall_avg_delay, site)
+
+    def add(self, row):
+        if "error" in row:
+            self.failed += 1
+            if len(self.errors) < self.worst:
+                self.errors.append((row["site"], row["error"]))
+            return
+        self.sites += 1
+        self.customers += row["customers"]
+        self.staff[0] += row["num_hot_food_employee"]
+        self.staff[1] += row["num_sandwich_employee"]
+        self.staff[2] += row["num_cashier"]
+        for station in STATIONS:
+            key = station.replace("-", "_")
+            self.served[station] += row[f"{key}_served"]
+            self.delay_total[station] += row[f"{key}_delay_total"]
+            self.max_delay[station] = max(self.max_delay[station], row[f"{key}_max_delay"])
+        self.finished += row["finished"]
+        self.overall_delay_total += row["overall_delay_total"]
+        entry = (row["overall_avg_delay"], row["site"])
+        if len(self.worst_sites) < self.worst:
+            heapq.heappush(self.worst_sites, entry)
+        else:
+            heapq.heappushpop(self.worst_sites, entry)
+
+    def summary(self):
+        # rata-rata delay perusahaan = total delay / jumlah pelanggan (berbobot pelanggan)
+        return {"sites": self.sites,
+                "failed": self.failed,
+                "customers": self.customers,
+                "staff": {"hot_food": self.staff[0], "sandwich": self.staff[1],
+                          "cashier": self.staff[2]},
+                "avg_delay": {station: self.delay_total[station] / self.served[station]
+                              if self.served[station] else 0.0 for station in STATIONS},
+                "max_delay": dict(self.max_delay),
+                "overall_avg_delay": self.overall_delay_total / self.finished
+                if self.finished else 0.0,
+                "worst_sites": sorted(self.worst_sites, reverse=True)}
+
+
+def run_company(catalogue, config=None, max_workers=None, shard_size=SHARD_SIZE,
+                on_site=None, worst=WORST_SITES):
+    # Jalankan semua site, on_site(row) dipanggil untuk setiap hasil (misalnya tulis CSV)
+    report = CompanyReport(worst)
+    for row in iter_site_results(catalogue, config, max_workers, shard_size):
+        report.add(row)
+        if on_site is not None:
+            on_site(row)
+    return report
+
+
+def csv_row_writer(file):
+    # on_site untuk run_company: header dari baris sukses pertama, site gagal dilewati
+    writer = None
+
+    def write(row):
+        nonlocal writer
+        if "error" in row:
+            return
+        if writer is None:
+            writer = csv.DictWriter(file, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow(row)
+    return write
+
+
+def print_company_report(report):
+    summary = report.summary()
+    print("\n------------------- COMPANY REPORT -------------------\n")
+    print(f"Jumlah site: {summary['sites']} ({summary['failed']} gagal)")
+    print(f"Total pelanggan: {summary['customers']}")
+    staff = summary["staff"]
+    print(f"Total pelayan: hotfood {staff['hot_food']}, sandwich {staff['sandwich']}, "
+          f"kasir {staff['cashier']}\n")
+    for station in STATIONS:
+        print(f"  {station:<10}: rata-rata delay {summary['avg_delay'][station]:8.2f} Detik, "
+              f"maksimum {summary['max_delay'][station]:8.2f} Detik")
+    print(f"\n  Rata-rata delay keseluruhan: {summary['overall_avg_delay']:.2f} Detik")
+    print("\nSite dengan delay terburuk:")
+    for delay, site in summary["worst_sites"]:
+        print(f"  {site:<20}: {delay:10.2f} Detik")
+    for site, error in report.errors:
+        print(f"  GAGAL {site}: {error}")
+    print("\n------------------------------------------------------")
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulasi banyak cafetaria di process pool")
+    parser.add_argument("catalogue", nargs="?", default=None,
+                        help="katalog site (.json, .jsonl atau .csv)")
+    parser.add_argument("--synthetic", type=int, default=None, metavar="N",
+                        help="pakai katalog contoh dengan N site")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument("--backend", choices=["simpy", "heapq"], default="simpy")
+    parser.add_argument("--duration", type=float, default=cafe.SIMULATION_DURATION)
+    parser.add_argument("--csv", default=None, help="tulis baris per site ke CSV (streaming)")
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        catalogue = synthetic_catalogue(args.synthetic)
+    elif args.catalogue is not None:
+        catalogue = load_catalogue(args.catalogue)
+    else:
+        parser.error("butuh file katalog atau --synthetic N")
+    config = cafe.SimulationConfig(backend=args.backend, simulation_duration=args.duration,
+                                   stat_quantiles=())
+
+    on_site = None
+    file = None
+    if args.csv:
+        file = open(args.csv, "w", newline="")
+        on_site = csv_row_writer(file)
+    try:
+        report = run_company(catalogue, config, args.workers, args.shard_size, on_site)
+    finally:
+        if file is not None:
+            file.close()
+    print_company_report(report)
+    sys.exit(1 if report.failed else 0)
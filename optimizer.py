@@ -0,0 +1,262 @@
+# Optimasi staffing dengan ranking-and-selection: cari kombinasi pelayan hotfood,
+# sandwich dan kasir dengan biaya terkecil yang memenuhi target delay (metrik
+# report_1/report_3, misalnya hot_food_avg_delay <= 60).
+# - Kandidat diperiksa per tingkat biaya, dari yang termurah. Tingkat yang lebih
+#   mahal tidak pernah disimulasikan jika tingkat yang lebih murah punya kandidat feasible.
+# - Feasibility setiap kandidat diuji secara sekuensial (prosedur F Andradottir & Kim):
+#   kandidat yang jelas melanggar atau jelas memenuhi target berhenti setelah sedikit
+#   replikasi, replikasi tambahan hanya untuk kandidat yang dekat dengan batas.
+# - Jika ada beberapa kandidat feasible dengan biaya sama, yang terbaik pada metrik
+#   objective dipilih dengan prosedur KN (eliminasi berpasangan, common random numbers).
+# Replikasi dijalankan per ronde di process pool (sweep.run_job).
+import math
+import itertools
+import statistics
+
+import CafetariaSimulation as cafe
+import replication
+import sweep
+
+DEFAULT_BOUNDS = ((1, 6), (1, 4), (1, 6))  # (min, max) hotfood, sandwich, kasir
+DEFAULT_COSTS = (1.0, 1.0, 1.0)
+
+
+def kn_h2(alpha, num_comparisons, n0):
+    # konstanta h^2 = 2 eta (n0 - 1) prosedur KN (Kim & Nelson 2001), dengan
+    # eta = ((2 alpha / (k - 1))^(-2/(n0-1)) - 1) / 2 untuk k kandidat (num_comparisons = k - 1).
+    # Bukan konstanta h Rinott: KN memakai daerah lanjut segitiga, bukan ukuran sampel tetap.
+    return (n0 - 1) * ((2 * alpha / num_comparisons) ** (-2 / (n0 - 1)) - 1)
+
+
+def continuation(h2, variance, tolerance, r):
+    # batas daerah lanjut (segitiga) untuk jumlah kumulatif selisih setelah r replikasi
+    return max(0.0, h2 * variance / (2 * tolerance) - tolerance * r / 2)
+
+
+class Candidate:
+    def __init__(self, config, cost):
+        self.config = config
+        self.cost = cost
+        self.staffing = tuple(getattr(config, field) for field in sweep.STAFFING_FIELDS)
+        self.rows = []  # metrik per replikasi, urut replication id (CRN antar kandidat)
+        self.status = "active"  # active, feasible, infeasible
+        self.violated = None
+
+    def values(self, metric):
+        return [row[metric] for row in self.rows]
+
+
+def staffing_candidates(bounds=DEFAULT_BOUNDS, costs=DEFAULT_COSTS, config=None):
+    if config is None:
+        config = cafe.SimulationConfig()
+    for name, (low, high) in zip(("hot_food", "sandwich", "cashier"), bounds):
+        if not 1 <= low <= high:
+            raise ValueError(f"batas {name} harus 1 <= min <= max, bukan ({low}, {high})")
+    ranges = [range(low, high + 1) for low, high in bounds]
+    configs = sweep.staffing_grid(*ranges, config=config)
+    return [Candidate(config, sum(cost * getattr(config, field)
+                                  for cost, field in zip(costs, sweep.STAFFING_FIELDS)))
+            for config in configs]
+
+
+class StaffingOptimizer:
+    def __init__(self, targets, objective="overall_avg_delay", tolerance=0.1, indifference=1.0,
+                 alpha=0.05, n0=10, batch=5, max_replications=200, engine="simpy",
+                 executor=None, max_workers=1):
+        # targets: {metrik: batas atas}, tolerance = zona indiferen feasibility relatif
+        # terhadap batas, indifference = zona indiferen KN (detik) pada objective
+        self.targets = targets
+        self.objective = objective
+        self.tolerances = {name: tolerance * abs(limit) or tolerance
+                           for name, limit in targets.items()}
+        self.indifference = indifference
+        self.alpha = alpha
+        self.n0 = n0
+        self.batch = batch
+        self.max_replications = max_replications
+        self.engine = engine
+        self.executor = executor
+        self.max_workers = max_workers
+        self.replications = 0
+        # setengah alpha untuk feasibility (Bonferroni antar target), setengah untuk KN
+        self.feasibility_h2 = kn_h2(alpha / 2 / len(targets), 1, n0)
+
+    def simulate(self, requests):
+        # requests: [(kandidat, jumlah replikasi yang diinginkan)], satu ronde paralel
+        jobs = [(index, candidate.config, replication_id, self.engine)
+                for index, (candidate, count) in enumerate(requests)
+                for replication_id in range(len(candidate.rows), count)]
+        if not jobs:
+            return
+        rows = replication.parallel_map(sweep.run_job, jobs, self.max_workers, self.executor)
+        for row in rows:
+            requests[row["scenario"]][0].rows.append(row)
+        self.replications += len(jobs)
+
+    def check_feasibility(self, candidate):
+        # prosedur F per target: sum(Y - q) <= -R -> memenuhi, >= R -> melanggar
+        r = len(candidate.rows)
+        undecided = False
+        for name, limit in self.targets.items():
+            values = candidate.values(name)
+            excess = sum(values) - r * limit
+            if r >= self.max_replications:
+                bound = 0.0  # keputusan paksa berdasarkan tanda
+            else:
+                bound = continuation(self.feasibility_h2, statistics.variance(values[:self.n0]),
+                                     self.tolerances[name], r)
+            if excess > 0 if bound == 0.0 else excess >= bound:
+                candidate.status, candidate.violated = "infeasible", name
+                return
+            if bound > 0.0 and excess > -bound:
+                undecided = True
+        if not undecided:
+            candidate.status = "feasible"
+
+    def screen(self, candidates):
+        # uji feasibility semua kandidat satu tingkat biaya sampai semuanya diputuskan
+        active = list(candidates)
+        while active:
+            self.simulate([(candidate, min(self.max_replications,
+                                           max(self.n0, len(candidate.rows) + self.batch)))
+                           for candidate in active])
+            for candidate in active:
+                self.check_feasibility(candidate)
+            active = [candidate for candidate in active if candidate.status == "active"]
+        return [candidate for candidate in candidates if candidate.status == "feasible"]
+
+    def select_best(self, candidates):
+        # KN: eliminasi i jika mean_i - mean_l > W_il(r) (minimisasi objective)
+        if len(candidates) == 1:
+            return candidates[0]
+        h2 = kn_h2(self.alpha / 2, len(candidates) - 1, self.n0)
+        delta = self.indifference
+        survivors = list(candidates)
+        r = max(len(candidate.rows) for candidate in survivors)
+        while True:
+            self.simulate([(candidate, r) for candidate in survivors])
+            values = {candidate.staffing: candidate.values(self.objective)[:r]
+                      for candidate in survivors}
+            means = {key: sum(series) / r for key, series in values.items()}
+            eliminated = set()
+            for i, l in itertools.permutations(survivors, 2):
+                differences = [a - b for a, b in zip(values[i.staffing][:self.n0],
+                                                     values[l.staffing][:self.n0])]
+                bound = continuation(h2, statistics.variance(differences), delta, r) / r
+                if r >= self.max_replications:
+                    bound = 0.0
+                if means[i.staffing] - means[l.staffing] > bound:
+                    eliminated.add(i.staffing)
+            survivors = [candidate for candidate in survivors
+                         if candidate.staffing not in eliminated]
+            if len(survivors) == 1:
+                return survivors[0]
+            if not survivors or r >= self.max_replications:
+                # seri persis pada batas replikasi: ambil mean terkecil
+                pool = survivors or candidates
+                return min(pool, key=lambda candidate: (means.get(candidate.staffing, math.inf),
+                                                        candidate.staffing))
+            r = min(self.max_replications, r + self.batch)
+
+    def optimize(self, candidates):
+        # tingkat biaya dari yang termurah; berhenti di tingkat pertama yang punya kandidat feasible
+        levels = itertools.groupby(sorted(candidates, key=lambda candidate: candidate.cost),
+                                   key=lambda candidate: candidate.cost)
+        for cost, group in levels:
+            feasible = self.screen(list(group))
+            if feasible:
+                return self.select_best(feasible)
+        return None
+
+
+def summarize_candidate(candidate, metrics, confidence=0.95):
+    return {name: replication.confidence_interval(candidate.values(name), confidence)
+            for name in metrics}
+
+
+def optimize_staffing(targets, objective="overall_avg_delay", bounds=DEFAULT_BOUNDS,
+                      costs=DEFAULT_COSTS, tolerance=0.1, indifference=1.0, alpha=0.05, n0=10,
+                      batch=5, max_replications=200, engine="simpy", max_workers=None,
+                      config=None):
+    # Kembalikan dict hasil; "best" None jika tidak ada kandidat feasible dalam bounds
+    max_workers = replication.worker_count(max_workers)
+    candidates = staffing_candidates(bounds, costs, config)
+    max_replications = replication.clamp_replications(candidates[0].config, max_replications)
+    replication.check_replications(candidates[0].config, min(n0, max_replications) or 1)
+    with replication.worker_pool(max_workers) as executor:
+        optimizer = StaffingOptimizer(targets, objective, tolerance, indifference, alpha, n0,
+                                      batch, max_replications, engine, executor, max_workers)
+        best = optimizer.optimize(candidates)
+    evaluated = [candidate for candidate in candidates if candidate.rows]
+    return {"best": best,
+            "estimates": summarize_candidate(best, list(targets) + [objective])
+            if best is not None else None,
+            "replications": optimizer.replications,
+            "grid_size": len(candidates),
+            "evaluated": evaluated,
+            "max_replications_per_candidate": max(len(candidate.rows) for candidate in evaluated)}
+
+
+def print_optimizer_report(result, targets):
+    print("\n------------------- STAFFING OPTIMIZER -------------------\n")
+    print("Target: " + ", ".join(f"{name} <= {limit}" for name, limit in targets.items()) + "\n")
+    for candidate in sorted(result["evaluated"], key=lambda candidate: (candidate.cost,
+                                                                       candidate.staffing)):
+        reason = f" ({candidate.violated})" if candidate.violated else ""
+        print(f"  HF={candidate.staffing[0]} SW={candidate.staffing[1]} K={candidate.staffing[2]}"
+              f"  biaya {candidate.cost:6.1f}  {len(candidate.rows):4d} replikasi  "
+              f"{candidate.status}{reason}")
+    best = result["best"]
+    if best is None:
+        print("\nTidak ada kombinasi staffing yang memenuhi target dalam batas pencarian")
+    else:
+        print(f"\nTerbaik: HF={best.staffing[0]} SW={best.staffing[1]} K={best.staffing[2]}, "
+              f"biaya {best.cost:.1f}")
+        for name, estimate in result["estimates"].items():
+            print(f"  {name:<20}: {estimate['mean']:10.2f} +/- {estimate['half_width']:.2f}")
+    exhaustive = result["grid_size"] * result["max_replications_per_candidate"]
+    print(f"\nReplikasi: {result['replications']} (sweep penuh {result['grid_size']} kombinasi x "
+          f"{result['max_replications_per_candidate']} replikasi = {exhaustive})")
+    print("\n----------------------------------------------------------")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Cari staffing termurah yang memenuhi target delay (ranking-and-selection)")
+    parser.add_argument("-t", "--target", action="append", required=True, metavar="METRIK=BATAS",
+                        help="target delay, misalnya hot_food_avg_delay=60 (boleh diulang)")
+    parser.add_argument("--objective", default="overall_avg_delay",
+                        help="metrik untuk memilih di antara kandidat feasible dengan biaya sama")
+    parser.add_argument("--hot-food", type=int, nargs=2, default=DEFAULT_BOUNDS[0],
+                        metavar=("MIN", "MAX"))
+    parser.add_argument("--sandwich", type=int, nargs=2, default=DEFAULT_BOUNDS[1],
+                        metavar=("MIN", "MAX"))
+    parser.add_argument("--cashier", type=int, nargs=2, default=DEFAULT_BOUNDS[2],
+                        metavar=("MIN", "MAX"))
+    parser.add_argument("--costs", type=float, nargs=3, default=DEFAULT_COSTS,
+                        metavar=("HF", "SW", "K"), help="biaya per pelayan")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="zona indiferen feasibility, relatif terhadap batas target")
+    parser.add_argument("--indifference", type=float, default=1.0,
+                        help="zona indiferen KN pada objective (detik)")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--n0", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=5)
+    parser.add_argument("--max-replications", type=int, default=200)
+    parser.add_argument("--engine", choices=["simpy", "fast"], default="simpy")
+    parser.add_argument("--backend", choices=["simpy", "heapq"], default="heapq")
+    parser.add_argument("--duration", type=float, default=cafe.SIMULATION_DURATION)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    targets = {name: float(limit) for name, limit in
+               (target.split("=") for target in args.target)}
+    config = cafe.SimulationConfig(simulation_duration=args.duration, backend=args.backend)
+    result = optimize_staffing(targets, args.objective,
+                               (args.hot_food, args.sandwich, args.cashier), args.costs,
+                               args.tolerance, args.indifference, args.alpha, args.n0,
+                               args.batch, args.max_replications, args.engine, args.workers,
+                               config)
+    print_optimizer_report(result, targets)
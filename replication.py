@@ -0,0 +1,307 @@
+# Replikasi independen dari simulasi cafetaria, dijalankan paralel di semua core
+import os
+import math
+import warnings
+import functools
+import contextlib
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+import CafetariaSimulation as cafe
+
+# Jarak seed antar replikasi. Seed per pelanggan = SEED_X + offset + customer_id,
+# jadi jarak ini harus jauh lebih besar dari jumlah pelanggan dalam satu hari
+# supaya stream replikasi yang berbeda tidak pernah tumpang tindih.
+REPLICATION_SEED_STRIDE = 10_000_000
+# Mode legacy memakai seed SEED_X + offset + key langsung untuk RandomState numpy, yang
+# hanya menerima seed < 2**32. Dengan stride di atas itu sekitar 429 replikasi pertama.
+LEGACY_SEED_LIMIT = 2 ** 32
+
+
+def replication_seed_offset(replication_id):
+    return replication_id * REPLICATION_SEED_STRIDE
+
+
+def max_legacy_replications(config):
+    # jumlah replikasi (id 0, 1, ...) yang seluruh seed-nya (sampai satu stride pelanggan)
+    # masih di bawah LEGACY_SEED_LIMIT
+    highest = max(config.stream_seeds().values()) + config.seed_offset
+    return max(0, (LEGACY_SEED_LIMIT - highest) // REPLICATION_SEED_STRIDE)
+
+
+def check_replications(config, num_replications, first_replication=0):
+    # Di mode legacy tolak replikasi yang seed-nya melewati 2**32 sebelum ada yang dijalankan
+    if config is None or config.random_mode != "legacy":
+        return
+    limit = max_legacy_replications(config)
+    if first_replication + num_replications > limit:
+        raise ValueError(
+            f"random_mode legacy hanya mendukung {limit} replikasi (id 0..{limit - 1}) dengan "
+            f"seed_offset {config.seed_offset}: seed legacy harus < 2**32. "
+            f"Pakai random_mode fast untuk replikasi lebih banyak")
+
+
+def clamp_replications(config, max_replications):
+    # Batas atas replikasi untuk prosedur sekuensial: di mode legacy dipotong ke
+    # max_legacy_replications dengan peringatan, karena prosedurnya bisa berhenti jauh
+    # sebelum batas itu (check_replications tetap untuk jumlah yang pasti dijalankan)
+    if config is None or config.random_mode != "legacy":
+        return max_replications
+    limit = max_legacy_replications(config)
+    if max_replications > limit:
+        warnings.warn(f"random_mode legacy hanya mendukung {limit} replikasi dengan seed_offset "
+                      f"{config.seed_offset}: max_replications {max_replications} dipotong "
+                      f"menjadi {limit}", stacklevel=3)
+        return limit
+    return max_replications
+
+
+def replication_config(config, replication_id):
+    # config untuk satu replikasi: stream digeser, tanpa log dan tanpa laporan
+    check_replications(config, 1, replication_id)
+    return config.replace(seed_offset=config.seed_offset + replication_seed_offset(replication_id),
+                          log_mode="null", print_report=False)
+
+
+def run_replication(replication_id, config=None):
+    # Satu simpy.Environment per replikasi
+    if config is None:
+        config = cafe.SimulationConfig()
+    metrics = cafe.run(replication_config(config, replication_id)).metrics
+    metrics["replication"] = replication_id
+    return metrics
+
+
+# Eksekusi paralel bersama untuk semua modul yang menjalankan banyak run (sweep,
+# variance_reduction, optimizer, sensitivity, ...)
+def worker_count(max_workers=None):
+    # default memakai semua core yang tersedia
+    return max_workers if max_workers is not None else os.cpu_count() or 1
+
+
+@contextlib.contextmanager
+def worker_pool(max_workers=None):
+    # process pool yang dipakai ulang antar batch (parallel_map(executor=...)),
+    # None jika hanya satu worker
+    if worker_count(max_workers) == 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=worker_count(max_workers)) as executor:
+        yield executor
+
+
+def parallel_map(worker, items, max_workers=None, executor=None):
+    # list worker(item) dengan urutan items. Satu worker tanpa executor = serial di proses
+    # ini; selain itu di executor yang diberikan atau pool baru untuk panggilan ini.
+    items = list(items)
+    max_workers = worker_count(max_workers)
+    if executor is None and max_workers == 1:
+        return [worker(item) for item in items]
+    # chunksize dibuat besar supaya overhead IPC kecil dan scaling mendekati linear
+    chunksize = max(1, len(items) // (max_workers * 4))
+    if executor is not None:
+        return list(executor.map(worker, items, chunksize=chunksize))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(worker, items, chunksize=chunksize))
+
+
+def add_config_arguments(parser, duration=True):
+    # opsi CLI staffing (dan durasi) yang dipakai bersama, lihat config_from_arguments
+    parser.add_argument("--hot-food", type=int, default=cafe.NUM_HOT_FOOD_EMPLOYEE,
+                        help="jumlah pelayan hotfood")
+    parser.add_argument("--sandwich", type=int, default=cafe.NUM_SANDWICH_EMPLOYEE,
+                        help="jumlah pelayan sandwich")
+    parser.add_argument("--cashier", type=int, default=cafe.NUM_CASHIER,
+                        help="jumlah kasir")
+    if duration:
+        parser.add_argument("--duration", type=float, default=cafe.SIMULATION_DURATION,
+                            help="waktu simulasi (detik)")
+
+
+def config_from_arguments(args, **changes):
+    # SimulationConfig dari opsi add_config_arguments, changes menimpa field lain
+    fields = {"num_hot_food_employee": args.hot_food,
+              "num_sandwich_employee": args.sandwich,
+              "num_cashier": args.cashier}
+    if getattr(args, "duration", None) is not None:
+        fields["simulation_duration"] = args.duration
+    fields.update(changes)
+    return cafe.SimulationConfig(**fields)
+
+
+def run_replications(num_replications, max_workers=None, first_replication=0, config=None):
+    check_replications(config, num_replications, first_replication)
+    replication_ids = range(first_replication,
+                            first_replication + num_replications)
+    worker = functools.partial(run_replication, config=config)
+    return parallel_map(worker, replication_ids, max_workers)
+
+
+# Distribusi t-student (tanpa scipy)
+def _betacf(a, b, x):
+    # continued fraction untuk incomplete beta (Numerical Recipes)
+    tiny = 1e-300
+    qab = a + b
+    qap = a + 1.0
+    qam = a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    if abs(d) < tiny:
+        d = tiny
+    d = 1.0 / d
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        if abs(d) < tiny:
+            d = tiny
+        c = 1.0 + aa / c
+        if abs(c) < tiny:
+            c = tiny
+        d = 1.0 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        if abs(d) < tiny:
+            d = tiny
+        c = 1.0 + aa / c
+        if abs(c) < tiny:
+            c = tiny
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-14:
+            break
+    return h
+
+
+def _regularized_beta(a, b, x):
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    ln_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(ln_front) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(ln_front) * _betacf(b, a, 1.0 - x) / b
+
+
+def t_cdf(t, df):
+    tail = 0.5 * _regularized_beta(df / 2.0, 0.5, df / (df + t * t))
+    return 1.0 - tail if t >= 0 else tail
+
+
+def t_quantile(p, df):
+    # Bisection pada CDF, cukup akurat untuk interval kepercayaan
+    low, high = -1e3, 1e3
+    for _ in range(200):
+        mid = (low + high) / 2.0
+        if t_cdf(mid, df) < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2.0
+
+
+def confidence_interval(values, confidence=0.95):
+    n = len(values)
+    mean = statistics.mean(values)
+    if n < 2:
+        return {"mean": mean, "std": 0.0, "half_width": math.inf,
+                "lower": -math.inf, "upper": math.inf, "n": n}
+    std = statistics.stdev(values)
+    half_width = t_quantile(0.5 + confidence / 2.0, n - 1) * std / math.sqrt(n)
+    return {"mean": mean, "std": std, "half_width": half_width,
+            "lower": mean - half_width, "upper": mean + half_width, "n": n}
+
+
+def summarize_replications(results, confidence=0.95):
+    # Gabungkan metrik report_1..report_5 dari setiap replikasi, semua metrik sekaligus
+    # sebagai kolom numpy (reporting.MetricsTable)
+    import reporting
+    return reporting.MetricsTable.from_rows(results).summary(confidence)
+
+
+def relative_half_width(interval):
+    # half-width relatif terhadap |mean|, inf jika belum bisa dihitung
+    if interval["n"] < 2 or interval["mean"] == 0:
+        return math.inf
+    return interval["half_width"] / abs(interval["mean"])
+
+
+def targets_met(results, targets, confidence=0.95):
+    # targets: {nama metrik: half-width relatif maksimum}
+    return all(relative_half_width(confidence_interval([result[name] for result in results],
+                                                       confidence)) <= target
+               for name, target in targets.items())
+
+
+def run_until_precision(targets, confidence=0.95, batch_size=None, min_replications=10,
+                        max_replications=1000, max_workers=None, config=None):
+    # Sequential stopping: jalankan replikasi per batch paralel sampai half-width
+    # relatif setiap metrik di targets tercapai (atau max_replications habis)
+    max_replications = clamp_replications(config, max_replications)
+    check_replications(config, min(min_replications, max_replications) or 1)
+    max_workers = worker_count(max_workers)
+    if batch_size is None:
+        batch_size = max_workers * 4
+    worker = functools.partial(run_replication, config=config)
+
+    results = []
+    with worker_pool(max_workers) as executor:
+        while len(results) < max_replications:
+            # batch pertama minimal min_replications supaya estimasi variansi stabil
+            size = max(batch_size, min_replications - len(results))
+            replication_ids = range(len(results), min(len(results) + size, max_replications))
+            results.extend(parallel_map(worker, replication_ids, max_workers, executor))
+            if len(results) >= min_replications and targets_met(results, targets, confidence):
+                break
+    return results
+
+
+def print_replication_report(summary, confidence=0.95):
+    num_replications = next(iter(summary.values()))["n"]
+    print("\n------------------- REPLICATION REPORT -------------------\n")
+    print(f"Jumlah Replikasi: {num_replications}")
+    print(f"Interval Kepercayaan: {confidence * 100:.0f}%\n")
+    for name, stats in summary.items():
+        print(f"  {name:<22}: {stats['mean']:10.2f} +/- {stats['half_width']:.2f} "
+              f"[{stats['lower']:.2f}, {stats['upper']:.2f}]")
+    print("\n----------------------------------------------------------")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Replikasi independen simulasi cafetaria")
+    parser.add_argument("-n", "--replications", type=int, default=10)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-c", "--confidence", type=float, default=0.95)
+    add_config_arguments(parser)
+    parser.add_argument("-t", "--target", action="append", default=[], metavar="METRIK=PRESISI",
+                        help="sequential stopping: replikasi sampai half-width relatif metrik "
+                             "<= presisi, misalnya overall_avg_delay=0.05 (boleh diulang)")
+    parser.add_argument("--max-replications", type=int, default=1000)
+    args = parser.parse_args()
+
+    config = config_from_arguments(args)
+    if args.target:
+        targets = {name: float(precision) for name, precision in
+                   (target.split("=") for target in args.target)}
+        results = run_until_precision(targets, args.confidence, min_replications=args.replications,
+                                      max_replications=args.max_replications,
+                                      max_workers=args.workers, config=config)
+    else:
+        results = run_replications(args.replications, args.workers, config=config)
+    summary = summarize_replications(results, args.confidence)
+    print_replication_report(summary, args.confidence)
+    if args.target:
+        status = "tercapai" if targets_met(results, targets, args.confidence) else \
+            "TIDAK tercapai (batas --max-replications)"
+        print(f"\nSequential stopping: {len(results)} replikasi dibutuhkan, target {status}")
+        for name, target in targets.items():
+            print(f"  {name:<22}: half-width relatif "
+                  f"{relative_half_width(summary[name]):.4f} (target {target})")
@@ -0,0 +1,180 @@
+# Lapisan laporan: kelima laporan (report_1..report_5) dihitung sekaligus secara vektor
+# dari tabel akumulator, satu baris per run/replikasi: count, total dan max delay per
+# stasiun, rute dan ukuran grup, rata-rata dan max panjang antrian, jumlah pelanggan.
+# Baris akumulator bisa berasal dari StatisticsCollector + QueueMonitor (backend simpy dan
+# heapq), atau dari kolom per pelanggan (fast_engine, CustomerStore dari banyak replikasi)
+# yang dikelompokkan per replication id dengan bincount dalam satu lintasan.
+# Hasilnya MetricsTable (structured array, satu baris per replikasi) yang juga menghitung
+# confidence interval antar replikasi; mencetak laporan ada di CafetariaSimulation.print_report.
+import functools
+
+import numpy as np
+
+# (prefix metrik, nama stasiun/antrian di StatisticsCollector dan QueueMonitor)
+STATIONS = (("hot_food", "hot-food"), ("sandwich", "sandwich"), ("cashier", "cashier"))
+QUEUES = (("hot_food", "hot-food"), ("sandwich", "sandwich"), ("cashiers", "cashiers"))
+ROUTES = (1, 2, 3)
+# bobot rata-rata keseluruhan = probabilitas ukuran grup (report_4)
+GROUP_WEIGHTS = {1: 0.5, 2: 0.3, 3: 0.1, 4: 0.1}
+DELAY_KEYS = tuple([prefix for prefix, _ in STATIONS] + [f"route_{route}" for route in ROUTES] +
+                   [f"group_{size}" for size in GROUP_WEIGHTS])
+# urutan sama dengan dict metrik generate_report
+METRIC_NAMES = tuple(
+    [f"{prefix}_{kind}_delay" for prefix, _ in STATIONS for kind in ("avg", "max")] +
+    [f"{prefix}_{kind}_queue" for prefix, _ in QUEUES for kind in ("avg", "max")] +
+    [f"route_{route}_{kind}_delay" for route in ROUTES for kind in ("avg", "max")] +
+    ["overall_avg_delay", "system_avg_queue", "total_customers"])
+INTEGER_METRICS = ("hot_food_max_queue", "sandwich_max_queue", "cashiers_max_queue",
+                   "total_customers")
+
+
+@functools.lru_cache(maxsize=None)
+def accumulator_dtype():
+    fields = [("replication", "<i8")]
+    for key in DELAY_KEYS:
+        fields += [(f"{key}_count", "<i8"), (f"{key}_total", "<f8"), (f"{key}_max", "<f8")]
+    for prefix, _ in QUEUES:
+        fields += [(f"{prefix}_avg_queue", "<f8"), (f"{prefix}_max_queue", "<i8")]
+    fields.append(("total_customers", "<i8"))
+    return np.dtype(fields)
+
+
+@functools.lru_cache(maxsize=None)
+def metric_dtype():
+    return np.dtype([("replication", "<i8")] +
+                    [(name, "<i8" if name in INTEGER_METRICS else "<f8") for name in METRIC_NAMES])
+
+
+def run_accumulator(stats, queues, replication=0):
+    # satu baris dari akumulator online satu run (StatisticsCollector, QueueMonitor)
+    row = np.zeros(1, dtype=accumulator_dtype())
+    row["replication"] = replication
+    delays = [(prefix, stats.stations[name]) for prefix, name in STATIONS]
+    delays += [(f"route_{route}", stats.routes[route]) for route in ROUTES]
+    delays += [(f"group_{size}", stats.groups[size]) for size in GROUP_WEIGHTS]
+    for key, stat in delays:
+        row[f"{key}_count"] = stat.count
+        row[f"{key}_total"] = stat.total
+        row[f"{key}_max"] = stat.max or 0.0
+    for prefix, name in QUEUES:
+        row[f"{prefix}_avg_queue"] = queues[name].time_average()
+        row[f"{prefix}_max_queue"] = queues[name].max
+    row["total_customers"] = stats.customers
+    return row
+
+
+def customer_accumulators(replication, route, group_size, food_delay, food_done,
+                          cashier_delay, cashier_done, queue_stats=None):
+    # Baris akumulator per replication id dari kolom per pelanggan (urutan id naik).
+    # food_delay = delay hot-food (rute 1) atau sandwich (rute 2), 0 untuk rute 3;
+    # food_done/cashier_done = sudah selesai mengantri di stasiun tersebut.
+    # queue_stats = {prefix antrian: (rata-rata, max)} dengan satu nilai per replikasi.
+    ids, group = np.unique(replication, return_inverse=True)
+    size = len(ids)
+    rows = np.zeros(size, dtype=accumulator_dtype())
+    rows["replication"] = ids
+    total_delay = food_delay + cashier_delay
+    masks = {"hot_food": ((route == 1) & food_done, food_delay),
+             "sandwich": ((route == 2) & food_done, food_delay),
+             "cashier": (cashier_done, cashier_delay)}
+    for route_id in ROUTES:
+        masks[f"route_{route_id}"] = ((route == route_id) & cashier_done, total_delay)
+    for group_id in GROUP_WEIGHTS:
+        masks[f"group_{group_id}"] = ((group_size == group_id) & cashier_done, total_delay)
+    for key, (mask, values) in masks.items():
+        keys, values = group[mask], values[mask]
+        rows[f"{key}_count"] = np.bincount(keys, minlength=size)
+        rows[f"{key}_total"] = np.bincount(keys, weights=values, minlength=size)
+        largest = np.zeros(size)
+        np.maximum.at(largest, keys, values)
+        rows[f"{key}_max"] = largest
+    for prefix, (average, largest) in (queue_stats or {}).items():
+        rows[f"{prefix}_avg_queue"] = average
+        rows[f"{prefix}_max_queue"] = largest
+    rows["total_customers"] = np.bincount(group, minlength=size)
+    return rows
+
+
+def record_accumulators(records, replication, queue_stats=None):
+    # records = kolom CustomerStore (customer_dtype), boleh gabungan banyak replikasi
+    return customer_accumulators(
+        replication, records["route"], records["group_size"],
+        records["hot_food_time"] + records["sandwich_time"],
+        records["hot_food_finish_queue"] | records["specialty_sandwich_finish_queue"],
+        records["cashier_time"], records["cashier_finish_queue"], queue_stats)
+
+
+def compute_metrics(accumulators):
+    # Kelima laporan untuk semua baris sekaligus. Rata-rata tanpa data = 0.
+    acc = accumulators
+    table = np.zeros(len(acc), dtype=metric_dtype())
+    table["replication"] = acc["replication"]
+    counts = {key: acc[f"{key}_count"] for key in DELAY_KEYS}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        averages = {key: np.where(counts[key] > 0, acc[f"{key}_total"] / counts[key], 0.0)
+                    for key in DELAY_KEYS}
+    for key in [prefix for prefix, _ in STATIONS] + [f"route_{route}" for route in ROUTES]:
+        table[f"{key}_avg_delay"] = averages[key]
+        table[f"{key}_max_delay"] = acc[f"{key}_max"]
+    for prefix, _ in QUEUES:
+        table[f"{prefix}_avg_queue"] = acc[f"{prefix}_avg_queue"]
+        table[f"{prefix}_max_queue"] = acc[f"{prefix}_max_queue"]
+    table["overall_avg_delay"] = sum(weight * averages[f"group_{size}"]
+                                     for size, weight in GROUP_WEIGHTS.items())
+    table["system_avg_queue"] = (acc["hot_food_avg_queue"] + acc["sandwich_avg_queue"] +
+                                 acc["cashiers_avg_queue"]) / 3
+    table["total_customers"] = acc["total_customers"]
+    return MetricsTable(table)
+
+
+# Metrik banyak run sebagai kolom (structured array), satu baris per replikasi
+class MetricsTable:
+    def __init__(self, columns):
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, rows):
+        # dari list dict metrik (misalnya hasil replication.run_replications)
+        names = [name for name in rows[0] if name != "replication"]
+        dtype = [("replication", "<i8")] + [
+            (name, "<i8" if isinstance(rows[0][name], int) else "<f8") for name in names]
+        columns = np.zeros(len(rows), dtype=dtype)
+        columns["replication"] = [row.get("replication", index) for index, row in enumerate(rows)]
+        for name in names:
+            columns[name] = [row[name] for row in rows]
+        return cls(columns)
+
+    @property
+    def names(self):
+        return self.columns.dtype.names[1:]
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def row(self, index):
+        # dict metrik satu replikasi (nilai Python biasa), sama dengan generate_report
+        record = self.columns[index]
+        return {name: record[name].item() for name in self.names}
+
+    def rows(self):
+        return [self.row(index) for index in range(len(self))]
+
+    def summary(self, confidence=0.95, names=None):
+        # confidence interval t setiap metrik antar replikasi (format replication.confidence_interval)
+        import replication
+        names = list(names or self.names)
+        values = np.column_stack([self.columns[name].astype(float) for name in names])
+        n = len(values)
+        mean = values.mean(axis=0)
+        if n < 2:
+            return {name: {"mean": float(m), "std": 0.0, "half_width": np.inf,
+                           "lower": -np.inf, "upper": np.inf, "n": n}
+                    for name, m in zip(names, mean)}
+        std = values.std(axis=0, ddof=1)
+        half_width = replication.t_quantile(0.5 + confidence / 2.0, n - 1) * std / np.sqrt(n)
+        return {name: {"mean": float(m), "std": float(s), "half_width": float(h),
+                       "lower": float(m - h), "upper": float(m + h), "n": n}
+                for name, m, s, h in zip(names, mean, std, half_width)}
@@ -0,0 +1,159 @@
+# Cache hasil simulasi di disk, dialamatkan oleh hash konten:
+# key = sha256(jenis entri, config yang memengaruhi hasil, jumlah replikasi, MODEL_VERSION).
+# Jenis entri ("run" = dict metrik satu run, "replications" = list metrik per replikasi)
+# ikut di key supaya cached_run dan cached_replications(1) tidak berbagi entri.
+# Nilai config dinormalisasi dulu (angka -> float, list -> tuple), jadi config yang sama
+# (SimulationConfig() == SimulationConfig(simulation_duration=5400.0)) selalu mendapat key
+# yang sama, baik dari CLI (float), JSON (list) maupun default (int).
+# Setiap entri berupa <key>.json (metrik per replikasi) dan opsional <key>.trace.
+# Penulisan lewat file sementara + os.replace, jadi penulis paralel (process pool)
+# tidak pernah meninggalkan entri setengah jadi. Ukuran cache dibatasi dengan
+# eviction LRU berdasarkan mtime (diperbarui setiap hit).
+import os
+import json
+import numbers
+import hashlib
+import tempfile
+import dataclasses
+
+import CafetariaSimulation as cafe
+import replication
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cafetaria-simulation")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# field config yang tidak memengaruhi metrik, tidak ikut di key. backend juga tidak:
+# simpy, heapq dan fast_engine menghasilkan metrik identik (tests/test_engines.py),
+# jadi hasil satu backend boleh dipakai backend lain.
+NON_RESULT_FIELDS = ("log_mode", "trace_path", "print_report", "stat_quantiles", "queue_history",
+                     "profile", "backend")
+
+
+def canonical(value):
+    # angka (kecuali bool) -> float dan list/tuple -> tuple, rekursif
+    if isinstance(value, bool) or not isinstance(value, (numbers.Real, list, tuple)):
+        return value
+    if isinstance(value, numbers.Real):
+        return float(value)
+    return tuple(canonical(item) for item in value)
+
+
+def cache_key(config, num_replications=1, version=cafe.MODEL_VERSION, kind="run"):
+    fields = {field.name: canonical(getattr(config, field.name))
+              for field in dataclasses.fields(config) if field.name not in NON_RESULT_FIELDS}
+    payload = json.dumps({"kind": kind, "config": fields, "replications": num_replications,
+                          "version": version}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key, suffix=".json"):
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key):
+        # None jika tidak ada (atau baru saja di-evict oleh proses lain)
+        path = self.path(key)
+        try:
+            with open(path) as file:
+                value = json.load(file)
+            os.utime(path)  # tandai baru dipakai untuk LRU
+        except FileNotFoundError:
+            return None
+        return value
+
+    def trace_path(self, key):
+        path = self.path(key, ".trace")
+        return path if os.path.exists(path) else None
+
+    def put(self, key, value, trace=None):
+        # trace = path file trace yang dipindahkan ke cache (opsional), ditulis lebih dulu
+        # supaya entri .json yang terlihat selalu lengkap
+        if trace is not None:
+            os.replace(trace, self.path(key, ".trace"))
+        self._write_atomic(self.path(key), json.dumps(value).encode())
+        self.evict()
+
+    def _write_atomic(self, path, data):
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def entries(self):
+        # (mtime, ukuran total, key) untuk setiap entri .json
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            try:
+                stat = os.stat(self.path(key))
+                size = stat.st_size
+                if os.path.exists(self.path(key, ".trace")):
+                    size += os.path.getsize(self.path(key, ".trace"))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, size, key))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        # hapus entri yang paling lama tidak dipakai sampai total <= max_bytes
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            for suffix in (".json", ".trace"):
+                try:
+                    os.unlink(self.path(key, suffix))
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+
+def cached_replications(num_replications, config=None, cache=None, max_workers=None):
+    # Metrik per replikasi dari cache; jika miss, jalankan replikasi lalu simpan
+    if config is None:
+        config = cafe.SimulationConfig()
+    if cache is None:
+        cache = ResultCache()
+    key = cache_key(config, num_replications, kind="replications")
+    results = cache.get(key)
+    if results is None:
+        results = replication.run_replications(num_replications, max_workers, config=config)
+        cache.put(key, results)
+    return results
+
+
+def cached_run(config=None, cache=None, with_trace=False):
+    # Satu run (metrik generate_report). with_trace=True ikut menyimpan trace biner;
+    # kembalikan (metrics, path trace atau None)
+    if config is None:
+        config = cafe.SimulationConfig()
+    if cache is None:
+        cache = ResultCache()
+    key = cache_key(config)
+    metrics = cache.get(key)
+    if metrics is not None and (not with_trace or cache.trace_path(key)):
+        return metrics, cache.trace_path(key)
+
+    trace = None
+    run_config = config.replace(log_mode="null", print_report=False)
+    if with_trace:
+        descriptor, trace = tempfile.mkstemp(dir=cache.directory, suffix=".tmp")
+        os.close(descriptor)
+        run_config = run_config.replace(log_mode="trace", trace_path=trace)
+    metrics = cafe.run(run_config).metrics
+    cache.put(key, metrics, trace)
+    return metrics, cache.trace_path(key)
@@ -0,0 +1,258 @@
+# Analisis sensitivitas: turunan metrik delay (report_1, report_3, report_4) terhadap
+# batas waktu layanan hot-food dan sandwich (config.hot_food_service/sandwich_service)
+# dan rata-rata waktu antar kedatangan, diestimasi dari run yang sama.
+# - IPA (infinitesimal perturbation analysis) di lintasan sampel fast_engine: waktu
+#   layanan S = (a + (b - a) U) / k, jadi dS/da = (1 - U) / k dan dS/db = U / k, dan waktu
+#   kedatangan t(theta) = theta * jumlah Exp(1), jadi dt/dtheta = t / theta. Turunan waktu
+#   mulai layanan mengikuti busy period server FIFO; kelima gradien dari satu lintasan.
+#   Hanya untuk hot-food dan sandwich (IPA_METRICS): di kasir pelanggan saling mendahului
+#   (waktu drinks berbeda) dan JSQ bisa pindah kasir, jadi delay per pelanggan, per rute
+#   dan per ukuran grup melompat dan turunan lintasan bias terhadap turunan harapan.
+# - LR (likelihood ratio, score function) untuk rata-rata kedatangan, semua metrik: score
+#   proses Poisson di [0, T] = (Lambda(T) - N(T)) / theta; estimatornya kovarians metrik
+#   dan score antar replikasi. Batas uniform mengubah support, jadi LR tidak dipakai di sana.
+# - Finite difference sentral dengan common random numbers untuk semua metrik (terutama
+#   kasir, rute dan overall): run +h dan -h per parameter dan replikasi memakai seed yang
+#   sama, dijalankan paralel bersama job IPA di satu process pool.
+import numpy as np
+
+import CafetariaSimulation as cafe
+import replication
+import sweep
+import fast_engine
+import arrivals
+
+PARAMETERS = ("hot_food_low", "hot_food_high", "sandwich_low", "sandwich_high", "arrival_mean")
+METRICS = ("hot_food_avg_delay", "hot_food_max_delay", "sandwich_avg_delay",
+           "sandwich_max_delay", "cashier_avg_delay", "cashier_max_delay",
+           "route_1_avg_delay", "route_1_max_delay", "route_2_avg_delay", "route_2_max_delay",
+           "route_3_avg_delay", "route_3_max_delay", "overall_avg_delay")
+# nama singkat untuk what-if: perubahan relatif yang sama pada kedua batas layanan,
+# arrival_rate = perubahan relatif laju kedatangan (rata-rata interval = 1 / laju)
+IPA_METRICS = ("hot_food_avg_delay", "hot_food_max_delay", "sandwich_avg_delay",
+               "sandwich_max_delay")
+ALIASES = {"hot_food": ("hot_food_low", "hot_food_high"),
+           "sandwich": ("sandwich_low", "sandwich_high")}
+RELATIVE_STEP = 0.05
+
+
+def parameter_values(config):
+    return {"hot_food_low": config.hot_food_service[0],
+            "hot_food_high": config.hot_food_service[1],
+            "sandwich_low": config.sandwich_service[0],
+            "sandwich_high": config.sandwich_service[1],
+            "arrival_mean": config.interval_customer_arrival}
+
+
+def with_parameters(config, **values):
+    # config dengan sebagian parameter PARAMETERS diganti
+    current = parameter_values(config)
+    current.update(values)
+    return config.replace(
+        hot_food_service=(current["hot_food_low"], current["hot_food_high"]),
+        sandwich_service=(current["sandwich_low"], current["sandwich_high"]),
+        interval_customer_arrival=current["arrival_mean"])
+
+
+def busy_period_derivative(arrival, start, d_arrival, d_service):
+    # Turunan waktu mulai layanan satu server FIFO (pelanggan urut kedatangan).
+    # Dalam satu busy period mulai = kedatangan pelanggan pertama + jumlah layanan
+    # sebelumnya; pelanggan yang langsung dilayani (mulai == datang) membuka busy period baru.
+    if not len(arrival):
+        return d_arrival.copy()
+    opens = start <= arrival
+    opens[0] = True
+    period = np.cumsum(opens) - 1
+    first = np.flatnonzero(opens)
+    before = np.cumsum(d_service, axis=0) - d_service
+    return d_arrival[first][period] + before - before[first][period]
+
+
+def ipa_run(config):
+    # (metrik, {metrik IPA_METRICS: gradien per PARAMETERS}, score LR rata-rata kedatangan)
+    path = fast_engine.sample_path(config)
+    n = len(path.arrival)
+    theta = config.interval_customer_arrival
+    d_arrival = np.zeros((n, len(PARAMETERS)))
+    arrival_index = PARAMETERS.index("arrival_mean")
+    if config.arrival_profile:
+        # t = Lambda^-1(E) dengan Lambda sebanding 1/theta: dt/dtheta = Lambda(t) / (theta lambda(t))
+        profile = arrivals.RateProfile(config.arrival_profile, theta)
+        d_arrival[:, arrival_index] = (profile.cumulative_rate(path.arrival) /
+                                       (theta * profile.rate(path.arrival)))
+    else:
+        d_arrival[:, arrival_index] = path.arrival / theta
+
+    gradient = {}
+    zero = np.zeros(len(PARAMETERS))
+    for prefix, route_id, stream, employees, low in (
+            ("hot_food", 1, "st_hot_food", config.num_hot_food_employee, 0),
+            ("sandwich", 2, "st_sandwich", config.num_sandwich_employee, 2)):
+        mask = path.route == route_id
+        u = path.streams.u_array(stream, path.customer_id[mask])
+        d_service = np.zeros((len(u), len(PARAMETERS)))
+        d_service[:, low] = (1.0 - u) / employees
+        d_service[:, low + 1] = u / employees
+        d_delay = busy_period_derivative(path.arrival[mask], path.food_start[mask],
+                                         d_arrival[mask], d_service) - d_arrival[mask]
+        counted = path.food_started[mask]
+        d_delay, delay = d_delay[counted], path.food_delay[mask][counted]
+        gradient[f"{prefix}_avg_delay"] = d_delay.mean(axis=0) if len(delay) else zero
+        # turunan max = turunan pelanggan yang mencapai max
+        gradient[f"{prefix}_max_delay"] = d_delay[np.argmax(delay)] if len(delay) else zero
+
+    # grup setelah grup pertama = jumlah waktu kedatangan berbeda setelah t=0
+    groups = np.count_nonzero(np.diff(path.arrival) > 0)
+    score = (arrivals.expected_groups(config) - groups) / theta
+    return fast_engine.build_metrics(path), gradient, score
+
+
+def run_job(job):
+    # ("ipa", config, replication_id) atau ("fd", (parameter, arah), config, replication_id, engine)
+    if job[0] == "ipa":
+        _, config, replication_id = job
+        metrics, gradient, score = ipa_run(replication.replication_config(config, replication_id))
+        return metrics, {name: values.tolist() for name, values in gradient.items()}, score
+    _, label, config, replication_id, engine = job
+    return sweep.run_job((label, config, replication_id, engine))
+
+
+def estimate_sensitivity(config=None, num_replications=10, finite_differences=True,
+                         relative_step=RELATIVE_STEP, engine="simpy", max_workers=None,
+                         confidence=0.95):
+    # Gradien IPA (IPA_METRICS) dan LR (rata-rata kedatangan) dari num_replications run,
+    # dan finite difference CRN dengan langkah relative_step * nilai parameter.
+    # Hasil: confidence interval per metrik per parameter.
+    if config is None:
+        config = cafe.SimulationConfig()
+    config = config.replace(log_mode="null", print_report=False)
+    replication.check_replications(config, num_replications)
+    values = parameter_values(config)
+    jobs = [("ipa", config, replication_id) for replication_id in range(num_replications)]
+    if finite_differences:
+        jobs += [("fd", (name, direction),
+                  with_parameters(config, **{name: values[name] * (1 + direction * relative_step)}),
+                  replication_id, engine)
+                 for name in PARAMETERS for direction in (1, -1)
+                 for replication_id in range(num_replications)]
+
+    outputs = replication.parallel_map(run_job, jobs, max_workers)
+
+    ipa_outputs = outputs[:num_replications]
+    metrics = [metrics for metrics, _, _ in ipa_outputs]
+    scores = np.array([score for _, _, score in ipa_outputs])
+    summary = {"parameters": values,
+               "metrics": {name: float(np.mean([row[name] for row in metrics]))
+                           for name in METRICS},
+               "ipa": {}, "lr": {}, "fd": None}
+    for name in IPA_METRICS:
+        gradients = np.array([gradient[name] for _, gradient, _ in ipa_outputs])
+        summary["ipa"][name] = {parameter: replication.confidence_interval(
+            gradients[:, index].tolist(), confidence) for index, parameter in enumerate(PARAMETERS)}
+    for name in METRICS:
+        # kovarians sampel metrik dan score (E[score] = 0)
+        observed = np.array([row[name] for row in metrics])
+        lr = (observed - observed.mean()) * scores * num_replications / max(num_replications - 1, 1)
+        summary["lr"][name] = {"arrival_mean": replication.confidence_interval(lr.tolist(),
+                                                                              confidence)}
+
+    if finite_differences:
+        rows = {}
+        for job, row in zip(jobs[num_replications:], outputs[num_replications:]):
+            rows[job[1], job[3]] = row
+        summary["fd"] = {}
+        for name in METRICS:
+            summary["fd"][name] = {}
+            for parameter in PARAMETERS:
+                step = 2 * relative_step * values[parameter]
+                differences = [(rows[(parameter, 1), r][name] - rows[(parameter, -1), r][name]) / step
+                               for r in range(num_replications)]
+                summary["fd"][name][parameter] = replication.confidence_interval(differences,
+                                                                                 confidence)
+    return summary
+
+
+def gradient_source(summary, metric):
+    # IPA jika tersedia, selain itu finite difference (None jika tidak dijalankan)
+    if metric in summary["ipa"]:
+        return summary["ipa"][metric]
+    return summary["fd"][metric] if summary["fd"] is not None else None
+
+
+def predict_change(summary, changes):
+    # Perubahan metrik orde pertama untuk perubahan relatif parameter, misalnya
+    # {"sandwich": -0.10} (sandwich 10% lebih cepat) atau {"arrival_rate": 0.05}.
+    # Metrik tanpa gradien (tanpa finite difference) tidak ikut.
+    relative = {}
+    for name, change in changes.items():
+        if name == "arrival_rate":
+            relative["arrival_mean"] = 1.0 / (1.0 + change) - 1.0
+        else:
+            for parameter in ALIASES.get(name, (name,)):
+                relative[parameter] = change
+    unknown = set(relative) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Parameter tidak dikenal: {', '.join(sorted(unknown))}")
+    predictions = {}
+    for metric in METRICS:
+        gradient = gradient_source(summary, metric)
+        if gradient is not None:
+            predictions[metric] = sum(gradient[parameter]["mean"] * summary["parameters"][parameter]
+                                      * change for parameter, change in relative.items())
+    return predictions
+
+
+def print_sensitivity_report(summary, changes=None):
+    print("\n------------------- SENSITIVITY REPORT -------------------\n")
+    print("Parameter: " + ", ".join(f"{name}={value:g}"
+                                    for name, value in summary["parameters"].items()))
+    for metric in METRICS:
+        print(f"\n{metric} (rata-rata {summary['metrics'][metric]:.2f} Detik)")
+        for parameter in PARAMETERS:
+            line = ""
+            if metric in summary["ipa"]:
+                ipa = summary["ipa"][metric][parameter]
+                line += f"  IPA {ipa['mean']:9.3f} +/- {ipa['half_width']:.3f}"
+            if parameter == "arrival_mean":
+                lr = summary["lr"][metric][parameter]
+                line += f"  LR {lr['mean']:9.3f} +/- {lr['half_width']:.3f}"
+            if summary["fd"] is not None:
+                fd = summary["fd"][metric][parameter]
+                line += f"  FD {fd['mean']:9.3f} +/- {fd['half_width']:.3f}"
+            if line:
+                print(f"  d/d {parameter:<13}:{line}")
+    if changes:
+        print("\nPerkiraan perubahan (orde pertama, IPA/FD) untuk "
+              + ", ".join(f"{name} {change:+.0%}" for name, change in changes.items()) + ":")
+        for metric, change in predict_change(summary, changes).items():
+            print(f"  {metric:<20}: {change:+9.2f} Detik")
+    print("\n----------------------------------------------------------")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    def change(text):
+        name, _, value = text.partition("=")
+        return name, float(value)
+
+    parser = argparse.ArgumentParser(
+        description="Turunan metrik delay terhadap waktu layanan dan kedatangan (IPA/LR/FD)")
+    parser.add_argument("-n", "--replications", type=int, default=10)
+    parser.add_argument("--no-fd", action="store_true",
+                        help="tanpa finite difference (hanya IPA hot-food/sandwich dan LR)")
+    parser.add_argument("--step", type=float, default=RELATIVE_STEP,
+                        help="langkah relatif finite difference")
+    parser.add_argument("--engine", choices=["simpy", "fast"], default="simpy",
+                        help="engine untuk run finite difference")
+    parser.add_argument("--what-if", type=change, action="append", default=[],
+                        metavar="PARAMETER=PERUBAHAN",
+                        help="contoh sandwich=-0.1 atau arrival_rate=0.05")
+    replication.add_config_arguments(parser)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    config = replication.config_from_arguments(args)
+    summary = estimate_sensitivity(config, args.replications, not args.no_fd, args.step, args.engine,
+                                   args.workers)
+    print_sensitivity_report(summary, dict(args.what_if))
@@ -0,0 +1,354 @@
+# Layanan simulasi lokal untuk UI perencanaan: server asyncio (HTTP/1.1 di TCP localhost
+# atau Unix socket) dengan pool worker process yang tetap hangat, jadi setiap request
+# tidak lagi membayar start Python, import simpy/numpy dan pembuatan process.
+#   POST /simulate  body {"config": {field SimulationConfig}, "replications": n,
+#                         "first_replication": 0, "confidence": 0.95}
+#     -> NDJSON (chunked), satu baris {"replication": i, "metrics": {...}} per replikasi
+#        begitu selesai, lalu {"summary": {...}} (confidence interval setiap metrik)
+#   GET /status     -> jumlah worker, job antri/berjalan, request yang ditolak
+# Satu job = satu replikasi, dikenali dengan cache_key config replikasinya. Request dengan
+# skenario yang sama atau rentang replikasi yang tumpang tindih menunggu job yang sama,
+# dan hasil yang baru selesai disimpan di LRU kecil di memori.
+# Backpressure: job baru masuk antrian berkapasitas max_queue dan hanya max_workers job
+# yang dikirim ke pool. Request yang job barunya tidak muat ditolak seluruhnya dengan
+# 503 + Retry-After, bukan ditahan tanpa batas.
+import json
+import asyncio
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+import CafetariaSimulation as cafe
+import replication
+import result_cache
+import multisite
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_QUEUE = 256
+MAX_REPLICATIONS = 1000
+# jumlah hasil replikasi yang disimpan di memori untuk request berikutnya
+RESULT_MEMORY = 4096
+# field yang diatur oleh layanan, tidak boleh dari request
+SERVICE_FIELDS = ("log_mode", "trace_path", "print_report", "profile")
+RETRY_AFTER = 1
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+class ServiceBusy(Exception):
+    # antrian job penuh, coba lagi setelah retry_after detik
+    def __init__(self, retry_after=RETRY_AFTER):
+        super().__init__(f"antrian penuh, coba lagi dalam {retry_after} detik")
+        self.retry_after = retry_after
+
+
+def run_job(config):
+    # dijalankan di worker: config sudah berupa config replikasi
+    return cafe.run(config).metrics
+
+
+def scenario_config(fields, config=None):
+    # SimulationConfig dari field JSON request, ValueError untuk field/nilai yang tidak valid
+    if config is None:
+        config = cafe.SimulationConfig()
+    unknown = sorted(name for name in fields
+                     if name not in multisite.CONFIG_FIELDS or name in SERVICE_FIELDS)
+    if unknown:
+        raise ValueError(f"field config tidak dikenal: {', '.join(unknown)}")
+    try:
+        # konversi yang sama dengan katalog multisite: list JSON atau string "50,120"
+        changes = {name: multisite.convert_field(name, value) for name, value in fields.items()}
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"nilai config tidak valid: {error}") from None
+    config = config.replace(log_mode="null", print_report=False, **changes)
+    if config.backend not in ("simpy", "heapq"):
+        raise ValueError(f"backend tidak dikenal: {config.backend}")
+    if config.cashier_policy not in cafe.CashierBank.POLICIES:
+        raise ValueError(f"cashier_policy tidak dikenal: {config.cashier_policy}")
+    if config.arrival_profile:
+        import arrivals
+        arrivals.RateProfile(config.arrival_profile, config.interval_customer_arrival)
+    return config
+
+
+class SimulationService:
+    def __init__(self, max_workers=None, max_queue=MAX_QUEUE, max_replications=MAX_REPLICATIONS,
+                 result_memory=RESULT_MEMORY):
+        self.max_workers = replication.worker_count(max_workers or None)
+        self.max_queue = max_queue
+        self.max_replications = max_replications
+        self.result_memory = result_memory
+        self.executor = None
+        self.queue = None  # (key, config) job yang belum dikirim ke pool
+        self.jobs = {}  # key -> asyncio.Future, job yang antri atau berjalan
+        self.results = collections.OrderedDict()  # key -> metrics, LRU
+        self.counters = collections.Counter()
+        self.dispatchers = []
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        # path = Unix socket, selain itu TCP host:port (port 0 = port bebas)
+        loop = asyncio.get_running_loop()
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                            initializer=multisite.warm_worker)
+        # buat semua worker sekarang, bukan saat request pertama
+        await asyncio.gather(*(loop.run_in_executor(self.executor, multisite.warm_worker)
+                               for _ in range(self.max_workers)))
+        self.queue = asyncio.Queue(self.max_queue)
+        self.dispatchers = [asyncio.create_task(self._dispatch())
+                            for _ in range(self.max_workers)]
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server
+
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self.dispatchers:
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        for future in self.jobs.values():
+            future.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    # Satu dispatcher per worker: paling banyak max_workers job ada di pool,
+    # sisanya menunggu di antrian yang terlihat di /status
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            key, config = await self.queue.get()
+            future = self.jobs[key]
+            try:
+                metrics = await loop.run_in_executor(self.executor, run_job, config)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as error:
+                self.counters["jobs_failed"] += 1
+                future.set_exception(error)
+            else:
+                self.results[key] = metrics
+                if len(self.results) > self.result_memory:
+                    self.results.popitem(last=False)
+                self.counters["jobs_run"] += 1
+                future.set_result(metrics)
+            finally:
+                del self.jobs[key]
+                self.queue.task_done()
+
+    def submit(self, config, replication_ids):
+        # [(replication_id, future)], job yang sudah ada dipakai bersama.
+        # ServiceBusy jika job baru tidak muat di antrian (tidak ada yang dimasukkan).
+        loop = asyncio.get_running_loop()
+        futures, new = [], {}
+        for replication_id in replication_ids:
+            job_config = replication.replication_config(config, replication_id)
+            key = result_cache.cache_key(job_config)
+            if key in self.results:
+                self.results.move_to_end(key)
+                future = loop.create_future()
+                future.set_result(self.results[key])
+                self.counters["jobs_remembered"] += 1
+            elif key in self.jobs:
+                future = self.jobs[key]
+                self.counters["jobs_shared"] += 1
+            else:
+                if key not in new:
+                    new[key] = (loop.create_future(), job_config)
+                future = new[key][0]
+            futures.append((replication_id, future))
+        if len(new) > self.max_queue - self.queue.qsize():
+            self.counters["rejected"] += 1
+            raise ServiceBusy()
+        for key, (future, job_config) in new.items():
+            self.jobs[key] = future
+            self.queue.put_nowait((key, job_config))
+        return futures
+
+    def stream(self, config, replication_ids):
+        # (replication_id, metrics atau exception) sesuai urutan selesai
+        return completed(self.submit(config, replication_ids))
+
+    def status(self):
+        queued = self.queue.qsize() if self.queue is not None else 0
+        return {"workers": self.max_workers, "max_queue": self.max_queue,
+                "queued": queued, "running": len(self.jobs) - queued,
+                "remembered": len(self.results), **self.counters}
+
+    # HTTP/1.1 minimal, satu request per koneksi
+    async def _handle(self, reader, writer):
+        try:
+            method, target, headers, body = await read_request(reader)
+            if method == "GET" and target == "/status":
+                await send_json(writer, 200, self.status())
+            elif method == "POST" and target == "/simulate":
+                await self._simulate(writer, body)
+            else:
+                await send_json(writer, 404, {"error": f"{method} {target} tidak dikenal"})
+        except ValueError as error:
+            await send_json(writer, 400, {"error": str(error)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _simulate(self, writer, body):
+        self.counters["requests"] += 1
+        try:
+            request = json.loads(body or b"{}")
+            config = scenario_config(request.get("config", {}))
+            first = int(request.get("first_replication", 0))
+            count = int(request.get("replications", 1))
+            confidence = float(request.get("confidence", 0.95))
+        except (TypeError, AttributeError, json.JSONDecodeError) as error:
+            raise ValueError(f"request tidak valid: {error}") from None
+        if not 1 <= count <= self.max_replications:
+            raise ValueError(f"replications harus 1..{self.max_replications}")
+        if first < 0 or not 0 < confidence < 1:
+            raise ValueError("first_replication harus >= 0 dan confidence di (0, 1)")
+
+        try:
+            futures = self.submit(config, range(first, first + count))
+        except ServiceBusy as busy:
+            await send_json(writer, 503, {"error": str(busy), **self.status()},
+                            {"Retry-After": str(busy.retry_after)})
+            return
+
+        writer.write(response_head(200, {"Content-Type": "application/x-ndjson",
+                                         "Transfer-Encoding": "chunked"}))
+        finished = []
+        async for replication_id, result in completed(futures):
+            if isinstance(result, BaseException):
+                line = {"replication": replication_id, "error": repr(result)}
+            else:
+                metrics = dict(result, replication=replication_id)
+                finished.append(metrics)
+                line = {"replication": replication_id, "metrics": metrics}
+            await write_chunk(writer, line)
+        summary = replication.summarize_replications(finished, confidence) if finished else {}
+        await write_chunk(writer, {"summary": summary, "replications": len(finished),
+                                   "failed": count - len(finished)})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def completed(futures):
+    # futures = [(replication_id, future)] dari submit, hasil diambil sesuai urutan selesai.
+    # Lewat callback, bukan await langsung: klien yang putus tidak membatalkan job bersama.
+    done = asyncio.Queue()
+    for replication_id, future in futures:
+        future.add_done_callback(lambda future, replication_id=replication_id:
+                                 done.put_nowait((replication_id, future)))
+    for _ in futures:
+        replication_id, future = await done.get()
+        if future.cancelled():
+            yield replication_id, asyncio.CancelledError("layanan dihentikan")
+        elif future.exception() is not None:
+            yield replication_id, future.exception()
+        else:
+            yield replication_id, future.result()
+
+
+async def read_request(reader):
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise ValueError("request line tidak valid")
+    method, target, _ = request_line
+    headers = await read_headers(reader)
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return method, target, headers, body
+
+
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            return headers
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+def response_head(status, headers=None):
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send_json(writer, status, value, headers=None):
+    body = json.dumps(value).encode()
+    writer.write(response_head(status, {"Content-Type": "application/json",
+                                        "Content-Length": len(body), **(headers or {})}))
+    writer.write(body)
+    await writer.drain()
+
+
+async def write_chunk(writer, value):
+    # satu baris NDJSON sebagai satu chunk; drain = klien lambat menahan penulisan
+    data = json.dumps(value).encode() + b"\n"
+    writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+    await writer.drain()
+
+
+async def request_simulation(payload, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+    # Klien untuk skrip dan test di localhost: async generator baris NDJSON dari
+    # POST /simulate. ServiceBusy untuk 503, ValueError untuk request yang ditolak.
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        body = json.dumps(payload).encode()
+        writer.write(f"POST /simulate HTTP/1.1\r\nHost: {host}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                     .encode("latin-1") + body)
+        await writer.drain()
+        status = int((await reader.readline()).decode("latin-1").split()[1])
+        headers = await read_headers(reader)
+        if status != 200:
+            error = json.loads(await reader.read()).get("error")
+            if status == 503:
+                raise ServiceBusy(int(headers.get("retry-after", RETRY_AFTER)))
+            raise ValueError(error)
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            if size == 0:
+                return
+            yield json.loads((await reader.readexactly(size + 2))[:-2])
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Layanan simulasi lokal (HTTP, NDJSON)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, metavar="PATH",
+                        help="dengarkan di Unix socket, bukan TCP")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--max-queue", type=int, default=MAX_QUEUE,
+                        help="jumlah job maksimum yang antri sebelum request ditolak (503)")
+    args = parser.parse_args()
+
+    async def serve():
+        service = SimulationService(args.workers, args.max_queue)
+        server = await service.start(args.host, args.port, args.unix)
+        print(f"Layanan simulasi di {args.unix or service.address()} "
+              f"({service.max_workers} worker)", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,147 @@
+# Mode steady-state: satu run yang sangat panjang, periode warm-up dibuang otomatis
+# dengan MSER-5, lalu interval kepercayaan dari batch means yang tidak tumpang tindih.
+# Delay per pelanggan diproses secara streaming ke bucket berukuran tetap, jadi
+# memori tetap kecil walaupun jumlah pelanggan jutaan.
+import math
+
+import CafetariaSimulation as cafe
+import replication
+
+# ukuran batch MSER-5
+MSER_BATCH = 5
+# jumlah bucket maksimum per seri; jika penuh, pasangan bucket digabung
+MAX_BUCKETS = 4096
+# jumlah batch untuk interval kepercayaan
+NUM_BATCHES = 20
+
+
+# Rata-rata bucket dari satu seri delay. Bucket awalnya berisi MSER_BATCH pelanggan,
+# ukurannya digandakan setiap kali jumlah bucket mencapai max_buckets.
+class StreamingBatchMeans:
+    def __init__(self, bucket_size=MSER_BATCH, max_buckets=MAX_BUCKETS):
+        self.bucket_size = bucket_size
+        self.max_buckets = max_buckets - max_buckets % 2
+        self.buckets = []
+        self.count = 0
+        self.partial_sum = 0.0
+        self.partial_count = 0
+
+    def add(self, x):
+        self.count += 1
+        self.partial_sum += x
+        self.partial_count += 1
+        if self.partial_count == self.bucket_size:
+            self.buckets.append(self.partial_sum / self.bucket_size)
+            self.partial_sum = 0.0
+            self.partial_count = 0
+            if len(self.buckets) == self.max_buckets:
+                buckets = self.buckets
+                self.buckets = [(a + b) / 2 for a, b in zip(buckets[::2], buckets[1::2])]
+                self.bucket_size *= 2
+
+
+def mser_truncation(means):
+    # Titik potong d yang meminimalkan MSER(d) = sum_{i>=d} (Y_i - Ybar_d)^2 / (n-d)^2,
+    # hanya dicari di paruh pertama seri
+    n = len(means)
+    if n < 2:
+        return 0
+    best_d, best = 0, math.inf
+    suffix_sum = 0.0
+    suffix_squares = 0.0
+    mser = [0.0] * n
+    for i in range(n - 1, -1, -1):
+        suffix_sum += means[i]
+        suffix_squares += means[i] * means[i]
+        remaining = n - i
+        mser[i] = (suffix_squares - suffix_sum * suffix_sum / remaining) / remaining ** 2
+    for d in range(n // 2 + 1):
+        if mser[d] < best:
+            best_d, best = d, mser[d]
+    return best_d
+
+
+def batch_means_interval(series, num_batches=NUM_BATCHES, confidence=0.95):
+    # Buang warm-up, lalu kelompokkan bucket sisa menjadi num_batches batch sama besar
+    buckets = series.buckets
+    truncation = mser_truncation(buckets)
+    remaining = len(buckets) - truncation
+    num_batches = min(num_batches, remaining)
+    if num_batches == 0:
+        return None
+    per_batch = remaining // num_batches
+    # sisa bucket yang tidak genap ikut dibuang di awal
+    first = len(buckets) - per_batch * num_batches
+    batches = [sum(buckets[first + b * per_batch:first + (b + 1) * per_batch]) / per_batch
+               for b in range(num_batches)]
+    interval = replication.confidence_interval(batches, confidence)
+    interval.update(warmup_customers=first * series.bucket_size,
+                    batch_customers=per_batch * series.bucket_size,
+                    num_batches=num_batches,
+                    customers=series.count,
+                    # potongan di ujung paruh pertama: warm-up tidak selesai, sistem mungkin tidak stabil
+                    truncated_at_limit=truncation >= len(buckets) // 2)
+    return interval
+
+
+# StatisticsCollector yang juga menyimpan seri delay per stasiun dan per rute
+class SteadyStateCollector(cafe.StatisticsCollector):
+    def __init__(self, max_buckets=MAX_BUCKETS, quantiles=()):
+        super().__init__(quantiles=quantiles)
+        names = ["hot-food", "sandwich", "cashier", "route-1", "route-2", "route-3"]
+        self.series = {name: StreamingBatchMeans(max_buckets=max_buckets) for name in names}
+
+    def record_station(self, station_name, delay):
+        super().record_station(station_name, delay)
+        self.series[station_name].add(delay)
+
+    def record_total(self, customer, total_delay):
+        super().record_total(customer, total_delay)
+        self.series[f"route-{customer.route}"].add(total_delay)
+
+
+def run_steady_state(config=None, num_batches=NUM_BATCHES, confidence=0.95,
+                     max_buckets=MAX_BUCKETS):
+    # Satu run panjang tanpa log dan laporan, kembalikan interval per seri
+    if config is None:
+        config = cafe.SimulationConfig()
+    collector = SteadyStateCollector(max_buckets)
+    cafe.run(config.replace(log_mode="null", print_report=False, stat_quantiles=()),
+             stats=collector)
+    return {name: batch_means_interval(series, num_batches, confidence)
+            for name, series in collector.series.items()}
+
+
+def print_steady_state_report(summary, confidence=0.95):
+    print("\n------------------- STEADY-STATE REPORT -------------------\n")
+    print(f"Batch means, warm-up dibuang dengan MSER-5, interval kepercayaan {confidence * 100:.0f}%\n")
+    for name, interval in summary.items():
+        if interval is None:
+            print(f"  {name:<10}: data tidak cukup")
+            continue
+        print(f"  {name:<10}: {interval['mean']:10.2f} +/- {interval['half_width']:.2f} Detik  "
+              f"(warm-up {interval['warmup_customers']} dari {interval['customers']} pelanggan, "
+              f"{interval['num_batches']} batch x {interval['batch_customers']})"
+              f"{'  PERINGATAN: warm-up tidak selesai' if interval['truncated_at_limit'] else ''}")
+    print("\n-----------------------------------------------------------")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Steady-state batch means dari satu run panjang")
+    parser.add_argument("--days", type=float, default=365,
+                        help="panjang run dalam hari simulasi (1 hari = SIMULATION_DURATION)")
+    replication.add_config_arguments(parser, duration=False)
+    parser.add_argument("--seed-offset", type=int, default=0)
+    parser.add_argument("--backend", choices=["simpy", "heapq"], default="heapq")
+    parser.add_argument("-b", "--batches", type=int, default=NUM_BATCHES)
+    parser.add_argument("-c", "--confidence", type=float, default=0.95)
+    args = parser.parse_args()
+
+    config = replication.config_from_arguments(
+        args, simulation_duration=args.days * cafe.SIMULATION_DURATION,
+        seed_offset=args.seed_offset, backend=args.backend)
+    print_steady_state_report(run_steady_state(config, args.batches, args.confidence),
+                              args.confidence)
@@ -0,0 +1,110 @@
+# Sweep skenario staffing (jumlah pelayan hotfood, sandwich, kasir) dengan
+# common random numbers: replikasi ke-r memakai seed_offset yang sama di setiap
+# skenario, jadi pelanggan yang sama mendapat waktu datang dan waktu layanan yang sama.
+import csv
+import itertools
+
+import CafetariaSimulation as cafe
+import replication
+
+STAFFING_FIELDS = ("num_hot_food_employee",
+                   "num_sandwich_employee", "num_cashier")
+
+
+def staffing_grid(hot_food=(1,), sandwich=(1,), cashier=(2,), config=None):
+    # Semua kombinasi staffing sebagai list SimulationConfig
+    if config is None:
+        config = cafe.SimulationConfig()
+    return [config.replace(num_hot_food_employee=h, num_sandwich_employee=s, num_cashier=c)
+            for h, s, c in itertools.product(hot_food, sandwich, cashier)]
+
+
+def run_job(job):
+    scenario, config, replication_id, engine = job
+    if engine == "fast":
+        import fast_engine
+        metrics = fast_engine.fast_simulation(
+            replication.replication_config(config, replication_id))
+    else:
+        metrics = replication.run_replication(replication_id, config)
+        del metrics["replication"]
+
+    row = {"scenario": scenario, "replication": replication_id}
+    row.update({field: getattr(config, field) for field in STAFFING_FIELDS})
+    row.update(metrics)
+    return row
+
+
+def run_sweep(configs, num_replications, max_workers=None, engine="simpy"):
+    # Satu job per (skenario x replikasi), hasil berupa tabel rapi (satu baris per job)
+    for config in configs:
+        replication.check_replications(config, num_replications)
+    jobs = [(scenario, config, replication_id, engine)
+            for scenario, config in enumerate(configs)
+            for replication_id in range(num_replications)]
+    return replication.parallel_map(run_job, jobs, max_workers)
+
+
+def summarize_sweep(rows, metric="overall_avg_delay", baseline=0, confidence=0.95):
+    # Rata-rata per skenario dan selisih berpasangan terhadap skenario baseline.
+    # Karena CRN, selisih dihitung per replikasi sehingga variansinya kecil.
+    by_scenario = {}
+    for row in rows:
+        by_scenario.setdefault(row["scenario"], {})[
+            row["replication"]] = row
+
+    base = by_scenario[baseline]
+    summary = []
+    for scenario, replications in sorted(by_scenario.items()):
+        first = next(iter(replications.values()))
+        values = [replications[r][metric] for r in sorted(replications)]
+        differences = [replications[r][metric] - base[r][metric]
+                       for r in sorted(replications) if r in base]
+        entry = {"scenario": scenario}
+        entry.update({field: first[field] for field in STAFFING_FIELDS})
+        entry["metric"] = metric
+        entry["estimate"] = replication.confidence_interval(values, confidence)
+        entry["difference"] = replication.confidence_interval(
+            differences, confidence)
+        summary.append(entry)
+    return summary
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_sweep_summary(summary):
+    print("\n------------------- SWEEP REPORT -------------------\n")
+    print(f"Metrik: {summary[0]['metric']} (selisih terhadap skenario 0)\n")
+    for entry in summary:
+        estimate, difference = entry["estimate"], entry["difference"]
+        print(f"  HF={entry['num_hot_food_employee']} SW={entry['num_sandwich_employee']} "
+              f"K={entry['num_cashier']}: {estimate['mean']:10.2f} +/- {estimate['half_width']:.2f}"
+              f"   selisih {difference['mean']:10.2f} +/- {difference['half_width']:.2f}")
+    print("\n----------------------------------------------------")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Sweep staffing dengan common random numbers")
+    parser.add_argument("--hot-food", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--sandwich", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--cashier", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("-n", "--replications", type=int, default=10)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--engine", choices=["simpy", "fast"], default="simpy")
+    parser.add_argument("--metric", default="overall_avg_delay")
+    parser.add_argument("--csv", default=None, help="simpan tabel hasil ke CSV")
+    args = parser.parse_args()
+
+    configs = staffing_grid(args.hot_food, args.sandwich, args.cashier)
+    rows = run_sweep(configs, args.replications, args.workers, args.engine)
+    if args.csv:
+        write_csv(rows, args.csv)
+    print_sweep_summary(summarize_sweep(rows, args.metric))
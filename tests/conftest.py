@@ -0,0 +1,5 @@
+# modul simulasi ada di root repo (tanpa package), supaya `pytest` jalan dari mana saja
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
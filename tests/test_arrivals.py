@@ -0,0 +1,32 @@
+import numpy as np
+
+import CafetariaSimulation as cafe
+import arrivals
+import replication
+
+PROFILE = ((0, 0.5), (1800, 3.0), (3600, 1.0))
+
+
+def group_times(config):
+    stream = arrivals.ArrivalStream.from_config(config, config.make_streams())
+    return np.cumsum([interval for interval, _ in stream])
+
+
+def test_profile_group_count_matches_expected_groups():
+    config = cafe.SimulationConfig(arrival_profile=PROFILE)
+    expected = arrivals.expected_groups(config)
+    assert np.isclose(expected, (1800 * 0.5 + 1800 * 3.0 + 1800 * 1.0) / 30)
+
+    replications = 200
+    counts = np.zeros(len(PROFILE))
+    totals = []
+    for replication_id in range(replications):
+        times = group_times(replication.replication_config(config, replication_id))
+        totals.append(len(times))
+        counts += np.bincount(np.searchsorted([start for start, _ in PROFILE], times,
+                                              side="right") - 1, minlength=len(PROFILE))
+    # jumlah grup Poisson: variansi = mean, batas 4 standard error
+    assert abs(np.mean(totals) - expected) < 4 * np.sqrt(expected / replications)
+    segment_expected = np.array([1800 * factor / 30 for _, factor in PROFILE])
+    assert (abs(counts / replications - segment_expected)
+            < 4 * np.sqrt(segment_expected / replications)).all()
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import CafetariaSimulation as cafe
+import checkpoint
+
+DAY = cafe.SIMULATION_DURATION
+
+
+def test_stopped_and_resumed_run_matches_uninterrupted_run(tmp_path):
+    config = cafe.SimulationConfig(num_hot_food_employee=5, num_sandwich_employee=2,
+                                   num_cashier=3, simulation_duration=5 * DAY, backend="heapq",
+                                   log_mode="null", print_report=False)
+    expected_store = cafe.CustomerStore()
+    expected = cafe.run(config, store=expected_store)
+
+    path = str(tmp_path / "run.ckpt")
+    for stop_at in (DAY, 2 * DAY, 4 * DAY):
+        assert checkpoint.run_checkpointed(path, config, DAY / 2, store=cafe.CustomerStore(),
+                                           stop_at=stop_at) is None
+        with pytest.raises(ValueError, match="stats"):
+            checkpoint.run_checkpointed(path, config, DAY / 2,
+                                        stats=cafe.StatisticsCollector())
+    store = cafe.CustomerStore()
+    results = checkpoint.run_checkpointed(path, config, DAY / 2, store=store)
+
+    assert results.metrics == expected.metrics
+    assert store.size == expected_store.size
+    np.testing.assert_array_equal(store.records[:store.size],
+                                  expected_store.records[:expected_store.size])
@@ -0,0 +1,27 @@
+import math
+
+import pytest
+
+import CafetariaSimulation as cafe
+import fast_engine
+
+
+def assert_same_metrics(expected, actual):
+    assert expected.keys() == actual.keys()
+    for name in expected:
+        assert math.isclose(expected[name], actual[name], rel_tol=1e-9, abs_tol=1e-9), name
+
+
+@pytest.mark.parametrize("arrival_profile", [(), ((0, 0.5), (1800, 3.0), (3600, 1.0))])
+@pytest.mark.parametrize("seed_offset", [0, 1, 2])
+@pytest.mark.parametrize("staffing", [(1, 1, 2), (5, 2, 3)])
+@pytest.mark.parametrize("policy", cafe.CashierBank.POLICIES)
+def test_backends_produce_identical_metrics(policy, staffing, seed_offset, arrival_profile):
+    hot_food, sandwich, cashier = staffing
+    config = cafe.SimulationConfig(num_hot_food_employee=hot_food, num_sandwich_employee=sandwich,
+                                   num_cashier=cashier, cashier_policy=policy,
+                                   seed_offset=seed_offset, arrival_profile=arrival_profile,
+                                   log_mode="null", print_report=False)
+    simpy_metrics = cafe.run(config).metrics
+    assert_same_metrics(simpy_metrics, cafe.run(config.replace(backend="heapq")).metrics)
+    assert_same_metrics(simpy_metrics, fast_engine.fast_simulation(config))
@@ -0,0 +1,24 @@
+import math
+
+import pytest
+
+import CafetariaSimulation as cafe
+import journey_trace
+
+
+@pytest.mark.parametrize("block_size", [7, journey_trace.JOURNEY_BLOCK_SIZE])
+def test_journey_trace_round_trip(tmp_path, block_size):
+    config = cafe.SimulationConfig(num_cashier=3, log_mode="journey", trace_path=str(tmp_path),
+                                   print_report=False)
+    results = cafe.run(config)
+    trace = journey_trace.read_journeys(str(tmp_path))
+
+    assert len(trace.customers) == results.stats.customers
+    for queue, monitor in results.queues.items():
+        average = trace.queue_time_average(queue, config.simulation_duration, block_size)
+        assert math.isclose(average, monitor.time_average(), rel_tol=1e-9, abs_tol=1e-12), queue
+    hot_food = trace.customers.group_stats("hot_food_delay", "route", block_size=block_size)[1]
+    station = results.stats.stations["hot-food"]
+    assert hot_food["count"] == station.count
+    assert math.isclose(hot_food["max"], station.max)
+    assert math.isclose(hot_food["mean"] * hot_food["count"], station.total)
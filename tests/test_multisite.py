@@ -0,0 +1,51 @@
+import csv
+
+import pytest
+
+import CafetariaSimulation as cafe
+import multisite
+
+
+def test_csv_catalogue_round_trip(tmp_path):
+    config = cafe.SimulationConfig(num_cashier=3, arrival_profile=((0.0, 0.5), (1800.0, 3.0)),
+                                   hot_food_service=(40.0, 100.0),
+                                   sandwich_service=(50.0, 150.0), stat_quantiles=(0.5, 0.9),
+                                   antithetic=("st_hot_food", "st_sandwich"))
+    path = tmp_path / "sites.csv"
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["name", "num_cashier", "arrival_profile",
+                                                  "hot_food_service", "sandwich_service",
+                                                  "stat_quantiles", "antithetic"])
+        writer.writeheader()
+        writer.writerow({"name": "site-a", "num_cashier": "3",
+                         "arrival_profile": "0:0.5,1800:3",
+                         "hot_food_service": "40,100", "sandwich_service": "50,150",
+                         "stat_quantiles": "0.5,0.9", "antithetic": "st_hot_food,st_sandwich"})
+
+    site = next(multisite.load_catalogue(str(path)))
+    loaded = multisite.site_config(0, site)
+    expected = config.replace(log_mode="null", print_report=False, seed_offset=loaded.seed_offset)
+    assert loaded == expected
+
+
+def test_json_catalogue_tuple_fields():
+    site = {"arrival_profile": [[0, 0.5], [1800, 3]], "hot_food_service": [40, 100]}
+    loaded = multisite.site_config(0, site)
+    assert loaded.arrival_profile == ((0.0, 0.5), (1800.0, 3.0))
+    assert loaded.hot_food_service == (40.0, 100.0)
+
+
+def test_json_lines_catalogue_is_read_per_line(tmp_path):
+    path = tmp_path / "sites.jsonl"
+    path.write_text('{"name": "a", "num_cashier": 3}\n\n{"name": "b", "hot_food_service": "40,100"}\n')
+    sites = multisite.load_catalogue(str(path))
+    assert next(sites) == {"name": "a", "num_cashier": 3}
+    assert multisite.site_config(1, next(sites)).hot_food_service == (40.0, 100.0)
+
+
+def test_managed_columns_are_rejected():
+    for name in multisite.MANAGED_FIELDS:
+        with pytest.raises(ValueError, match=name):
+            multisite.site_config(0, {name: "true"})
+    rows = multisite.run_shard([(0, {"name": "a", "log_mode": "stdout"}, None)])
+    assert rows[0]["site"] == "a" and "ValueError" in rows[0]["error"]
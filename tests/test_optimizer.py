@@ -0,0 +1,21 @@
+import pytest
+
+import CafetariaSimulation as cafe
+import optimizer
+
+
+def test_optimizer_picks_cheapest_feasible_staffing():
+    # kasir: 1 -> ~1250 s, 2 -> ~150 s, 3 -> ~16 s, 4 -> ~16 s rata-rata delay
+    config = cafe.SimulationConfig(print_report=False, log_mode="null")
+    result = optimizer.optimize_staffing({"cashier_avg_delay": 60.0},
+                                         bounds=((5, 5), (2, 2), (1, 4)), engine="fast",
+                                         max_workers=1, config=config)
+    assert result["best"].staffing == (5, 2, 3)
+    # tingkat biaya di atas kandidat terbaik tidak pernah disimulasikan
+    assert all(candidate.staffing[2] <= 3 for candidate in result["evaluated"])
+
+
+@pytest.mark.parametrize("bounds", [((1, 2), (3, 2), (1, 2)), ((0, 2), (1, 2), (1, 2))])
+def test_invalid_bounds_are_rejected(bounds):
+    with pytest.raises(ValueError, match="batas"):
+        optimizer.optimize_staffing({"cashier_avg_delay": 60.0}, bounds=bounds, max_workers=1)
@@ -0,0 +1,18 @@
+import pytest
+
+import CafetariaSimulation as cafe
+import replication
+
+SHORT = cafe.SimulationConfig(simulation_duration=1800, print_report=False, log_mode="null")
+
+
+def test_legacy_precision_run_clamps_max_replications():
+    config = SHORT.replace(random_mode="legacy")
+    limit = replication.max_legacy_replications(config)
+    assert limit < 1000
+    with pytest.warns(UserWarning, match="dipotong"):
+        results = replication.run_until_precision({"overall_avg_delay": 10.0}, min_replications=4,
+                                                  batch_size=4, max_workers=1, config=config)
+    assert len(results) == 4
+    with pytest.raises(ValueError):
+        replication.run_replications(limit + 1, max_workers=1, config=config)
@@ -0,0 +1,34 @@
+import CafetariaSimulation as cafe
+import result_cache
+
+
+def test_equal_configs_have_equal_keys():
+    default = cafe.SimulationConfig()
+    from_cli = cafe.SimulationConfig(simulation_duration=5400.0, interval_customer_arrival=30.0,
+                                     hot_food_service=[50, 120], backend="heapq")
+    assert default == from_cli.replace(hot_food_service=(50, 120), backend="simpy")
+    assert result_cache.cache_key(default) == result_cache.cache_key(from_cli)
+    assert result_cache.cache_key(default) != result_cache.cache_key(default.replace(num_cashier=3))
+    assert result_cache.cache_key(default) != result_cache.cache_key(default, kind="replications")
+
+
+def test_cached_run_hit_and_miss(tmp_path, monkeypatch):
+    cache = result_cache.ResultCache(str(tmp_path))
+    config = cafe.SimulationConfig(simulation_duration=1800, print_report=False)
+    runs = []
+    run = cafe.run
+
+    def counted_run(config):
+        runs.append(config)
+        return run(config)
+
+    monkeypatch.setattr(cafe, "run", counted_run)
+
+    metrics, _ = result_cache.cached_run(config, cache)
+    assert len(runs) == 1
+    assert result_cache.cached_run(config.replace(simulation_duration=1800.0), cache)[0] == metrics
+    assert len(runs) == 1
+    result_cache.cached_run(config.replace(num_cashier=3), cache)
+    assert len(runs) == 2
+    replications = result_cache.cached_replications(1, config, cache, max_workers=1)
+    assert isinstance(replications, list)
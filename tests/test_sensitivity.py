@@ -0,0 +1,22 @@
+import CafetariaSimulation as cafe
+import sensitivity
+
+
+def agree(first, second):
+    return abs(first["mean"] - second["mean"]) <= first["half_width"] + second["half_width"]
+
+
+def test_ipa_and_lr_agree_with_finite_differences():
+    config = cafe.SimulationConfig(num_hot_food_employee=5, num_sandwich_employee=2,
+                                   num_cashier=3)
+    summary = sensitivity.estimate_sensitivity(config, num_replications=20, engine="fast",
+                                               max_workers=1)
+    for metric in ("hot_food_avg_delay", "sandwich_avg_delay"):
+        for parameter in sensitivity.PARAMETERS:
+            ipa, fd = summary["ipa"][metric][parameter], summary["fd"][metric][parameter]
+            assert agree(ipa, fd), (metric, parameter)
+    # hot-food tidak bergantung pada batas sandwich, dan sebaliknya
+    assert summary["ipa"]["hot_food_avg_delay"]["sandwich_high"]["mean"] == 0.0
+    assert summary["ipa"]["hot_food_avg_delay"]["hot_food_high"]["mean"] > 0.0
+    for metric in ("hot_food_avg_delay", "overall_avg_delay"):
+        assert agree(summary["lr"][metric]["arrival_mean"], summary["fd"][metric]["arrival_mean"])
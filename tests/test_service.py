@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+import service
+
+SCENARIO = {"num_cashier": 3, "hot_food_service": "50,120", "simulation_duration": 3600}
+
+
+async def collect(payload, port):
+    return [line async for line in service.request_simulation(payload, port=port)]
+
+
+async def run_with_service(check, **options):
+    simulation = service.SimulationService(max_workers=1, **options)
+    await simulation.start(port=0)
+    try:
+        return await check(simulation, simulation.address()[1])
+    finally:
+        await simulation.close()
+
+
+def test_results_stream_as_ndjson_lines():
+    async def check(simulation, port):
+        return await collect({"config": SCENARIO, "replications": 3}, port)
+
+    lines = asyncio.run(run_with_service(check))
+    assert sorted(line["replication"] for line in lines[:-1]) == [0, 1, 2]
+    assert all("overall_avg_delay" in line["metrics"] for line in lines[:-1])
+    assert lines[-1]["replications"] == 3 and lines[-1]["failed"] == 0
+    assert "overall_avg_delay" in lines[-1]["summary"]
+
+
+def test_identical_requests_share_jobs():
+    async def check(simulation, port):
+        # config sama ditulis berbeda (list vs string, int vs float)
+        other = dict(SCENARIO, hot_food_service=[50, 120], simulation_duration=3600.0)
+        first, second = await asyncio.gather(collect({"config": SCENARIO, "replications": 2}, port),
+                                             collect({"config": other, "replications": 2}, port))
+        return first, second, simulation.status()
+
+    first, second, status = asyncio.run(run_with_service(check))
+    assert status["jobs_run"] == 2
+    assert status.get("jobs_shared", 0) + status.get("jobs_remembered", 0) == 2
+    assert first[-1]["summary"] == second[-1]["summary"]
+
+
+def test_full_queue_is_rejected_with_503():
+    async def check(simulation, port):
+        with pytest.raises(service.ServiceBusy):
+            await collect({"config": SCENARIO, "replications": 3}, port)
+        return simulation.status()
+
+    status = asyncio.run(run_with_service(check, max_queue=2))
+    assert status["rejected"] == 1 and status.get("jobs_run", 0) == 0
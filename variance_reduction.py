@@ -0,0 +1,138 @@
+# Reduksi variansi untuk replikasi: antithetic variates (U, 1-U) pada stream kontinu
+# dan control variates dari rata-rata sampel waktu layanan dan interval kedatangan (nilai harapannya diketahui).
+# Faktor reduksi = variansi estimator rata-rata biasa dengan jumlah run yang sama
+# dibagi variansi estimator yang dipakai.
+import math
+import statistics
+
+import numpy as np
+
+import CafetariaSimulation as cafe
+import replication
+import arrivals
+
+# Stream kontinu yang dibalik pada run antithetic. Ukuran grup dan rute tidak dibalik,
+# supaya kedua run dalam satu pasangan punya pelanggan dan rute yang sama.
+ANTITHETIC_STREAMS = ("interval_time", "st_hot_food", "st_sandwich", "st_drinks",
+                      "act_hot_food", "act_sandwich", "act_drinks")
+# Control waktu layanan: rata-rata U dari stream layanan pada pelanggan yang melewati
+# stasiunnya, dikurangi nilai harapannya 0.5 (stream layanan independen dari jumlah
+# pelanggan dan rute). Ditambah satu control kedatangan, lihat run_controls.
+CONTROL_STREAMS = (("st_hot_food", (1,)), ("st_sandwich", (2,)), ("st_drinks", (1, 2, 3)),
+                   ("act_hot_food", (1,)), ("act_sandwich", (2,)), ("act_drinks", (1, 2, 3)))
+DEFAULT_METRICS = ("hot_food_avg_delay", "sandwich_avg_delay",
+                   "cashier_avg_delay", "overall_avg_delay")
+
+
+def run_controls(config, num_customers):
+    streams = config.make_streams()
+    # Kedatangan: rata-rata Exp(1) dari sejumlah TETAP interval grup (key 2g), dikurangi 1.
+    # Jumlahnya tidak boleh bergantung pada run, karena grup yang datang sebelum
+    # simulasi selesai cenderung punya interval pendek (estimasi jadi bias).
+    groups = np.arange(1, int(arrivals.expected_groups(config)) + 1)
+    controls = [float(-np.log(1.0 - streams.u_array("interval_time", 2 * groups)).mean()) - 1.0]
+
+    # Layanan: pelanggan 1..num_customers, rute diambil dari stream yang sama dengan simulasi
+    customer_id = np.arange(1, num_customers + 1)
+    route = streams.choice_array("route_choice", customer_id, [1, 2, 3], [0.8, 0.15, 0.05])
+    for name, routes in CONTROL_STREAMS:
+        ids = customer_id[np.isin(route, routes)]
+        controls.append(float(streams.u_array(name, ids).mean()) - 0.5 if len(ids) else 0.0)
+    return controls
+
+
+def run_job(job):
+    replication_id, config, antithetic = job
+    if antithetic:
+        config = config.replace(antithetic=ANTITHETIC_STREAMS)
+    config = replication.replication_config(config, replication_id)
+    results = cafe.run(config)
+    row = dict(results.metrics)
+    row["controls"] = run_controls(config, results.stats.customers)
+    return row
+
+
+def control_variate_estimate(values, controls, confidence=0.95):
+    # Regresi values terhadap controls (rata-rata control diketahui = 0):
+    # estimasi = mean(Y) - beta . mean(C), variansi dari residual dengan df n-p-1
+    values = np.asarray(values, dtype=float)
+    controls = np.asarray(controls, dtype=float)
+    n, p = controls.shape
+    if n <= p + 1:
+        raise ValueError(f"Control variates butuh lebih dari {p + 1} replikasi, ada {n}")
+    centered = controls - controls.mean(axis=0)
+    beta = np.linalg.lstsq(centered, values - values.mean(), rcond=None)[0]
+    mean = float(values.mean() - controls.mean(axis=0) @ beta)
+    residual = values - values.mean() - centered @ beta
+    variance = float(residual @ residual) / (n - p - 1)
+    half_width = replication.t_quantile(0.5 + confidence / 2.0, n - p - 1) * math.sqrt(variance / n)
+    return {"mean": mean, "std": math.sqrt(variance), "half_width": half_width,
+            "lower": mean - half_width, "upper": mean + half_width, "n": n}
+
+
+def run_variance_reduced(num_replications, antithetic=False, control_variates=False,
+                         metrics=DEFAULT_METRICS, confidence=0.95, max_workers=None, config=None):
+    # num_replications = jumlah unit independen; dengan antithetic setiap unit = 2 run
+    if config is None:
+        config = cafe.SimulationConfig()
+    replication.check_replications(config, num_replications)
+    jobs = [(replication_id, config, False) for replication_id in range(num_replications)]
+    if antithetic:
+        jobs += [(replication_id, config, True) for replication_id in range(num_replications)]
+    rows = replication.parallel_map(run_job, jobs, max_workers)
+
+    # unit = rata-rata pasangan (antithetic) atau satu run
+    units = rows[:num_replications]
+    if antithetic:
+        units = [{name: (a[name] + b[name]) / 2 if name != "controls" else
+                  [(x + y) / 2 for x, y in zip(a["controls"], b["controls"])] for name in a}
+                 for a, b in zip(units, rows[num_replications:])]
+
+    summary = {}
+    for name in metrics:
+        values = [unit[name] for unit in units]
+        if control_variates:
+            estimate = control_variate_estimate(
+                values, [unit["controls"] for unit in units], confidence)
+        else:
+            estimate = replication.confidence_interval(values, confidence)
+        # variansi rata-rata biasa dari len(rows) run independen vs variansi estimator
+        crude_variance = statistics.variance([row[name] for row in rows]) / len(rows)
+        achieved_variance = estimate["std"] ** 2 / estimate["n"]
+        summary[name] = {"estimate": estimate, "runs": len(rows),
+                         "reduction_factor": crude_variance / achieved_variance
+                         if achieved_variance > 0 else math.inf}
+    return summary
+
+
+def print_variance_reduction_report(summary, techniques, confidence=0.95):
+    print("\n------------------- VARIANCE REDUCTION REPORT -------------------\n")
+    print(f"Teknik: {techniques}, interval kepercayaan {confidence * 100:.0f}%\n")
+    for name, entry in summary.items():
+        estimate = entry["estimate"]
+        print(f"  {name:<20}: {estimate['mean']:10.2f} +/- {estimate['half_width']:.2f}  "
+              f"faktor reduksi variansi {entry['reduction_factor']:.2f} ({entry['runs']} run)")
+    print("\n-----------------------------------------------------------------")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Replikasi dengan antithetic dan/atau control variates")
+    parser.add_argument("-n", "--replications", type=int, default=20)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-c", "--confidence", type=float, default=0.95)
+    parser.add_argument("--antithetic", action="store_true")
+    parser.add_argument("--control-variates", action="store_true")
+    replication.add_config_arguments(parser)
+    args = parser.parse_args()
+
+    config = replication.config_from_arguments(args)
+    techniques = " + ".join(name for name, used in (("antithetic", args.antithetic),
+                                                     ("control variates", args.control_variates))
+                            if used) or "tanpa reduksi"
+    summary = run_variance_reduced(args.replications, args.antithetic, args.control_variates,
+                                   confidence=args.confidence, max_workers=args.workers,
+                                   config=config)
+    print_variance_reduction_report(summary, techniques, args.confidence)